@@ -1,3 +1,3 @@
 #!/bin/bash
-python3 src/main.py "/static-site-builder/"
+PYTHONPATH=src python3 -m static_site_builder "/static-site-builder/" --site-url "https://anthonyw90.github.io" --related
 #wow
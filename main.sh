@@ -1,2 +1,2 @@
-python3 src/main.py
-cd docs && python3 -m http.server 8888
\ No newline at end of file
+PYTHONPATH=src python3 -m static_site_builder
+PYTHONPATH=src python3 -m static_site_builder serve docs --port 8888
\ No newline at end of file
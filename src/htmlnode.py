@@ -1,58 +0,0 @@
-
-
-class HTMLNode:
-    def __init__(self, tag=None, value=None, children=None, props=None):
-        self.tag = tag
-        self.value = value
-        self.children = children
-        self.props = props
-        
-    def to_html(self):
-        raise NotImplementedError("Subclasses must implement this method")
-    
-    def props_to_html(self):
-        if self.props is None:
-            return ""
-        return " ".join([f"{k}=\"{v}\"" for k, v in self.props.items()])
-    
-    def __repr__(self):
-        return f"HTMLNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
-
-
-class LeafNode(HTMLNode):
-    def __init__(self, tag, value, children=None, props=None):
-        super().__init__(tag, value, children, props)
-
-    def to_html(self):
-        if self.value is None:
-            raise ValueError("LeafNode must have a value")
-        if self.tag is None:
-            return self.value
-        props_html = self.props_to_html()
-        if props_html:
-            return f"<{self.tag} {props_html}>{self.value}</{self.tag}>"
-        return f"<{self.tag}>{self.value}</{self.tag}>"
-    
-    def __repr__(self):
-        return f"LeafNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
-
-
-class ParentNode(HTMLNode):
-    def __init__(self, tag, children, props=None):
-        super().__init__(tag, None, children, props)
-
-    def to_html(self):
-        if self.tag is None:
-            raise ValueError("ParentNode must have a tag")
-        if self.children is None:
-            raise ValueError("ParentNode must have children")
-        
-        children_html = "".join([child.to_html() for child in self.children])
-        props_html = self.props_to_html()
-        if props_html:
-            return f"<{self.tag} {props_html}>{children_html}</{self.tag}>"
-        return f"<{self.tag}>{children_html}</{self.tag}>"
-    
-    def __repr__(self):
-        return f"ParentNode(tag={self.tag}, children={self.children}, props={self.props})"
-    
\ No newline at end of file
@@ -0,0 +1,99 @@
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+
+# The earliest timestamp a zip entry can hold (1980-01-01)
+ZIP_EPOCH = 315532800
+
+
+def archive_format_for(path):
+    if path.endswith(".zip"):
+        return "zip"
+    if path.endswith(".tar.gz") or path.endswith(".tgz"):
+        return "tar"
+    raise ValueError(f"Unsupported archive type, expected .zip, .tar.gz or .tgz: {path}")
+
+
+def source_date_epoch():
+    return int(os.environ.get("SOURCE_DATE_EPOCH", ZIP_EPOCH))
+
+
+class ArchiveSink:
+    """
+    Output backend that streams every output into a .tar.gz or .zip instead
+    of creating the tree under root. Entries get fixed timestamps, owners
+    and permissions (SOURCE_DATE_EPOCH overrides the timestamp), and the
+    build visits files in sorted order, so the same site always produces
+    the same archive bytes.
+    """
+    writes_files = False
+
+    def __init__(self, archive_path, root, archive_format=None):
+        self.archive_path = archive_path
+        self.root = root
+        self.archive_format = archive_format or archive_format_for(archive_path)
+        if self.archive_format not in ("tar", "zip"):
+            raise ValueError(f"Unsupported archive format: {self.archive_format}")
+        self.mtime = source_date_epoch()
+        self.names = set()
+
+        archive_dir = os.path.dirname(archive_path)
+        if archive_dir and not os.path.exists(archive_dir):
+            os.makedirs(archive_dir)
+        self._file = open(archive_path, "wb")
+        if self.archive_format == "zip":
+            self._gzip = None
+            self._archive = zipfile.ZipFile(self._file, "w", zipfile.ZIP_DEFLATED)
+        else:
+            # No file name and a fixed mtime in the gzip header keep it reproducible
+            self._gzip = gzip.GzipFile(filename="", mode="wb", fileobj=self._file, mtime=0)
+            self._archive = tarfile.open(fileobj=self._gzip, mode="w|", format=tarfile.GNU_FORMAT)
+
+    def _name(self, dest_path):
+        return os.path.relpath(dest_path, self.root).replace(os.sep, "/")
+
+    def _add(self, dest_path, size, fileobj):
+        name = self._name(dest_path)
+        self.names.add(name)
+        if self.archive_format == "zip":
+            info = zipfile.ZipInfo(name, time.gmtime(self.mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            with self._archive.open(info, "w") as entry:
+                shutil.copyfileobj(fileobj, entry)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mtime = self.mtime
+            info.mode = 0o644
+            self._archive.addfile(info, fileobj)
+
+    def write_text(self, dest_path, text):
+        data = text.encode("utf-8")
+        self._add(dest_path, len(data), io.BytesIO(data))
+
+    def write_lines(self, dest_path, lines):
+        # Archive entries need their size up front
+        self.write_text(dest_path, "".join(lines))
+
+    def copy_file(self, source_path, dest_path):
+        with open(source_path, "rb") as f:
+            self._add(dest_path, os.fstat(f.fileno()).st_size, f)
+
+    def exists(self, dest_path):
+        return self._name(dest_path) in self.names
+
+    def remove(self, dest_path):
+        # Outputs of earlier builds were never added to this archive
+        pass
+
+    def close(self):
+        self._archive.close()
+        if self._gzip is not None:
+            self._gzip.close()
+        self._file.close()
+        print(f"Wrote {self.archive_path}")
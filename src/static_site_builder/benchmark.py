@@ -0,0 +1,149 @@
+import os
+import timeit
+from .htmlnode import LeafNode, ParentNode, render_html, escape_attr, escape_text
+from .textnode import markdown_to_html_node
+
+
+class BaselineLeafNode:
+    """
+    LeafNode as it was before render caching, escaping and render_html.
+    """
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.props = props
+
+    def props_to_html(self):
+        if self.props is None:
+            return ""
+        return " ".join([f"{k}=\"{v}\"" for k, v in self.props.items()])
+
+    def to_html(self):
+        if self.value is None:
+            raise ValueError("LeafNode must have a value")
+        if self.tag is None:
+            return self.value
+        props_html = self.props_to_html()
+        if props_html:
+            return f"<{self.tag} {props_html}>{self.value}</{self.tag}>"
+        return f"<{self.tag}>{self.value}</{self.tag}>"
+
+
+class BaselineParentNode(BaselineLeafNode):
+    """
+    The original recursive ParentNode.to_html.
+    """
+    def __init__(self, tag, children, props=None):
+        super().__init__(tag, None, props)
+        self.children = children
+
+    def to_html(self):
+        if self.tag is None:
+            raise ValueError("ParentNode must have a tag")
+        if self.children is None:
+            raise ValueError("ParentNode must have children")
+        children_html = "".join([child.to_html() for child in self.children])
+        props_html = self.props_to_html()
+        if props_html:
+            return f"<{self.tag} {props_html}>{children_html}</{self.tag}>"
+        return f"<{self.tag}>{children_html}</{self.tag}>"
+
+
+def baseline_tree(node):
+    """
+    A copy of a node tree built from the baseline classes. Other node types
+    are shared, as they render themselves in both versions.
+    """
+    if isinstance(node, ParentNode):
+        return BaselineParentNode(node.tag, [baseline_tree(child) for child in node.children], node.props)
+    if isinstance(node, LeafNode):
+        return BaselineLeafNode(node.tag, node.value, node.props)
+    return node
+
+
+def load_corpus(content_dir="content", copies=50):
+    """
+    Markdown from the content directory, repeated to make a larger document.
+    """
+    documents = []
+    for root, dirs, files in os.walk(content_dir):
+        for name in sorted(files):
+            if name.endswith(".md"):
+                with open(os.path.join(root, name), encoding="utf-8") as f:
+                    documents.append(f.read())
+    return "\n\n".join(documents * copies)
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=9)) / number
+    print(f"{label:<40} {seconds * 1000:9.3f} ms")
+    return seconds
+
+
+def bench_render(number=20):
+    """
+    render_html against the pre-series recursive to_html on the content
+    corpus. The baseline does not escape, so the speedup shown includes the
+    cost of escaping.
+    """
+    corpus_tree = markdown_to_html_node(load_corpus())
+    baseline = baseline_tree(corpus_tree)
+
+    print("Rendering")
+    before = bench("  baseline to_html (corpus)", baseline.to_html, number)
+    after = bench("  render_html (corpus)", lambda: render_html(corpus_tree), number)
+    print(f"  speedup: {before / after:.2f}x")
+
+
+def collect_strings(node, texts, attrs):
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ParentNode):
+            stack.extend(item.children)
+        elif isinstance(item, LeafNode):
+            texts.append(item.value)
+        else:
+            attrs.extend((item.src, item.alt_text))
+            continue
+        if item.props:
+            attrs.extend(item.props.values())
+
+
+def bench_escape(number=20):
+    """
+    Cost of escaping as a share of render_html on the corpus: the inline
+    text check render_html does for every leaf value, plus escape_attr for
+    every attribute value, minus the cost of the bare loops.
+    """
+    corpus_tree = markdown_to_html_node(load_corpus())
+    texts, attrs = [], []
+    collect_strings(corpus_tree, texts, attrs)
+
+    def escape_all():
+        for text in texts:
+            if "&" in text or "<" in text or ">" in text:
+                escape_text(text)
+        for value in attrs:
+            escape_attr(value)
+
+    def loop_only():
+        for text in texts:
+            pass
+        for value in attrs:
+            str(value)
+
+    print("Escaping")
+    render = bench("  render_html (corpus)", lambda: render_html(corpus_tree), number)
+    escape = bench(f"  escape {len(texts)} texts, {len(attrs)} attrs", escape_all, number)
+    loops = bench("  bare loops", loop_only, number)
+    print(f"  overhead: {(escape - loops) / render * 100:.1f}% of render time")
+
+
+def main():
+    bench_render()
+    bench_escape()
+
+
+if __name__ == "__main__":
+    main()
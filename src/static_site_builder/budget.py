@@ -0,0 +1,186 @@
+import gzip
+import json
+import os
+import posixpath
+import re
+from .build import page_section
+from .cache import cache_path
+from .linkcheck import LinkCache, resolve_target
+
+BUDGET_KEYS = ("html_bytes", "html_gzip_bytes", "image_bytes", "requests", "total_bytes")
+REPORT_COLUMNS = {
+    "html": "html_bytes",
+    "gzip": "html_gzip_bytes",
+    "images": "image_bytes",
+    "requests": "requests",
+    "total": "total_bytes",
+}
+DEFAULT_SECTION = "default"
+
+# Stylesheets and scripts come from the template rather than the markdown
+RESOURCE_PATTERN = re.compile(r'<link\b[^>]*\brel="stylesheet"[^>]*\bhref="([^"]+)"|<script\b[^>]*\bsrc="([^"]+)"')
+TEXT_EXTENSIONS = (".css", ".js", ".json", ".svg", ".html", ".xml", ".txt")
+
+
+class PageWeight:
+    """
+    Transfer weight of one page: its HTML raw and gzipped, the images it
+    shows, the stylesheets and scripts it loads and the number of requests
+    for all of them. Text resources count gzipped, as they are served.
+    """
+    def __init__(self, url, source_path, section):
+        self.url = url
+        self.source_path = source_path
+        self.section = section
+        self.html_bytes = 0
+        self.html_gzip_bytes = 0
+        self.image_bytes = 0
+        self.resource_bytes = 0
+        self.requests = 1
+
+    @property
+    def total_bytes(self):
+        return self.html_gzip_bytes + self.image_bytes + self.resource_bytes
+
+    def __repr__(self) -> str:
+        return f"PageWeight({self.url}, {self.total_bytes} bytes, {self.requests} requests)"
+
+
+class BudgetViolation:
+    def __init__(self, page, key, value, limit):
+        self.page = page
+        self.key = key
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return f"{self.page.source_path}: {self.key} {self.value} over the budget of {self.limit} for {self.page.section} pages"
+
+
+def load_budgets(path):
+    """
+    Read per-section budgets from a JSON file such as
+    {"default": {"total_bytes": 500000}, "blog": {"image_bytes": 300000}}.
+    Sections are top-level content directories; "default" applies to
+    every page whose section sets no budget of its own for a key.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        budgets = json.load(f)
+    for section, limits in budgets.items():
+        for key in limits:
+            if key not in BUDGET_KEYS:
+                raise ValueError(f"Unknown budget {key!r} for section {section!r} in {path}, expected one of {', '.join(BUDGET_KEYS)}")
+    return budgets
+
+
+def _gzip_size(data):
+    return len(gzip.compress(data, compresslevel=6, mtime=0))
+
+
+class _ResourceSizes:
+    """
+    Transfer size of each output file, measured once per build.
+    """
+    def __init__(self, dest_root):
+        self.dest_root = dest_root
+        self.sizes = {}
+
+    def get(self, target):
+        size = self.sizes.get(target)
+        if size is None:
+            path = os.path.join(self.dest_root, *target.split("/"))
+            if not os.path.isfile(path):
+                return None
+            if target.endswith(TEXT_EXTENSIONS):
+                with open(path, "rb") as f:
+                    size = _gzip_size(f.read())
+            else:
+                size = os.path.getsize(path)
+            self.sizes[target] = size
+        return size
+
+
+def measure_pages(context, dest_root):
+    """
+    Weigh every page of the build from its output file and the image
+    targets collected from its ImageNodes. Pages a resumed build did not
+    render use the targets recorded in the link cache, which this stage
+    keeps up to date as well. Images inlined as data URIs are part of the
+    HTML and no request of their own.
+    """
+    link_cache = LinkCache(cache_path("links.json", context.cache_dir))
+    resources = _ResourceSizes(dest_root)
+    root_prefix = os.path.join(os.path.normpath(dest_root), "")
+    weights = []
+
+    for page in context.pages:
+        weight = PageWeight(page.url, page.source_path, page_section(context.content_root, page.source_path) or DEFAULT_SECTION)
+        with open(page.dest_path, "rb") as f:
+            html = f.read()
+        weight.html_bytes = len(html)
+        weight.html_gzip_bytes = _gzip_size(html)
+
+        dest = os.path.normpath(page.dest_path)
+        dest = dest[len(root_prefix):] if dest.startswith(root_prefix) else os.path.relpath(dest, dest_root)
+        base_dir = posixpath.dirname(dest.replace(os.sep, "/"))
+        references = link_cache.references(page, dest.replace(os.sep, "/"))
+        if page.document is not None:
+            images = [src for alt, src in page.document.images]
+        else:
+            images = [url for kind, url, line in references if kind == "image"]
+
+        seen = set()
+        for src in images:
+            if context.image_inliner is not None and context.image_inliner.data_uri(src) is not None:
+                continue
+            target = resolve_target(src, base_dir)
+            if target is None or target in seen:
+                continue
+            seen.add(target)
+            # A missing file is still a request, just an unweighed one
+            weight.requests += 1
+            weight.image_bytes += resources.get(target) or 0
+
+        # Template resources are written with the basepath already applied
+        for match in RESOURCE_PATTERN.finditer(html.decode("utf-8", "replace")):
+            url = match.group(1) or match.group(2)
+            if context.basepath != "/" and url.startswith(context.basepath):
+                url = "/" + url[len(context.basepath):]
+            target = resolve_target(url, base_dir)
+            if target is None or target in seen:
+                continue
+            seen.add(target)
+            weight.requests += 1
+            weight.resource_bytes += resources.get(target) or 0
+        weights.append(weight)
+    link_cache.save()
+    return weights
+
+
+def check_budgets(weights, budgets):
+    violations = []
+    default = budgets.get(DEFAULT_SECTION, {})
+    for weight in weights:
+        limits = {**default, **budgets.get(weight.section, {})}
+        for key in BUDGET_KEYS:
+            limit = limits.get(key)
+            value = getattr(weight, key)
+            if limit is not None and value > limit:
+                violations.append(BudgetViolation(weight, key, value, limit))
+    return violations
+
+
+def print_weight_report(weights, sort_by="total", limit=None):
+    """
+    Print a table of page weights, heaviest first by the chosen column.
+    """
+    key = REPORT_COLUMNS[sort_by]
+    rows = sorted(weights, key=lambda weight: getattr(weight, key), reverse=True)
+    if limit is not None:
+        rows = rows[:limit]
+    print(f"{'html':>10} {'gzip':>10} {'images':>10} {'requests':>8} {'total':>10}  page")
+    for weight in rows:
+        print(
+            f"{weight.html_bytes:>10} {weight.html_gzip_bytes:>10} {weight.image_bytes:>10} "
+            f"{weight.requests:>8} {weight.total_bytes:>10}  {weight.url}"
+        )
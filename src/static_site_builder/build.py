@@ -0,0 +1,113 @@
+import os
+from .cache import CACHE_DIR, cache_path
+from .frontmatter import MetadataIndex
+from .manifest import ContentManifest
+from .output import FileSystemSink
+
+
+def page_url(content_root, path):
+    """
+    Root-relative URL of the page generated from a content file.
+    content/blog/tom/index.md -> /blog/tom, content/about.md -> /about.html
+    """
+    rel_path = os.path.relpath(path, content_root).replace(os.sep, "/")
+    if rel_path == "index.md":
+        return "/"
+    if rel_path.endswith("/index.md"):
+        return "/" + rel_path[:-len("/index.md")]
+    return "/" + rel_path[:-3] + ".html"
+
+
+def page_section(content_root, path):
+    """
+    Top-level content directory a file is in, or None for files directly
+    in content_root. content/blog/tom/index.md -> blog
+    """
+    parts = os.path.relpath(path, content_root).split(os.sep)
+    return parts[0] if len(parts) > 1 else None
+
+
+class PageRecord:
+    """
+    What later build stages need to know about one generated page.
+    """
+    def __init__(self, source_path, dest_path, url, title, date=None, lastmod=None, document=None, content_hash=None):
+        self.source_path = source_path
+        self.dest_path = dest_path
+        self.url = url
+        self.title = title
+        self.date = date
+        self.lastmod = lastmod
+        self.document = document
+        self.content_hash = content_hash
+
+    def __repr__(self) -> str:
+        return f"PageRecord({self.url}, {self.title}, {self.lastmod})"
+
+
+class BuildContext:
+    """
+    State shared by the stages of one build: the persistent caches and the
+    pages generated so far.
+    """
+    def __init__(self, content_root, dest_root, basepath="/", site_url=None, cache_dir=CACHE_DIR):
+        self.content_root = content_root
+        self.dest_root = dest_root
+        self.basepath = basepath
+        self.site_url = site_url
+        self.metadata_index = MetadataIndex(cache_path("metadata.json", cache_dir))
+        self._listing_cache = None
+        self.manifest = ContentManifest(cache_path("manifest.json", cache_dir))
+        self.cache_dir = cache_dir
+        # Signatures of written outputs (sitemaps, feed, listings, search)
+        # describe one output tree, see use_output_cache()
+        self.output_cache_dir = cache_dir
+        self.collect_terms = False
+        self.check_links = False
+        self.journal = None
+        self.output = FileSystemSink()
+        self.memory_report = None
+        self.templates = None
+        self.critical_css = None
+        self.related = None
+        self.image_inliner = None
+        # Build-wide settings templates see under site
+        self.site = {}
+        self.pages = []
+
+    @property
+    def listing_cache(self):
+        # Listings are optional, so their module is only imported when used
+        if self._listing_cache is None:
+            from .listing import ListingCache
+            self._listing_cache = ListingCache(cache_path("listings.json", self.output_cache_dir))
+        return self._listing_cache
+
+    def use_output_cache(self, name):
+        """
+        Keep the caches of what was written under .cache/outputs/name, for
+        builds whose output is not the docs/ tree. Caches of the sources
+        are still shared.
+        """
+        self.output_cache_dir = os.path.join(self.cache_dir, "outputs", name)
+
+    def absolute_url(self, url):
+        """
+        Turn a root-relative page URL into an absolute, basepath-aware URL.
+        """
+        prefix = (self.site_url or "").rstrip("/") + self.basepath.rstrip("/")
+        return prefix + url
+
+    def add_page(self, source_path, dest_path, url, title, date=None, document=None):
+        entry = self.manifest.record(source_path)
+        page = PageRecord(source_path, dest_path, url, title, date, entry["lastmod"], document, entry["hash"])
+        self.pages.append(page)
+        return page
+
+    def save(self):
+        self.metadata_index.save()
+        if self._listing_cache is not None:
+            self._listing_cache.save()
+        if self.related is not None:
+            self.related.save()
+        self.manifest.save()
@@ -0,0 +1,36 @@
+import json
+import os
+
+CACHE_DIR = ".cache"
+
+
+def cache_path(name, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, name)
+
+
+def load_json(path, default=None):
+    """
+    Load a JSON cache file, returning default if it is missing or unreadable.
+    """
+    if not path or not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    """
+    Atomically write a JSON cache file so an interrupted build never
+    leaves a half-written cache behind.
+    """
+    cache_dir = os.path.dirname(path)
+    if cache_dir and not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    tmp_path = path + ".tmp"
+    # json.dumps uses the C encoder, json.dump streams through the Python one
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, separators=(",", ":")))
+    os.replace(tmp_path, path)
@@ -0,0 +1,188 @@
+import hashlib
+import os
+import re
+from .htmlnode import HTMLNode, escape_attr
+from .textnode import ImageNode
+
+DEFAULT_THRESHOLD = 8192
+
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+# Pseudo-classes, pseudo-elements and attribute selectors never rule a match out
+IGNORED_PATTERN = re.compile(r"::?[\w-]+(?:\([^)]*\))?|\[[^\]]*\]")
+TAG_PATTERN = re.compile(r"(?<![\w.#-])([a-zA-Z][\w-]*)")
+CLASS_PATTERN = re.compile(r"\.([\w-]+)")
+HTML_TAG_PATTERN = re.compile(r"<([a-zA-Z][\w-]*)")
+HTML_CLASS_PATTERN = re.compile(r'\bclass="([^"]*)"')
+STYLESHEET_PATTERN = re.compile(r'<link\b[^>]*\brel="stylesheet"[^>]*>')
+HREF_PATTERN = re.compile(r'\bhref="([^"]+)"')
+HEAD_END = "</head>"
+
+
+class CssRule:
+    """
+    A top-level rule with the sets of names each of its selectors needs.
+    At-rules other than @media and @supports are always kept.
+    """
+    def __init__(self, text, selectors=None, children=None):
+        self.text = text
+        self.selectors = selectors
+        self.children = children
+
+    def css_for(self, used):
+        if self.children is not None:
+            inner = "".join(child.css_for(used) for child in self.children)
+            return f"{self.text}{{{inner}}}" if inner else ""
+        if self.selectors is None or any(required <= used for required in self.selectors):
+            return self.text
+        return ""
+
+
+def _selector_requirements(selector_list):
+    requirements = []
+    for selector in selector_list.split(","):
+        selector = IGNORED_PATTERN.sub("", selector)
+        required = {tag.lower() for tag in TAG_PATTERN.findall(selector)}
+        required.update("." + name for name in CLASS_PATTERN.findall(selector))
+        requirements.append(frozenset(required))
+    return requirements
+
+
+def _closing_brace(css, start):
+    depth = 0
+    for i in range(start, len(css)):
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css)
+
+
+def parse_css(css):
+    """
+    Split a stylesheet into CssRules, descending into @media and @supports.
+    """
+    css = COMMENT_PATTERN.sub("", css)
+    rules = []
+    position = 0
+    while True:
+        brace = css.find("{", position)
+        if brace < 0:
+            break
+        prelude = " ".join(css[position:brace].split())
+        end = _closing_brace(css, brace)
+        body = css[brace + 1:end]
+        if prelude.startswith(("@media", "@supports")):
+            rules.append(CssRule(prelude, children=parse_css(body)))
+        elif prelude.startswith("@"):
+            rules.append(CssRule(f"{prelude}{{{body.strip()}}}"))
+        else:
+            declarations = " ".join(body.split())
+            rules.append(CssRule(f"{prelude}{{{declarations}}}", _selector_requirements(prelude)))
+        position = end + 1
+    return rules
+
+
+def used_names(node, template_names=frozenset()):
+    """
+    Tag names and ".class" names used by an HTMLNode tree, plus those of
+    the template around it.
+    """
+    used = set(template_names)
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ImageNode):
+            used.add("img")
+            continue
+        if not isinstance(current, HTMLNode):
+            continue
+        if current.tag:
+            used.add(current.tag)
+        if current.props and "class" in current.props:
+            used.update("." + name for name in str(current.props["class"]).split())
+        if current.children:
+            stack.extend(current.children)
+    return used
+
+
+class CriticalCss:
+    """
+    Inlines a stylesheet into each page's <head>. Small stylesheets are
+    inlined whole; larger ones only with the rules whose selectors can
+    match the tags and classes the page uses, and the full stylesheet is
+    loaded asynchronously. Subsets are cached per unique set of names, so
+    pages built from the same elements share one. Also adds a preload
+    hint for the page's first image.
+    """
+    def __init__(self, css_path, threshold=DEFAULT_THRESHOLD):
+        with open(css_path, "r", encoding="utf-8") as f:
+            self.css = f.read()
+        self.href_name = os.path.basename(css_path)
+        self.threshold = threshold
+        self.rules = parse_css(self.css) if len(self.css.encode("utf-8")) > threshold else None
+        self.signature = hashlib.sha256(f"{threshold}:{self.css}".encode("utf-8")).hexdigest()
+        self._subsets = {}
+        self._template_names = {}
+
+    def _file_names(self, path):
+        names = self._template_names.get(path)
+        if names is None:
+            with open(path, "r", encoding="utf-8") as f:
+                source = f.read()
+            names = {tag.lower() for tag in HTML_TAG_PATTERN.findall(source)}
+            for classes in HTML_CLASS_PATTERN.findall(source):
+                names.update("." + name for name in classes.split())
+            names = frozenset(names)
+            self._template_names[path] = names
+        return names
+
+    def template_names(self, template_path, templates=None):
+        """
+        Tag and class names of a template and, given its
+        TemplateEnvironment, of every template it extends or includes.
+        """
+        paths = templates.dependencies(template_path) if templates is not None else [template_path]
+        if len(paths) == 1:
+            return self._file_names(paths[0])
+        return frozenset().union(*(self._file_names(path) for path in paths))
+
+    def critical_css(self, used):
+        if self.rules is None:
+            return self.css
+        key = frozenset(used)
+        css = self._subsets.get(key)
+        if css is None:
+            css = "".join(rule.css_for(key) for rule in self.rules)
+            self._subsets[key] = css
+        return css
+
+    def apply(self, full_html, html_node, images=(), template_path=None, templates=None):
+        """
+        Replace the page's <link> to the stylesheet with inline CSS and add
+        the image preload hint. Pages that do not link the stylesheet only
+        get the hint.
+        """
+        template_names = self.template_names(template_path, templates) if template_path else frozenset()
+        for match in STYLESHEET_PATTERN.finditer(full_html):
+            href_match = HREF_PATTERN.search(match.group())
+            if href_match is None or href_match.group(1).rsplit("/", 1)[-1] != self.href_name:
+                continue
+            href = href_match.group(1)
+            css = self.critical_css(used_names(html_node, template_names))
+            replacement = f"<style>{css}</style>"
+            if self.rules is not None:
+                replacement += (
+                    f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+                    f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+                )
+            full_html = full_html[:match.start()] + replacement + full_html[match.end():]
+            break
+        # Images inlined as data URIs need no request to preload
+        inliner = ImageNode.inliner
+        first_image = next((src for _, src in images if inliner is None or inliner.data_uri(src) is None), None)
+        if first_image is not None and HEAD_END in full_html:
+            hint = f'<link rel="preload" as="image" href="{escape_attr(first_image)}">'
+            full_html = full_html.replace(HEAD_END, hint + HEAD_END, 1)
+        return full_html
@@ -0,0 +1,118 @@
+import base64
+import hashlib
+import mimetypes
+import os
+from .memory import format_bytes
+from .textnode import ImageNode
+
+DEFAULT_THRESHOLD = 2048
+
+
+class ImageInliner:
+    """
+    Turns images of at most threshold bytes into base64 data URIs, which
+    ImageNode.to_html emits instead of the src path while the inliner is
+    installed, for instance for the duration of a with block. Root-relative
+    srcs are looked up under static_dir; anything else, including paths
+    that climb out of it, is left alone. Encodings are cached by the hash of the file, so
+    each image is read and encoded once per build however many pages, or
+    paths, use it.
+    """
+    def __init__(self, static_dir, threshold=DEFAULT_THRESHOLD):
+        self.static_dir = static_dir
+        self.threshold = threshold
+        self._sources = {}
+        self._encoded = {}
+        self._signature = None
+        self._previous = None
+        self.pages = 0
+        self.pages_skipped = 0
+        self.requests_saved = 0
+
+    @property
+    def signature(self):
+        """
+        Hash of the threshold and of every file under static_dir small
+        enough to be inlined, so pages are rebuilt when one changes.
+        """
+        if self._signature is None:
+            digest = hashlib.sha256(str(self.threshold).encode("ascii"))
+            for dirpath, dirnames, filenames in os.walk(self.static_dir):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    path = os.path.join(dirpath, name)
+                    if os.path.getsize(path) > self.threshold:
+                        continue
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    digest.update(f"\0{os.path.relpath(path, self.static_dir)}\0".encode("utf-8"))
+                    digest.update(hashlib.sha256(data).digest())
+            self._signature = digest.hexdigest()
+        return self._signature
+
+    def install(self):
+        self._previous = ImageNode.inliner
+        ImageNode.inliner = self
+        return self
+
+    def uninstall(self):
+        if ImageNode.inliner is self:
+            ImageNode.inliner = self._previous
+            self._previous = None
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def _digest(self, src):
+        if not src.startswith("/") or src.startswith("//"):
+            return None
+        root = os.path.normpath(self.static_dir)
+        path = os.path.normpath(os.path.join(root, *src.split("?", 1)[0].split("#", 1)[0].lstrip("/").split("/")))
+        if not path.startswith(os.path.join(root, "")):
+            return None
+        try:
+            if os.path.getsize(path) > self.threshold:
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._encoded:
+            mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            self._encoded[digest] = (f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}", len(data))
+        return digest
+
+    def data_uri(self, src):
+        """
+        The data URI for src, or None if the image is not inlined.
+        """
+        if src in self._sources:
+            digest = self._sources[src]
+        else:
+            digest = self._sources[src] = self._digest(src)
+        return self._encoded[digest][0] if digest is not None else None
+
+    def record_page(self, images):
+        """
+        Count the requests a page no longer makes: one per distinct image
+        of its (alt, src) list that was inlined.
+        """
+        self.pages += 1
+        self.requests_saved += sum(1 for src in {src for _, src in images} if self.data_uri(src) is not None)
+
+    def print_report(self):
+        """
+        Counts cover the pages rendered by this build. Pages a resumed build
+        kept from an earlier one still have their images inlined, but are
+        only mentioned by number.
+        """
+        encoded = sum(size for _, size in self._encoded.values())
+        kept = f" ({self.pages_skipped} unchanged pages kept, not counted)" if self.pages_skipped else ""
+        print(
+            f"Inlined {len(self._encoded)} images ({format_bytes(encoded)}) as data URIs, "
+            f"eliminating {self.requests_saved} requests across {self.pages} rendered pages{kept}"
+        )
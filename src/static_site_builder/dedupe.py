@@ -0,0 +1,127 @@
+import os
+from .cache import load_json, save_json
+from .manifest import hash_file
+
+# Linux ioctl that makes a copy-on-write clone of a whole file
+FICLONE = 0x40049409
+
+
+def clone_file(source_path, dest_path):
+    """
+    Reflink dest_path to source_path's data. Raises OSError where the
+    filesystem does not support it.
+    """
+    import fcntl
+    with open(source_path, "rb") as src, open(dest_path, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+class ContentStore:
+    """
+    Content-addressed store of output files: objects/<aa>/<sha256>. Outputs
+    are hardlinked to their object, so identical files share one inode and
+    the store must live on the same filesystem as the output tree.
+    """
+    def __init__(self, root):
+        self.root = root
+
+    def object_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def add(self, path, digest):
+        object_path = self.object_path(digest)
+        object_dir = os.path.dirname(object_path)
+        if not os.path.exists(object_dir):
+            os.makedirs(object_dir)
+        os.link(path, object_path)
+
+    def link_into(self, digest, dest_path, mode="hardlink"):
+        """
+        Replace dest_path with the stored object, as a hardlink or, in
+        "reflink" mode, a copy-on-write clone (falling back to a hardlink).
+        """
+        object_path = self.object_path(digest)
+        tmp_path = dest_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if mode == "reflink":
+            try:
+                clone_file(object_path, tmp_path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                os.link(object_path, tmp_path)
+        else:
+            os.link(object_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+
+    def prune(self):
+        """
+        Delete objects that no output links to any more. Returns the count.
+        """
+        removed = 0
+        if not os.path.exists(self.root):
+            return removed
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if os.stat(path).st_nlink == 1:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+
+class DedupeReport:
+    def __init__(self):
+        self.files = 0
+        self.linked = 0
+        self.bytes_saved = 0
+
+    def __repr__(self) -> str:
+        return f"DedupeReport({self.files} files, {self.linked} linked, {self.bytes_saved} bytes saved)"
+
+
+def dedupe_tree(root, store, index_path=None, mode="hardlink"):
+    """
+    Hash every file under root and link duplicates to a single object in
+    the content store. Hashes are cached by path, inode, size and mtime in
+    index_path, so files an incremental build left alone are neither re-read
+    nor linked again.
+    """
+    if mode not in ("hardlink", "reflink"):
+        raise ValueError(f"Unsupported dedupe mode: {mode}")
+    previous = load_json(index_path, {})
+    index = {}
+    seen = set()
+    report = DedupeReport()
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            stat = os.stat(path)
+            key = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+            cached = previous.get(path)
+            unchanged = cached is not None and cached[:3] == key
+            digest = cached[3] if unchanged else hash_file(path)
+            report.files += 1
+
+            object_path = store.object_path(digest)
+            if not os.path.exists(object_path):
+                store.add(path, digest)
+            elif not unchanged and not os.path.samefile(path, object_path):
+                # An unchanged file was linked or cloned by the last run; a
+                # reflinked clone never is the same file as its object
+                store.link_into(digest, path, mode)
+                report.linked += 1
+                stat = os.stat(path)
+            if digest in seen:
+                report.bytes_saved += stat.st_size
+            seen.add(digest)
+            index[path] = [stat.st_ino, stat.st_size, stat.st_mtime_ns, digest]
+
+    store.prune()
+    if index_path:
+        save_json(index_path, index)
+    return report
+
@@ -0,0 +1,207 @@
+import os
+from .cache import load_json, save_json
+
+YAML_DELIMITER = "---"
+TOML_DELIMITER = "+++"
+# Keys whose values are text even when they look like numbers or booleans
+TEXT_KEYS = frozenset(("title", "description", "summary", "author", "date", "lastmod", "template", "sort_by"))
+
+
+def parse_value(raw, text=False):
+    """
+    Parse a single front-matter value. Supports quoted strings, integers,
+    floats, booleans and flat [a, b, c] lists; everything else is a string.
+    With text, the value is always a string, only unquoted.
+    """
+    value = raw.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if text:
+        return value
+    if value.startswith("[") and value.endswith("]"):
+        inner = value[1:-1].strip()
+        if not inner:
+            return []
+        return [parse_value(item) for item in inner.split(",")]
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    return value
+
+
+def parse_front_matter_lines(lines, delimiter):
+    """
+    Parse the lines between the front-matter delimiters into a dict.
+    YAML-lite uses "key: value", TOML-lite uses "key = value".
+    """
+    separator = ":" if delimiter == YAML_DELIMITER else "="
+    metadata = {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        key, found, value = stripped.partition(separator)
+        if not found:
+            raise ValueError(f"Invalid front matter line: {stripped}")
+        key = key.strip()
+        metadata[key] = parse_value(value, text=key in TEXT_KEYS)
+    return metadata
+
+
+def split_front_matter(markdown):
+    """
+    Split a markdown document into (metadata, body). Documents without
+    front matter return an empty dict and the unchanged markdown.
+    """
+    first_line, _, rest = markdown.partition("\n")
+    delimiter = first_line.strip()
+    if delimiter not in (YAML_DELIMITER, TOML_DELIMITER):
+        return {}, markdown
+
+    lines = rest.split("\n")
+    for i, line in enumerate(lines):
+        if line.strip() == delimiter:
+            metadata = parse_front_matter_lines(lines[:i], delimiter)
+            return metadata, "\n".join(lines[i + 1:])
+    raise ValueError("Unterminated front matter block")
+
+
+def read_front_matter(path):
+    """
+    Read only the header of a markdown file. Returns (metadata, body_offset)
+    where body_offset is the byte offset at which the body starts.
+
+    When the front matter has no title, reading continues only until the
+    first h1 line so listings still get a title without parsing the body.
+    """
+    with open(path, "rb") as f:
+        first_line = f.readline()
+        delimiter = first_line.decode("utf-8").strip()
+        metadata = {}
+        body_offset = 0
+
+        if delimiter in (YAML_DELIMITER, TOML_DELIMITER):
+            header_lines = []
+            while True:
+                line = f.readline()
+                if not line:
+                    raise ValueError(f"Unterminated front matter block in {path}")
+                text = line.decode("utf-8")
+                if text.strip() == delimiter:
+                    break
+                header_lines.append(text)
+            metadata = parse_front_matter_lines(header_lines, delimiter)
+            body_offset = f.tell()
+        else:
+            f.seek(0)
+
+        if "title" not in metadata:
+            for line in f:
+                stripped = line.decode("utf-8").strip()
+                if stripped.startswith("# "):
+                    metadata["title"] = stripped[2:].strip()
+                    break
+
+    return metadata, body_offset
+
+
+class Page:
+    """
+    A content file whose metadata is known up front and whose markdown
+    body is only read from disk the first time it is needed.
+    """
+    def __init__(self, path, metadata, body_offset=0):
+        self.path = path
+        self.metadata = metadata
+        self.body_offset = body_offset
+        self._body = None
+
+    @property
+    def title(self):
+        title = self.metadata.get("title")
+        # Indexes written before TEXT_KEYS may hold a numeric title
+        return str(title) if title is not None else None
+
+    @property
+    def date(self):
+        return self.metadata.get("date")
+
+    @property
+    def body(self):
+        if self._body is None:
+            with open(self.path, "rb") as f:
+                f.seek(self.body_offset)
+                self._body = f.read().decode("utf-8")
+        return self._body
+
+    def __repr__(self) -> str:
+        return f"Page({self.path}, {self.metadata})"
+
+
+class MetadataIndex:
+    """
+    On-disk cache of front-matter metadata keyed by path. An entry is
+    reused as long as the file's mtime and size have not changed.
+    """
+    def __init__(self, index_path=None):
+        self.index_path = index_path
+        self.entries = load_json(index_path, {})
+        self.dirty = False
+
+    def get_page(self, path):
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return Page(path, entry["metadata"], entry["body_offset"])
+
+        metadata, body_offset = read_front_matter(path)
+        self.entries[path] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "metadata": metadata,
+            "body_offset": body_offset,
+        }
+        self.dirty = True
+        return Page(path, metadata, body_offset)
+
+    def prune(self, paths):
+        """
+        Drop entries for files that are no longer in the given set of paths.
+        """
+        stale = [path for path in self.entries if path not in paths]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self.dirty = True
+
+    def save(self):
+        if not self.index_path or not self.dirty:
+            return
+        save_json(self.index_path, self.entries)
+        self.dirty = False
+
+
+def load_section(dir_path, index):
+    """
+    Return a Page for every markdown file directly inside dir_path or in
+    its subdirectories, skipping the section's own index.md.
+    """
+    pages = []
+    section_index = os.path.join(dir_path, "index.md")
+    for root, dirs, files in os.walk(dir_path):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".md"):
+                continue
+            path = os.path.join(root, name)
+            if path == section_index:
+                continue
+            pages.append(index.get_page(path))
+    return pages
@@ -0,0 +1,149 @@
+import re
+from functools import lru_cache
+from .htmlnode import LeafNode, ParentNode
+
+HIGHLIGHT_CACHE_SIZE = 4096
+
+PYTHON_KEYWORDS = (
+    "False None True and as assert async await break class continue def del elif else except "
+    "finally for from global if import in is lambda nonlocal not or pass raise return try while with yield"
+)
+PYTHON_BUILTINS = (
+    "abs all any bool bytes dict enumerate filter float getattr hasattr int isinstance len list map "
+    "max min object open print range repr set sorted str sum super tuple type zip"
+)
+JS_KEYWORDS = (
+    "async await break case catch class const continue default delete do else export extends false "
+    "finally for function if import in instanceof let new null of return static super switch this "
+    "throw true try typeof undefined var void while yield"
+)
+SHELL_KEYWORDS = "case do done elif else esac export fi for function if in local return then until while"
+
+
+def _words(words):
+    return r"\b(?:" + "|".join(words.split()) + r")\b"
+
+
+NUMBER = r"\b(?:0[xX][0-9a-fA-F_]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)\b"
+
+# Per language, (token type, regex) pairs tried in order at each position.
+# Token types become <span class="tok-..."> in the output.
+LANGUAGE_RULES = {
+    "python": [
+        ("comment", r"#[^\n]*"),
+        ("string", r"(?:(?<!\w)(?i:[rbuf]{1,2}))?(?:'''[\s\S]*?'''|\"\"\"[\s\S]*?\"\"\"|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\")"),
+        ("keyword", _words(PYTHON_KEYWORDS)),
+        ("builtin", _words(PYTHON_BUILTINS)),
+        ("name", r"@[\w.]+"),
+        ("number", NUMBER),
+    ],
+    "javascript": [
+        ("comment", r"//[^\n]*|/\*[\s\S]*?\*/"),
+        ("string", r"'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"|`(?:\\.|[^`\\])*`"),
+        ("keyword", _words(JS_KEYWORDS)),
+        ("number", NUMBER),
+    ],
+    "css": [
+        ("comment", r"/\*[\s\S]*?\*/"),
+        ("string", r"'[^'\n]*'|\"[^\"\n]*\""),
+        ("keyword", r"@[\w-]+|!important"),
+        ("name", r"[\w-]+(?=\s*:[^:{};]*[;}])"),
+        ("number", r"#[0-9a-fA-F]{3,8}\b|(?<![\w#-])-?\d*\.?\d+(?:%|[a-z]+)?"),
+    ],
+    "html": [
+        ("comment", r"<!--[\s\S]*?-->"),
+        ("keyword", r"<!DOCTYPE[^>]*>"),
+        ("name", r"</?[\w:-]+|/?>"),
+        ("attr", r"[\w:-]+(?==)"),
+        ("string", r"\"[^\"]*\"|'[^']*'"),
+    ],
+    "shell": [
+        ("comment", r"(?<![\w$])#[^\n]*"),
+        ("string", r"'[^']*'|\"(?:\\.|[^\"\\])*\""),
+        ("attr", r"\$(?:\{[^}\n]*\}|\w+|[@*#?$!])"),
+        ("keyword", _words(SHELL_KEYWORDS)),
+    ],
+    "json": [
+        ("attr", r"\"(?:\\.|[^\"\\\n])*\"(?=\s*:)"),
+        ("string", r"\"(?:\\.|[^\"\\\n])*\""),
+        ("keyword", r"\b(?:true|false|null)\b"),
+        ("number", r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?"),
+    ],
+}
+
+LANGUAGE_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "mjs": "javascript",
+    "ts": "javascript",
+    "typescript": "javascript",
+    "xml": "html",
+    "svg": "html",
+    "sh": "shell",
+    "bash": "shell",
+    "zsh": "shell",
+    "console": "shell",
+}
+
+_patterns = {}
+
+
+def canonical_language(language):
+    language = language.lower()
+    return LANGUAGE_ALIASES.get(language, language)
+
+
+def language_pattern(language):
+    """
+    The combined token pattern for a language, compiled on first use, or
+    None for languages without a tokenizer.
+    """
+    pattern = _patterns.get(language)
+    if pattern is None and language in LANGUAGE_RULES:
+        rules = LANGUAGE_RULES[language]
+        pattern = re.compile("|".join(f"(?P<{token}{i}>{regex})" for i, (token, regex) in enumerate(rules)))
+        _patterns[language] = pattern
+    return pattern
+
+
+def tokenize_code(language, code):
+    """
+    Split code into (token type, text) pairs, with None as the type of text
+    between tokens. Joining the texts gives back the code unchanged.
+    """
+    pattern = language_pattern(language)
+    tokens = []
+    position = 0
+    for match in pattern.finditer(code):
+        start, end = match.span()
+        if start == end:
+            continue
+        if start > position:
+            tokens.append((None, code[position:start]))
+        tokens.append((match.lastgroup.rstrip("0123456789"), match.group()))
+        position = end
+    if position < len(code):
+        tokens.append((None, code[position:]))
+    return tokens
+
+
+@lru_cache(maxsize=HIGHLIGHT_CACHE_SIZE)
+def highlight_code(language, code):
+    """
+    A frozen <code class="language-..."> node with the code's tokens wrapped
+    in spans. The node is cached by (language, code): a snippet repeated
+    across pages is tokenized and rendered once and the frozen node is
+    shared by every tree it appears in.
+    """
+    language = canonical_language(language)
+    props = {"class": f"language-{language}"}
+    if language_pattern(language) is None or not code:
+        return LeafNode("code", code, props=props).freeze()
+    children = []
+    for token, text in tokenize_code(language, code):
+        if token is None:
+            children.append(LeafNode(None, text))
+        else:
+            children.append(LeafNode("span", text, props={"class": f"tok-{token}"}))
+    return ParentNode("code", children, props=props).freeze()
@@ -0,0 +1,341 @@
+import copy
+import weakref
+from types import MappingProxyType
+
+# Attributes that change what a node renders to
+RENDER_FIELDS = frozenset(("tag", "value", "children", "props"))
+
+def escape_text(text):
+    """
+    Escape text content. Strings without special characters, which is
+    nearly all of them, are returned as-is without being copied. The few
+    that need escaping go through chained replace() calls, which beat a
+    str.translate table several times over on strings with a handful of
+    special characters.
+    """
+    if type(text) is not str:
+        text = str(text)
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attr(value):
+    """
+    Escape an attribute value, which additionally needs both quote characters.
+    """
+    if type(value) is not str:
+        value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value or "'" in value:
+        return (value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+                .replace('"', "&quot;").replace("'", "&#x27;"))
+    return value
+
+
+class HTMLNode:
+    # Render cache state, see enable_cache() and freeze(). Nodes that use
+    # neither keep plain attribute assignment.
+    _tracked = False
+    _frozen = False
+    _cache_html = False
+    _html = None
+    _parents = None
+
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+        
+    def to_html(self):
+        raise NotImplementedError("Subclasses must implement this method")
+    
+    def enable_cache(self):
+        """
+        Opt in to caching this node's HTML. The cached HTML is dropped when
+        the tag, value, children or props of this node or of any node below
+        it change, including in-place changes to children lists and props.
+        """
+        self._cache_html = True
+        self._track()
+        return self
+    
+    def freeze(self):
+        """
+        Make this subtree immutable and render it once. Frozen fragments can
+        be shared between any number of trees and render for free.
+        """
+        if self._frozen:
+            return self
+        if self.children is not None:
+            for child in self.children:
+                if isinstance(child, HTMLNode):
+                    child.freeze()
+            object.__setattr__(self, "children", tuple(self.children))
+        if self.props is not None:
+            object.__setattr__(self, "props", MappingProxyType(dict(self.props)))
+        self._html = self.to_html()
+        if not self._tracked:
+            self.__class__ = _tracked_class(type(self))
+        self._frozen = True
+        return self
+    
+    @property
+    def frozen(self):
+        return self._frozen
+    
+    def _wrap(self, name, value):
+        if name == "children" and value is not None:
+            return _ChildList(self, value)
+        if name == "props" and value is not None:
+            return _PropsDict(self, value)
+        return value
+    
+    def _track(self):
+        # Watch this subtree for mutations so cached ancestors can be invalidated
+        if self._tracked or self._frozen:
+            return
+        self.__class__ = _tracked_class(type(self))
+        for name in ("children", "props"):
+            object.__setattr__(self, name, self._wrap(name, getattr(self, name)))
+        self._adopt_children()
+    
+    def _adopt_children(self):
+        if self.children is None:
+            return
+        for child in self.children:
+            if isinstance(child, HTMLNode) and not child._frozen:
+                child._track()
+                if child._parents is None:
+                    child._parents = weakref.WeakSet()
+                child._parents.add(self)
+    
+    def _changed_in_place(self, container):
+        if container is self.children:
+            self._adopt_children()
+        self._invalidate()
+    
+    def _invalidate(self):
+        self._html = None
+        if self._parents:
+            for parent in list(self._parents):
+                parent._invalidate()
+    
+    def props_to_html(self):
+        if self.props is None:
+            return ""
+        return " ".join([f"{k}=\"{escape_attr(v)}\"" for k, v in self.props.items()])
+    
+    def __repr__(self):
+        return f"HTMLNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
+
+
+
+class _TrackedNode:
+    """
+    Mixed into the class of a node by enable_cache() and freeze(): changes
+    to its render fields invalidate cached HTML, or fail once it is frozen.
+    """
+    _tracked = True
+
+    def __setattr__(self, name, value):
+        if name in RENDER_FIELDS:
+            if self._frozen:
+                raise AttributeError(f"Cannot set {name} on a frozen {type(self).__name__}")
+            object.__setattr__(self, name, self._wrap(name, value))
+            if name == "children":
+                self._adopt_children()
+            self._invalidate()
+            return
+        object.__setattr__(self, name, value)
+
+    def __deepcopy__(self, memo):
+        # Frozen fragments are immutable and meant to be shared
+        if self._frozen:
+            return self
+        # The copy gets its own tracking and an empty cache, not the
+        # original's parents or its owned children list and props
+        node = object.__new__(type(self).__bases__[1])
+        memo[id(self)] = node
+        for name, value in self.__dict__.items():
+            if name in ("_html", "_parents"):
+                continue
+            if isinstance(value, _ChildList):
+                value = list(value)
+            elif isinstance(value, _PropsDict):
+                value = dict(value)
+            object.__setattr__(node, name, copy.deepcopy(value, memo))
+        node._track()
+        return node
+
+
+_tracked_classes = {}
+
+
+def _tracked_class(cls):
+    tracked = _tracked_classes.get(cls)
+    if tracked is None:
+        tracked = _tracked_classes[cls] = type(cls.__name__, (_TrackedNode, cls), {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+        })
+    return tracked
+
+
+class LeafNode(HTMLNode):
+    def __init__(self, tag, value, children=None, props=None, cache=False):
+        super().__init__(tag, value, children, props)
+        if cache:
+            self.enable_cache()
+
+    def to_html(self):
+        if self._html is not None:
+            return self._html
+        if self.value is None:
+            raise ValueError("LeafNode must have a value")
+        value = escape_text(self.value)
+        if self.tag is None:
+            return value
+        props_html = self.props_to_html()
+        if props_html:
+            html = f"<{self.tag} {props_html}>{value}</{self.tag}>"
+        else:
+            html = f"<{self.tag}>{value}</{self.tag}>"
+        if self._cache_html:
+            self._html = html
+        return html
+    
+    def __repr__(self):
+        return f"LeafNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
+
+
+class ParentNode(HTMLNode):
+    def __init__(self, tag, children, props=None, cache=False):
+        super().__init__(tag, None, children, props)
+        if cache:
+            self.enable_cache()
+
+    def to_html(self):
+        if self._html is not None:
+            return self._html
+        return render_html(self)
+    
+    def __repr__(self):
+        return f"ParentNode(tag={self.tag}, children={self.children}, props={self.props})"
+
+
+def render_html(node):
+    """
+    Render a node tree to HTML without recursion. Nodes are walked with an
+    explicit stack and every fragment is appended to a single output list,
+    so deep trees neither hit the recursion limit nor pay a call and a join
+    per level. Output is identical to the recursive to_html.
+    """
+    if not isinstance(node, ParentNode):
+        return node.to_html()
+    out = []
+    append = out.append
+    # Each entry is (children iterator, closing tag, (cached node, output start))
+    stack = [(iter((node,)), None, None)]
+    push = stack.append
+    while stack:
+        children, close_tag, cached = stack[-1]
+        for child in children:
+            child_type = type(child)
+            if child_type is LeafNode:
+                # Leaves are rendered inline without touching the stack. A
+                # node of exactly this class has no cached HTML, as caching
+                # and freezing swap in a tracked subclass.
+                value = child.value
+                if type(value) is not str:
+                    if value is None:
+                        raise ValueError("LeafNode must have a value")
+                    value = str(value)
+                if "&" in value or "<" in value or ">" in value:
+                    value = escape_text(value)
+                tag = child.tag
+                if tag is None:
+                    append(value)
+                elif child.props:
+                    attrs = " ".join([f'{k}="{escape_attr(v)}"' for k, v in child.props.items()])
+                    append(f"<{tag} {attrs}>{value}</{tag}>")
+                else:
+                    append(f"<{tag}>{value}</{tag}>")
+                continue
+            if child_type is ParentNode:
+                start = None
+            elif child is node or (isinstance(child, ParentNode) and child_type.to_html is ParentNode.to_html):
+                # Cached and frozen ParentNodes
+                html = child._html
+                if html is not None:
+                    append(html)
+                    continue
+                start = (child, len(out)) if child._cache_html else None
+            else:
+                # Other node types, cached leaves and subclasses with their
+                # own to_html render themselves
+                append(child.to_html())
+                continue
+
+            tag = child.tag
+            if tag is None:
+                raise ValueError("ParentNode must have a tag")
+            if child.children is None:
+                raise ValueError("ParentNode must have children")
+            if child.props:
+                attrs = " ".join([f'{k}="{escape_attr(v)}"' for k, v in child.props.items()])
+                append(f"<{tag} {attrs}>")
+            else:
+                append(f"<{tag}>")
+            push((iter(child.children), f"</{tag}>", start))
+            break
+        else:
+            stack.pop()
+            if close_tag is not None:
+                append(close_tag)
+            if cached is not None:
+                # End of a cached subtree: store everything it produced
+                cached_node, start = cached
+                cached_node._html = "".join(out[start:])
+    return "".join(out)
+
+
+def _notify_owner(method):
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        # Unpickling fills the container before its owner is set
+        owner = getattr(self, "_owner", None)
+        if owner is not None:
+            owner._changed_in_place(self)
+        return result
+    mutate.__name__ = method.__name__
+    return mutate
+
+
+class _ChildList(list):
+    """
+    Children list of a tracked node that invalidates the render cache when
+    it is modified in place.
+    """
+    def __init__(self, owner, items):
+        super().__init__(items)
+        self._owner = owner
+
+
+class _PropsDict(dict):
+    """
+    Props dict of a tracked node that invalidates the render cache when it
+    is modified in place.
+    """
+    def __init__(self, owner, items):
+        super().__init__(items)
+        self._owner = owner
+
+
+for _name in ("append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(_ChildList, _name, _notify_owner(getattr(list, _name)))
+
+for _name in ("__setitem__", "__delitem__", "pop", "popitem", "clear", "update", "setdefault", "__ior__"):
+    setattr(_PropsDict, _name, _notify_owner(getattr(dict, _name)))
+
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+from .manifest import hash_file
+
+DEFAULT_BATCH_SIZE = 64
+
+
+class BuildJournal:
+    """
+    Append-only log of the outputs a build has finished, one JSON line per
+    output: {"dest": ..., "source": <hash of the inputs>, "output": <hash of
+    the written file>}. Lines are fsynced in batches, so after a crash the
+    journal lists (almost) everything that was completed, and a resumed
+    build only redoes outputs that are missing from the journal, whose
+    inputs changed or whose file no longer matches the recorded hash.
+    """
+    def __init__(self, path, manifest, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.manifest = manifest
+        self.batch_size = batch_size
+        self.entries = {}
+        self.resuming = False
+        self._file = None
+        self._pending = 0
+
+    def open(self, resume=False):
+        """
+        Start a journal. A fresh build truncates it; a resumed build first
+        loads the entries of the interrupted one and appends to them.
+        """
+        journal_dir = os.path.dirname(self.path)
+        if journal_dir and not os.path.exists(journal_dir):
+            os.makedirs(journal_dir)
+        self.resuming = resume
+        if resume:
+            self.entries = self._load()
+            # Drop a torn final line so appended entries start on a clean line
+            self._rewrite()
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self.entries = {}
+            self._file = open(self.path, "w", encoding="utf-8")
+        return self
+
+    def _load(self):
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave the last line half written
+                    break
+                entries[entry["dest"]] = entry
+        return entries
+
+    def _rewrite(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def source_hash(self, *paths, extra=""):
+        """
+        Combined hash of the input files (content hashes from the manifest)
+        plus any extra settings that change the output.
+        """
+        digest = hashlib.sha256(extra.encode("utf-8"))
+        for path in paths:
+            digest.update(self.manifest.record(path)["hash"].encode("ascii"))
+        return digest.hexdigest()
+
+    def is_complete(self, dest_path, source_hash):
+        """
+        True if a previous run of this build already produced dest_path from
+        the same inputs and the file on disk is still what it wrote.
+        """
+        if not self.resuming:
+            return False
+        entry = self.entries.get(dest_path)
+        if entry is None or entry["source"] != source_hash:
+            return False
+        return os.path.exists(dest_path) and hash_file(dest_path) == entry["output"]
+
+    def record(self, dest_path, source_hash):
+        entry = {"dest": dest_path, "source": source_hash, "output": hash_file(dest_path)}
+        self.entries[dest_path] = entry
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.sync()
+
+    def refresh(self, dest_path):
+        """
+        Record the new contents of an output a later stage rewrote in place,
+        keeping the input hash it was recorded with.
+        """
+        entry = self.entries.get(dest_path)
+        if entry is not None:
+            self.record(dest_path, entry["source"])
+
+    def sync(self):
+        if self._file is None or not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
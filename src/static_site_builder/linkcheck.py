@@ -0,0 +1,162 @@
+import os
+import posixpath
+from urllib.parse import unquote, urlsplit
+from .cache import cache_path, load_json, save_json
+from .frontmatter import split_front_matter
+from .textnode import analyze_markdown
+
+
+class BrokenLink:
+    def __init__(self, source_path, line, kind, url):
+        self.source_path = source_path
+        self.line = line
+        self.kind = kind
+        self.url = url
+
+    def __str__(self) -> str:
+        return f"{self.source_path}:{self.line}: broken {self.kind} {self.url}"
+
+    def __repr__(self) -> str:
+        return f"BrokenLink({self.source_path}:{self.line}, {self.kind}, {self.url})"
+
+
+def output_index(context, dest_root):
+    """
+    Set of every output path of the build, relative to dest_root and
+    "/"-separated. Taken from the archive when the build streams into one.
+    """
+    if not context.output.writes_files:
+        return set(context.output.names)
+    paths = set()
+    for dirpath, dirnames, filenames in os.walk(dest_root):
+        rel_dir = os.path.relpath(dirpath, dest_root).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        for name in filenames:
+            paths.add(prefix + name)
+    return paths
+
+
+def resolve_target(url, base_dir, site_prefix=None):
+    """
+    Output path an internal URL points at, relative to the dest root, or
+    None for external URLs and same-page anchors. Root-relative URLs are
+    resolved against the dest root because rewrite_basepath adds the
+    basepath to them; absolute URLs into the site itself (site_prefix, the
+    site URL plus basepath) are treated as root-relative.
+    """
+    if site_prefix and url.startswith(site_prefix):
+        url = "/" + url[len(site_prefix):].lstrip("/")
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        return None
+    path = unquote(parts.path)
+    if not path:
+        return None
+    if not path.startswith("/"):
+        path = "/" + base_dir + "/" + path
+    target = posixpath.normpath(path).lstrip("/")
+    if target in ("", "."):
+        return "index.html"
+    if path.endswith("/"):
+        return target + "/index.html"
+    return target
+
+
+KIND_CODES = {"link": "L", "image": "I"}
+CODE_KINDS = {code: kind for kind, code in KIND_CODES.items()}
+
+
+def source_references(source_path):
+    """
+    The references of a page read again from its markdown, with the line
+    numbers a render would give them.
+    """
+    with open(source_path, "r", encoding="utf-8") as f:
+        markdown = f.read()
+    _, body = split_front_matter(markdown)
+    first_line = markdown.count("\n") - body.count("\n") + 1
+    _, metadata = analyze_markdown(body, first_line=first_line)
+    return metadata.references
+
+
+def encode_references(references):
+    # One string per page parses far faster than a list of lists per link
+    return "\n".join(f"{KIND_CODES[kind]}{line} {url}" for kind, url, line in references)
+
+
+def decode_references(encoded):
+    references = []
+    for item in encoded.split("\n") if encoded else []:
+        line, _, url = item[1:].partition(" ")
+        references.append((CODE_KINDS[item[0]], url, int(line)))
+    return references
+
+
+class LinkCache:
+    """
+    Link targets of every page, keyed by source path together with the
+    page's content hash. Pages a resumed build did not render are still
+    checked with the targets recorded when they last were, or, when none
+    were recorded, with those parsed again from their markdown. The cache
+    file is only read when the build has such pages.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = None
+        self.updates = {}
+
+    def references(self, page, dest):
+        if page.document is not None:
+            self.updates[page.source_path] = {"hash": page.content_hash, "dest": dest, "refs": encode_references(page.document.references)}
+            return page.document.references
+        if self.entries is None:
+            self.entries = load_json(self.path, {})
+        entry = self.entries.get(page.source_path)
+        if entry and entry["hash"] == page.content_hash and entry["dest"] == dest:
+            self.updates[page.source_path] = entry
+            return decode_references(entry["refs"])
+        references = source_references(page.source_path)
+        self.updates[page.source_path] = {"hash": page.content_hash, "dest": dest, "refs": encode_references(references)}
+        return references
+
+    def save(self):
+        # Only pages of this build are kept, the rest were removed
+        if self.path:
+            save_json(self.path, self.updates)
+
+
+def check_links(context, dest_root):
+    """
+    Check every internal link and image target gathered while rendering
+    against the outputs of the build. Returns the broken ones as
+    BrokenLink objects, ordered by source file and line.
+    """
+    outputs = output_index(context, dest_root)
+    link_cache = LinkCache(cache_path("links.json", context.cache_dir))
+    site_prefix = context.absolute_url("/") if context.site_url else None
+    resolved = {}
+    broken = []
+
+    root_prefix = os.path.join(os.path.normpath(dest_root), "")
+    for page in context.pages:
+        if page.dest_path.startswith(root_prefix):
+            dest = page.dest_path[len(root_prefix):]
+        else:
+            dest = os.path.relpath(page.dest_path, dest_root)
+        dest = dest.replace(os.sep, "/")
+        references = link_cache.references(page, dest)
+        base_dir = posixpath.dirname(dest)
+        for kind, url, line in references:
+            # Only relative paths depend on the page, share everything else
+            key = url if url.startswith(("/", "#")) or ":" in url else (base_dir, url)
+            found = resolved.get(key)
+            if found is None:
+                target = resolve_target(url, base_dir, site_prefix)
+                found = target is None or target in outputs or target + "/index.html" in outputs
+                resolved[key] = found
+            if not found:
+                broken.append(BrokenLink(page.source_path, line, kind, url))
+
+    link_cache.save()
+    broken.sort(key=lambda link: (link.source_path, link.line))
+    return broken
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from .htmlnode import LeafNode, ParentNode
+from .textnode import markdown_to_html_node
+from .frontmatter import load_section
+from .template import TemplateEnvironment, page_variables, rewrite_basepath
+from .output import FileSystemSink
+from .cache import load_json, save_json
+from .build import page_url
+
+DEFAULT_PER_PAGE = 10
+
+
+def sort_pages(pages, sort_by="date"):
+    """
+    Sort pages newest first by date, or alphabetically by title.
+    Pages without a date go after all dated pages.
+    """
+    by_title = sorted(pages, key=lambda page: str(page.title or "").lower())
+    if sort_by == "title":
+        return by_title
+    if sort_by == "date":
+        dated = [page for page in by_title if page.date is not None]
+        undated = [page for page in by_title if page.date is None]
+        return sorted(dated, key=lambda page: str(page.date), reverse=True) + undated
+    raise ValueError(f"Unsupported listing sort: {sort_by}")
+
+
+def paginate(items, per_page):
+    if per_page < 1:
+        raise ValueError("per_page must be at least 1")
+    pages = [items[i:i + per_page] for i in range(0, len(items), per_page)]
+    return pages or [[]]
+
+
+def listing_page_url(section_url, number):
+    section_url = section_url.rstrip("/")
+    if number == 1:
+        return section_url + "/"
+    return f"{section_url}/page/{number}/"
+
+
+def listing_dest_path(dest_dir, number):
+    if number == 1:
+        return os.path.join(dest_dir, "index.html")
+    return os.path.join(dest_dir, "page", str(number), "index.html")
+
+
+def listing_to_html_nodes(entries, number, total, section_url):
+    """
+    Build the list of entries and the previous/next navigation for one
+    listing page.
+    """
+    nodes = []
+    if entries:
+        items = []
+        for entry in entries:
+            children = [LeafNode("a", entry["title"], props={"href": entry["url"]})]
+            if entry["date"] is not None:
+                children.append(LeafNode(None, f" ({entry['date']})"))
+            items.append(ParentNode("li", children))
+        nodes.append(ParentNode("ul", items))
+
+    nav = []
+    if number > 1:
+        nav.append(LeafNode("a", "< Previous", props={"href": listing_page_url(section_url, number - 1)}))
+    if number < total:
+        nav.append(LeafNode("a", "Next >", props={"href": listing_page_url(section_url, number + 1)}))
+    if nav:
+        nodes.append(ParentNode("nav", nav))
+    return nodes
+
+
+class ListingCache:
+    """
+    Signatures of previously generated listing pages, keyed by section.
+    A listing page is only rewritten when its signature changes.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.sections = load_json(path, {})
+
+    def save(self):
+        if self.path:
+            save_json(self.path, self.sections)
+
+
+def _signature(*parts):
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def generate_section_listing(index_path, content_root, template_path, dest_dir, basepath, metadata_index, listing_cache=None, output=None, templates=None):
+    """
+    Generate paginated listing pages for the section whose index.md sets
+    "listing: true" in its front matter. Entries come from the cached
+    front matter of the section's pages, so posts are never rendered.
+    Listing pages whose signature is unchanged and whose file still exists
+    are skipped, so only --resume builds, which keep docs/, reuse them.
+    Returns the number of listing pages that were (re)written.
+    """
+    if listing_cache is None:
+        listing_cache = ListingCache()
+    if output is None:
+        output = FileSystemSink()
+    if templates is None:
+        templates = TemplateEnvironment(os.path.dirname(template_path) or ".")
+
+    section_page = metadata_index.get_page(index_path)
+    settings = section_page.metadata
+    title = settings.get("title")
+    if title is None:
+        raise ValueError(f"No title for section listing: {index_path}")
+
+    section_dir = os.path.dirname(index_path)
+    section_url = page_url(content_root, index_path)
+    pages = sort_pages(load_section(section_dir, metadata_index), settings.get("sort_by", "date"))
+    entries = [
+        {
+            "title": page.title or page_url(content_root, page.path),
+            "url": page_url(content_root, page.path),
+            "date": page.date,
+        }
+        for page in pages
+    ]
+    chunks = paginate(entries, int(settings.get("per_page", DEFAULT_PER_PAGE)))
+
+    # Covers the template and everything it extends or includes
+    template_signature = templates.signature(template_path)
+
+    previous = listing_cache.sections.get(index_path, {})
+    signatures = {}
+    written = 0
+    for number, chunk in enumerate(chunks, start=1):
+        dest_path = listing_dest_path(dest_dir, number)
+        # Only the first page shows the section's own markdown body
+        intro = section_page.body if number == 1 else None
+        signature = _signature(template_signature, basepath, templates.site, title, intro, number, len(chunks), chunk)
+        signatures[dest_path] = signature
+        if previous.get(dest_path) == signature and output.exists(dest_path):
+            continue
+
+        print(f"Generating listing page {number}/{len(chunks)} for {index_path} to {dest_path}")
+        if intro is not None:
+            html_node = markdown_to_html_node(intro)
+        else:
+            html_node = ParentNode("div", [])
+        html_node.children.extend(listing_to_html_nodes(chunk, number, len(chunks), section_url))
+        variables = page_variables(title, html_node.to_html(), basepath, settings, site=templates.site)
+        variables["listing"] = {"entries": chunk, "number": number, "count": len(chunks)}
+        full_html = rewrite_basepath(templates.render(template_path, variables), basepath)
+        output.write_text(dest_path, full_html)
+        written += 1
+
+    # Remove listing pages left over from a longer listing
+    for dest_path in previous:
+        if dest_path not in signatures and output.exists(dest_path):
+            print(f"Removing stale listing page: {dest_path}")
+            output.remove(dest_path)
+
+    listing_cache.sections[index_path] = signatures
+    return written
@@ -0,0 +1,390 @@
+import argparse
+import os
+import shutil
+import sys
+from contextlib import nullcontext
+from .textnode import analyze_markdown
+from .frontmatter import split_front_matter
+from .build import BuildContext, page_section, page_url
+from .cache import cache_path
+from .journal import BuildJournal
+from .template import TemplateEnvironment, page_variables, rewrite_basepath
+from .output import FileSystemSink
+
+def copy_files_recursive(source_dir, dest_dir, journal=None, output=None):
+    """
+    Recursively copy all files and directories from source_dir to dest_dir.
+    First deletes all contents of dest_dir if it exists, unless a resumed
+    build's journal says which files are already in place or the output
+    goes to an archive instead of the dest_dir tree.
+    """
+    if output is None:
+        output = FileSystemSink()
+    if not output.writes_files:
+        _copy_directory_contents(source_dir, dest_dir, journal, output)
+        return
+    
+    if journal is not None and journal.resuming:
+        if not os.path.exists(dest_dir):
+            os.mkdir(dest_dir)
+        _copy_directory_contents(source_dir, dest_dir, journal, output)
+        return
+    
+    # Delete destination directory if it exists
+    if os.path.exists(dest_dir):
+        print(f"Deleting existing directory: {dest_dir}")
+        shutil.rmtree(dest_dir)
+    
+    # Create destination directory
+    print(f"Creating directory: {dest_dir}")
+    os.mkdir(dest_dir)
+    
+    # Copy all contents recursively
+    _copy_directory_contents(source_dir, dest_dir, journal, output)
+
+def _copy_directory_contents(source_dir, dest_dir, journal, output):
+    """
+    Helper function to recursively copy directory contents.
+    """
+    if not os.path.exists(source_dir):
+        print(f"Source directory does not exist: {source_dir}")
+        return
+    
+    # List all items in source directory, sorted so archives are reproducible
+    for item in sorted(os.listdir(source_dir)):
+        source_path = os.path.join(source_dir, item)
+        dest_path = os.path.join(dest_dir, item)
+        
+        if os.path.isfile(source_path):
+            source_hash = None
+            if journal is not None:
+                source_hash = journal.source_hash(source_path)
+                if journal.is_complete(dest_path, source_hash):
+                    continue
+            # Copy file
+            print(f"Copying file: {source_path} -> {dest_path}")
+            output.copy_file(source_path, dest_path)
+            if journal is not None:
+                journal.record(dest_path, source_hash)
+        else:
+            # Create directory and copy contents recursively
+            if output.writes_files and not os.path.exists(dest_path):
+                print(f"Creating directory: {dest_path}")
+                os.mkdir(dest_path)
+            _copy_directory_contents(source_path, dest_path, journal, output)
+
+def generate_page(from_path, template_path, dest_path, basepath="/", collect_terms=False, output=None, templates=None, critical_css=None, related=()):
+    """
+    Generate an HTML page from markdown content using a template, written
+    through output (files on disk by default). Includes and extends in the
+    template are resolved by templates, by default relative to the
+    template's directory. With a CriticalCss, the stylesheet is inlined
+    into the page's head. related is the page's list of related posts.
+    Returns the DocumentMetadata collected while rendering the page.
+    """
+    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    
+    # Read markdown file
+    with open(from_path, 'r', encoding='utf-8') as f:
+        markdown_content = f.read()
+    
+    # Strip front matter before rendering the body
+    front_matter, body = split_front_matter(markdown_content)
+    first_line = markdown_content.count("\n") - body.count("\n") + 1
+    
+    # Convert markdown to HTML, collecting title, headings and links on the way
+    html_node, metadata = analyze_markdown(body, collect_terms, first_line)
+    html_content = html_node.to_html()
+    
+    title = front_matter.get("title", metadata.title)
+    if title is None:
+        raise ValueError(f"No h1 header found in markdown: {from_path}")
+    
+    if templates is None:
+        templates = TemplateEnvironment(os.path.dirname(template_path) or ".")
+    variables = page_variables(title, html_content, basepath, front_matter, metadata.headings, related, templates.site)
+    full_html = templates.render(template_path, variables)
+    if critical_css is not None:
+        full_html = critical_css.apply(full_html, html_node, metadata.images, template_path, templates)
+    full_html = rewrite_basepath(full_html, basepath)
+    if output is None:
+        output = FileSystemSink()
+    output.write_text(dest_path, full_html)
+    
+    return metadata
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/", context=None):
+    """
+    Recursively generate HTML pages for all markdown files in a directory.
+    With a BuildContext, a section index.md with "listing: true" front
+    matter is turned into paginated listing pages and every generated page
+    is recorded for the later build stages. Pages and listing pages whose
+    inputs are unchanged are kept rather than rewritten, which only saves
+    work in --resume builds: a fresh build wipes dest_dir first.
+    """
+    if not os.path.exists(dir_path_content):
+        print(f"Content directory does not exist: {dir_path_content}")
+        return
+    
+    # Create destination directory if it doesn't exist
+    if (context is None or context.output.writes_files) and not os.path.exists(dest_dir_path):
+        os.makedirs(dest_dir_path)
+    
+    # Process all items in the content directory, sorted so archives are reproducible
+    for item in sorted(os.listdir(dir_path_content)):
+        item_path = os.path.join(dir_path_content, item)
+        
+        if os.path.isfile(item_path):
+            # Check if it's a markdown file
+            if item.endswith('.md'):
+                # Generate corresponding HTML filename
+                html_filename = item[:-3] + '.html'  # Replace .md with .html
+                dest_path = os.path.join(dest_dir_path, html_filename)
+                
+                if context is None:
+                    generate_page(item_path, template_path, dest_path, basepath)
+                    continue
+                
+                url = page_url(context.content_root, item_path)
+                page = context.metadata_index.get_page(item_path)
+                if context.templates is None:
+                    context.templates = TemplateEnvironment(os.path.dirname(template_path) or ".", context.cache_dir)
+                    context.templates.site = context.site
+                # Front matter or the section can pick another template
+                page_template = context.templates.select(template_path, page.metadata, page_section(context.content_root, item_path))
+                if item == 'index.md' and page.metadata.get('listing'):
+                    from .listing import generate_section_listing
+                    generate_section_listing(item_path, context.content_root, page_template, dest_dir_path, basepath, context.metadata_index, context.listing_cache, context.output, context.templates)
+                    context.add_page(item_path, dest_path, url, page.title, page.date)
+                    continue
+                
+                related = context.related.get(item_path) if context.related is not None else []
+                journal = context.journal
+                if journal is not None:
+                    # Every template the page's template extends or includes is an input
+                    extra = basepath + (context.critical_css.signature if context.critical_css else "")
+                    extra += "".join(f"\0{key}={value}" for key, value in sorted(context.site.items()))
+                    extra += "".join(f"\0{post['url']}\0{post['title']}" for post in related)
+                    # Stages that use per-page data gathered while rendering
+                    extra += f"\0terms={context.collect_terms}\0links={context.check_links}"
+                    if context.image_inliner is not None:
+                        extra += f"\0{context.image_inliner.signature}"
+                    source_hash = journal.source_hash(item_path, *context.templates.dependencies(page_template), extra=extra)
+                    if journal.is_complete(dest_path, source_hash):
+                        # Finished before an interrupted build, keep it
+                        context.add_page(item_path, dest_path, url, page.title, page.date)
+                        if context.image_inliner is not None:
+                            context.image_inliner.pages_skipped += 1
+                        continue
+                
+                # Generate the page, under memory accounting with --memory-report
+                report = context.memory_report
+                with report.measure(item_path) if report is not None else nullcontext():
+                    document = generate_page(item_path, page_template, dest_path, basepath, context.collect_terms, context.output, context.templates, context.critical_css, related)
+                context.add_page(item_path, dest_path, url, page.title or document.title, page.date, document)
+                if context.image_inliner is not None:
+                    context.image_inliner.record_page(document.images)
+                if journal is not None:
+                    journal.record(dest_path, source_hash)
+                
+        elif os.path.isdir(item_path):
+            # Recursively process subdirectory
+            subdest_path = os.path.join(dest_dir_path, item)
+            generate_pages_recursive(item_path, template_path, subdest_path, basepath, context)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Build the static site from content/ into docs/.")
+    parser.add_argument("basepath", nargs="?", default="/", help="URL prefix the site is served under")
+    parser.add_argument("--site-url", help="absolute site origin used for sitemap.xml and feed.xml, e.g. https://example.com")
+    parser.add_argument("--site-author", metavar="NAME", help="author of the site, named in feed.xml and available to templates as site.author (default for the feed: the home page title)")
+    parser.add_argument("--search", action="store_true", help="build the sharded client-side search index")
+    parser.add_argument("--resume", action="store_true", help="keep docs/ and reuse it: continue an interrupted build from its journal, and only rewrite the pages and listing pages whose content, templates (with everything they extend or include) or settings changed; without it docs/ is wiped and rebuilt")
+    parser.add_argument("--check-links", action="store_true", help="report internal links and images that point at no output, and fail the build if there are any")
+    parser.add_argument("--related", nargs="?", const=5, type=int, metavar="COUNT", help="find the COUNT (default 5) most similar posts of each page under content/blog/ for the template's related variable")
+    parser.add_argument("--inline-css", nargs="?", const=8192, type=int, metavar="BYTES", help="inline static/index.css into each page, whole if it is at most BYTES (default 8192), else only the rules the page can use")
+    parser.add_argument("--inline-images", nargs="?", const=2048, type=int, metavar="BYTES", help="embed images of at most BYTES (default 2048) as data URIs instead of linking them")
+    parser.add_argument("--prefetch", nargs="?", const=3, type=int, metavar="COUNT", help="add <link rel=\"prefetch\"> hints for the COUNT (default 3) most likely next pages of each page")
+    parser.add_argument("--prefetch-by", choices=["position", "pagerank"], default="position", help="rank a page's out-links by position alone, or weighted by their PageRank over the link graph")
+    parser.add_argument("--service-worker", action="store_true", help="write sw.js and precache-manifest.json so repeat visits only download changed files")
+    parser.add_argument("--precache-include", action="append", metavar="GLOB", help="precache only output files matching this glob (repeatable, default: all)")
+    parser.add_argument("--precache-exclude", action="append", metavar="GLOB", help="never precache output files matching this glob (repeatable, default: *.gz and *.map)")
+    parser.add_argument("--precache-max-size", type=int, default=1024 * 1024, metavar="BYTES", help="leave files larger than this out of the precache (default 1 MiB)")
+    parser.add_argument("--precache-max-total", type=int, default=20 * 1024 * 1024, metavar="BYTES", help="keep the precache under this many bytes, smallest files first (default 20 MiB)")
+    parser.add_argument("--budgets", metavar="FILE", help="JSON file of per-section page-weight budgets; the build fails if a page exceeds one")
+    parser.add_argument("--weight-report", nargs="?", const="total", choices=["html", "gzip", "images", "requests", "total"], help="print the weight of every page, heaviest first by this column (default: total)")
+    parser.add_argument("--memory-report", action="store_true", help="trace memory while generating each page and print the most expensive pages and the peak RSS")
+    parser.add_argument("--memory-limit", type=float, metavar="MB", help="stop the build when generating one page allocates more than this many megabytes (implies --memory-report)")
+    parser.add_argument("--archive", help="stream the site into this .tar.gz or .zip instead of writing docs/")
+    parser.add_argument("--dedupe", nargs="?", const="hardlink", choices=["hardlink", "reflink"], help="link identical output files to one copy in a content-addressed store (default mode: hardlink)")
+    args = parser.parse_args(argv)
+    if args.archive and (args.resume or args.dedupe or args.budgets or args.weight_report or args.prefetch is not None or args.service_worker):
+        parser.error("--resume, --dedupe, --prefetch, --service-worker, --budgets and --weight-report work on the docs/ tree and cannot be combined with --archive")
+    return args
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        from .serve import main as serve
+        return serve(argv[1:])
+    args = parse_args(argv)
+    basepath = args.basepath
+    
+    print(f"Using basepath: {basepath}")
+    
+    # Copy static files to docs directory
+    static_dir = "./static"
+    docs_dir = "./docs"
+    
+    # Front matter, listing and content hash caches persist between builds
+    context = BuildContext("content", docs_dir, basepath, args.site_url)
+    context.collect_terms = args.search
+    context.check_links = args.check_links
+    
+    if args.archive:
+        # Outputs go straight into the archive, docs/ is left untouched
+        from .archive import ArchiveSink
+        context.output = ArchiveSink(args.archive, docs_dir)
+        # Its sitemap, feed, listing and search signatures must not make a
+        # later docs/ build believe those files are current
+        context.use_output_cache("archive")
+        journal = None
+    else:
+        # Completed outputs are journaled so a killed build can be resumed
+        journal = BuildJournal(cache_path("journal.jsonl", context.cache_dir), context.manifest)
+        journal.open(resume=args.resume)
+        context.journal = journal
+        if args.resume:
+            print(f"Resuming build, {len(journal.entries)} outputs in the journal")
+    
+    print("Starting file copy process...")
+    copy_files_recursive(static_dir, docs_dir, journal, context.output)
+    print("File copy process completed!")
+    
+    # An empty tuple catches nothing when no memory limit is being enforced
+    memory_limit_error = ()
+    if args.inline_css is not None:
+        from .critical import CriticalCss
+        context.critical_css = CriticalCss(os.path.join(static_dir, "index.css"), args.inline_css)
+    
+    if args.site_author:
+        context.site["author"] = args.site_author
+    
+    if args.service_worker:
+        # Lets the template register the worker
+        context.site["service_worker"] = basepath + "sw.js"
+    
+    if args.inline_images is not None:
+        from .datauri import ImageInliner
+        context.image_inliner = ImageInliner(static_dir, args.inline_images)
+    
+    if args.related is not None:
+        print("\nFinding related posts...")
+        from .related import RelatedPosts
+        context.related = RelatedPosts(cache_path("related.json", context.cache_dir), args.related)
+        context.related.update(context, "blog")
+    
+    if args.memory_report or args.memory_limit is not None:
+        from .memory import MemoryReport, MemoryLimitExceeded
+        memory_limit_error = MemoryLimitExceeded
+        limit = int(args.memory_limit * 1024 * 1024) if args.memory_limit is not None else None
+        context.memory_report = MemoryReport(limit).start()
+    
+    # Generate all pages recursively
+    print("\nGenerating pages...")
+    try:
+        # ImageNodes render small images as data URIs only while pages are generated
+        with context.image_inliner if context.image_inliner is not None else nullcontext():
+            generate_pages_recursive(
+                "content",
+                "template.html", 
+                "docs",
+                basepath,
+                context
+            )
+    except memory_limit_error as e:
+        # Keep what was finished so the build can be resumed after a fix
+        if journal is not None:
+            journal.close()
+        context.save()
+        sys.exit(f"error: {e}")
+    print("Page generation completed!")
+    
+    if context.image_inliner is not None:
+        context.image_inliner.print_report()
+    
+    if context.memory_report is not None:
+        context.memory_report.stop()
+        print()
+        context.memory_report.print_report()
+    
+    if args.prefetch is not None:
+        print("\nAdding prefetch hints...")
+        from .prefetch import write_prefetch_hints
+        rewritten = write_prefetch_hints(context, docs_dir, args.prefetch, args.prefetch_by == "pagerank")
+        print(f"Prefetch hints changed in {rewritten} pages")
+    
+    if args.site_url:
+        print("\nWriting sitemap and feed...")
+        from .sitemap import write_sitemaps, write_atom_feed
+        write_sitemaps(context, docs_dir)
+        home = next((page for page in context.pages if page.url == "/"), None)
+        write_atom_feed(context, docs_dir, home.title if home else "Feed")
+    else:
+        print("\nNo --site-url given, skipping sitemap.xml and feed.xml")
+    
+    if args.search:
+        print("\nUpdating search index...")
+        from .search import build_search_index
+        build_search_index(context, docs_dir)
+    
+    if args.service_worker:
+        print("\nWriting service worker and precache manifest...")
+        from .precache import write_service_worker, DEFAULT_EXCLUDE
+        changeset, skipped = write_service_worker(
+            context,
+            docs_dir,
+            args.precache_include or ["*"],
+            args.precache_exclude or DEFAULT_EXCLUDE,
+            args.precache_max_size,
+            args.precache_max_total,
+        )
+        print(f"Precache: {len(changeset.added)} added, {len(changeset.modified)} changed, {len(changeset.deleted)} removed, {len(skipped)} left out for size")
+    
+    broken_links = []
+    if args.check_links:
+        print("\nChecking internal links...")
+        from .linkcheck import check_links
+        broken_links = check_links(context, docs_dir)
+        for link in broken_links:
+            print(link)
+        print(f"{len(broken_links)} broken links")
+    
+    budget_violations = []
+    if args.budgets or args.weight_report:
+        print("\nWeighing pages...")
+        from .budget import measure_pages, load_budgets, check_budgets, print_weight_report
+        weights = measure_pages(context, docs_dir)
+        if args.weight_report:
+            print_weight_report(weights, args.weight_report)
+        if args.budgets:
+            budget_violations = check_budgets(weights, load_budgets(args.budgets))
+            for violation in budget_violations:
+                print(violation)
+            print(f"{len(budget_violations)} budget violations")
+    
+    if args.dedupe:
+        print("\nDeduplicating output files...")
+        from .dedupe import ContentStore, dedupe_tree
+        store = ContentStore(cache_path("objects", context.cache_dir))
+        report = dedupe_tree(docs_dir, store, cache_path("dedupe.json", context.cache_dir), args.dedupe)
+        print(f"{report.files} files, {report.linked} linked, {report.bytes_saved} bytes saved")
+    
+    if journal is not None:
+        journal.close()
+    context.output.close()
+    context.save()
+    if broken_links or budget_violations:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
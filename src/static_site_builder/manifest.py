@@ -0,0 +1,55 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from .cache import load_json, save_json
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class ContentManifest:
+    """
+    Content hashes of source files, keyed by path. Files are only re-hashed
+    when their mtime or size changes, and "lastmod" only moves forward when
+    the hash itself changes, so touching a file does not change its lastmod.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = load_json(path, {})
+        self.dirty = False
+
+    def record(self, source_path):
+        stat = os.stat(source_path)
+        entry = self.entries.get(source_path)
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry
+
+        content_hash = hash_file(source_path)
+        if entry is None or entry["hash"] != content_hash:
+            lastmod = utc_now()
+        else:
+            lastmod = entry["lastmod"]
+        entry = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": content_hash,
+            "lastmod": lastmod,
+        }
+        self.entries[source_path] = entry
+        self.dirty = True
+        return entry
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        save_json(self.path, self.entries)
+        self.dirty = False
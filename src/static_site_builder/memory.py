@@ -0,0 +1,130 @@
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from .htmlnode import HTMLNode
+from .textnode import ImageNode, TextNode
+
+DEFAULT_TOP = 10
+
+
+class MemoryLimitExceeded(RuntimeError):
+    pass
+
+
+class PageMemory:
+    def __init__(self, path, peak, text_nodes, html_nodes):
+        self.path = path
+        self.peak = peak
+        self.text_nodes = text_nodes
+        self.html_nodes = html_nodes
+
+    def __repr__(self) -> str:
+        return f"PageMemory({self.path}, {format_bytes(self.peak)}, {self.text_nodes} text nodes, {self.html_nodes} html nodes)"
+
+
+def format_bytes(size):
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def peak_rss():
+    """
+    Peak resident set size of this process in bytes, or None where the
+    resource module is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class NodeCounter:
+    """
+    Counts TextNode and HTML node constructions while installed, by
+    wrapping the constructors. Nothing is wrapped when no report is asked
+    for, so normal builds pay nothing for it.
+    """
+    def __init__(self):
+        self.text_nodes = 0
+        self.html_nodes = 0
+        self._originals = []
+
+    def install(self):
+        counter = self
+
+        def counting(cls, attribute):
+            original = cls.__init__
+
+            def __init__(self, *args, **kwargs):
+                setattr(counter, attribute, getattr(counter, attribute) + 1)
+                original(self, *args, **kwargs)
+
+            self._originals.append((cls, original))
+            cls.__init__ = __init__
+
+        counting(TextNode, "text_nodes")
+        counting(HTMLNode, "html_nodes")
+        counting(ImageNode, "html_nodes")
+
+    def uninstall(self):
+        for cls, original in reversed(self._originals):
+            cls.__init__ = original
+        self._originals = []
+
+
+class MemoryReport:
+    """
+    Per-page memory accounting for --memory-report: the peak traced
+    allocation while each page is generated and the number of text and
+    HTML nodes it created. With a limit (in bytes), a page whose peak
+    exceeds it stops the build with MemoryLimitExceeded.
+    """
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.pages = []
+        self.counter = NodeCounter()
+
+    def start(self):
+        tracemalloc.start()
+        self.counter.install()
+        return self
+
+    def stop(self):
+        self.counter.uninstall()
+        tracemalloc.stop()
+
+    @contextmanager
+    def measure(self, path):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        text_nodes = self.counter.text_nodes
+        html_nodes = self.counter.html_nodes
+        yield
+        _, peak = tracemalloc.get_traced_memory()
+        page = PageMemory(
+            path,
+            max(peak - current, 0),
+            self.counter.text_nodes - text_nodes,
+            self.counter.html_nodes - html_nodes,
+        )
+        self.pages.append(page)
+        if self.limit is not None and page.peak > self.limit:
+            raise MemoryLimitExceeded(
+                f"Generating {path} allocated {format_bytes(page.peak)}, over the "
+                f"{format_bytes(self.limit)} per-page limit ({page.text_nodes} text nodes, {page.html_nodes} html nodes)"
+            )
+
+    def top(self, count=DEFAULT_TOP):
+        return sorted(self.pages, key=lambda page: page.peak, reverse=True)[:count]
+
+    def print_report(self, count=DEFAULT_TOP):
+        print(f"Peak memory of the {min(count, len(self.pages))} most expensive of {len(self.pages)} pages:")
+        for page in self.top(count):
+            print(f"  {format_bytes(page.peak):>10}  {page.text_nodes:>8} text  {page.html_nodes:>8} html  {page.path}")
+        rss = peak_rss()
+        if rss is not None:
+            print(f"Peak RSS of the build: {format_bytes(rss)}")
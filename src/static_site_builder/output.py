@@ -0,0 +1,70 @@
+import os
+import shutil
+
+
+def _ensure_parent(dest_path):
+    # Create destination directory if it doesn't exist
+    dest_dir = os.path.dirname(dest_path)
+    if dest_dir and not os.path.exists(dest_dir):
+        os.makedirs(dest_dir)
+
+
+def write_page(dest_path, full_html):
+    """
+    Write a rendered page, creating its directory if needed.
+
+    Outputs are written to a temporary file and renamed into place, never
+    rewritten in place, so a file hardlinked by the dedupe stage is replaced
+    rather than modified through every link.
+    """
+    _ensure_parent(dest_path)
+    tmp_path = dest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(full_html)
+    os.replace(tmp_path, dest_path)
+
+
+def copy_file(source_path, dest_path):
+    """
+    Copy a file into the output the same way write_page writes pages.
+    """
+    _ensure_parent(dest_path)
+    tmp_path = dest_path + ".tmp"
+    shutil.copy(source_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+class FileSystemSink:
+    """
+    Output backend that writes the site as files under its root directory.
+    Build stages write through a sink, so they work the same whether the
+    site goes to disk or straight into an archive.
+    """
+    writes_files = True
+
+    def write_text(self, dest_path, text):
+        write_page(dest_path, text)
+
+    def write_lines(self, dest_path, lines):
+        """
+        Stream lines into a file through a temporary file, one at a time.
+        """
+        _ensure_parent(dest_path)
+        tmp_path = dest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line)
+        os.replace(tmp_path, dest_path)
+
+    def copy_file(self, source_path, dest_path):
+        copy_file(source_path, dest_path)
+
+    def exists(self, dest_path):
+        return os.path.exists(dest_path)
+
+    def remove(self, dest_path):
+        os.remove(dest_path)
+
+    def close(self):
+        pass
+
@@ -0,0 +1,46 @@
+import compileall
+import os
+import shutil
+import sys
+import tempfile
+import zipapp
+
+DEFAULT_TARGET = os.path.join("dist", "static-site-builder.pyz")
+
+# Only what the builder needs at run time goes into the archive
+EXCLUDE = shutil.ignore_patterns("__pycache__", "test_*.py", "benchmark.py", "pack.py")
+
+
+def build_zipapp(target=DEFAULT_TARGET, interpreter="/usr/bin/env python3"):
+    """
+    Bundle the builder into a single executable zipapp. Modules are stored
+    as precompiled bytecode only, so a cold start does not compile anything.
+    The archive must be run with the same Python version that built it.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as staging:
+        staged_package = os.path.join(staging, "static_site_builder")
+        shutil.copytree(package_dir, staged_package, ignore=EXCLUDE)
+        # legacy=True writes module.pyc next to module.py, where zipimport looks
+        if not compileall.compile_dir(staged_package, quiet=1, legacy=True):
+            raise RuntimeError("Failed to compile the builder to bytecode")
+        for name in os.listdir(staged_package):
+            if name.endswith(".py"):
+                os.remove(os.path.join(staged_package, name))
+
+        target_dir = os.path.dirname(target)
+        if target_dir and not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+        zipapp.create_archive(
+            staging,
+            target,
+            interpreter=interpreter,
+            main="static_site_builder.main:main",
+            compressed=True,
+        )
+    print(f"Wrote {target}")
+    return target
+
+
+if __name__ == "__main__":
+    build_zipapp(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TARGET)
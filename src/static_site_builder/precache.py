@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+from fnmatch import fnmatchcase
+from .cache import cache_path, load_json, save_json
+from .release import build_release_manifest, diff_manifests
+
+WORKER_NAME = "sw.js"
+MANIFEST_NAME = "precache-manifest.json"
+DEFAULT_INCLUDE = ("*",)
+DEFAULT_EXCLUDE = ("*.gz", "*.map")
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+DEFAULT_MAX_TOTAL_SIZE = 20 * 1024 * 1024
+REVISION_LENGTH = 16
+
+# VERSION changes with every manifest, so browsers install the new worker,
+# which then downloads only the entries whose revision changed.
+SERVICE_WORKER = """// Written by static-site-builder --service-worker, do not edit.
+var VERSION = "%(version)s";
+var CACHE = "precache";
+var MANIFEST = "%(manifest)s";
+var REVISIONS = "__precache-revisions";
+var scope = self.registration.scope;
+
+function absolute(path) {
+  return new URL(path, scope).href;
+}
+
+function refresh(cache, entries, revisions) {
+  var changed = Object.keys(entries).filter(function (path) {
+    return revisions[path] !== entries[path];
+  });
+  var removed = Object.keys(revisions).filter(function (path) {
+    return !(path in entries);
+  });
+  return Promise.all(changed.map(function (path) {
+    return fetch(absolute(path), { cache: "no-cache" }).then(function (response) {
+      if (!response.ok) throw new Error("Precaching " + path + " failed: " + response.status);
+      return cache.put(absolute(path), response);
+    });
+  }).concat(removed.map(function (path) {
+    return cache.delete(absolute(path));
+  })));
+}
+
+self.addEventListener("install", function (event) {
+  event.waitUntil(Promise.all([
+    fetch(absolute(MANIFEST + "?v=" + VERSION), { cache: "no-cache" }).then(function (response) {
+      return response.json();
+    }),
+    caches.open(CACHE),
+  ]).then(function (results) {
+    var manifest = results[0];
+    var cache = results[1];
+    return cache.match(absolute(REVISIONS)).then(function (response) {
+      return response ? response.json() : {};
+    }).then(function (revisions) {
+      return refresh(cache, manifest.entries, revisions);
+    }).then(function () {
+      return cache.put(absolute(REVISIONS), new Response(JSON.stringify(manifest.entries)));
+    });
+  }).then(function () {
+    return self.skipWaiting();
+  }));
+});
+
+self.addEventListener("activate", function (event) {
+  event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener("fetch", function (event) {
+  var request = event.request;
+  if (request.method !== "GET" || request.url.indexOf(scope) !== 0) return;
+  var path = new URL(request.url).pathname.slice(new URL(scope).pathname.length);
+  var name = path.slice(path.lastIndexOf("/") + 1);
+  if (path === "" || name === "") {
+    path += "index.html";
+  } else if (name.indexOf(".") < 0) {
+    path += "/index.html";
+  }
+  event.respondWith(caches.open(CACHE).then(function (cache) {
+    return cache.match(absolute(path)).then(function (response) {
+      return response || fetch(request);
+    });
+  }));
+});
+"""
+
+
+def select_entries(manifest, include=DEFAULT_INCLUDE, exclude=DEFAULT_EXCLUDE,
+                   max_file_size=DEFAULT_MAX_FILE_SIZE, max_total_size=DEFAULT_MAX_TOTAL_SIZE):
+    """
+    The paths of a release manifest to precache: those matching an include
+    glob and no exclude glob ("*" also matches "/"), of at most
+    max_file_size bytes. If they add up to more than max_total_size, the
+    smallest files are kept. Returns (selected paths, paths left out for
+    their size).
+    """
+    candidates = []
+    skipped = []
+    for path, entry in manifest.items():
+        if path in (WORKER_NAME, MANIFEST_NAME):
+            continue
+        if not any(fnmatchcase(path, pattern) for pattern in include):
+            continue
+        if any(fnmatchcase(path, pattern) for pattern in exclude):
+            continue
+        if entry["size"] > max_file_size:
+            skipped.append(path)
+            continue
+        candidates.append((entry["size"], path))
+    candidates.sort()
+
+    selected = []
+    total = 0
+    for size, path in candidates:
+        if total + size > max_total_size:
+            skipped.append(path)
+            continue
+        total += size
+        selected.append(path)
+    return sorted(selected), sorted(skipped)
+
+
+def precache_manifest(manifest, paths):
+    """
+    The manifest the service worker reads: a revision per path, taken from
+    the file's content hash, and a version covering all of them.
+    """
+    entries = {path: manifest[path]["hash"][:REVISION_LENGTH] for path in paths}
+    version = hashlib.sha256(json.dumps(entries, sort_keys=True).encode("utf-8")).hexdigest()[:REVISION_LENGTH]
+    return {"version": version, "entries": entries}
+
+
+def write_service_worker(context, dest_root, include=DEFAULT_INCLUDE, exclude=DEFAULT_EXCLUDE,
+                         max_file_size=DEFAULT_MAX_FILE_SIZE, max_total_size=DEFAULT_MAX_TOTAL_SIZE):
+    """
+    Write sw.js and precache-manifest.json into dest_root. Output files are
+    hashed through the release manifest format, kept in
+    .cache/precache.json, so only files whose size or mtime changed are
+    re-hashed; both outputs are left untouched when no entry changed.
+    Returns the Changeset of precached entries since the last build and
+    the paths left out for their size.
+    """
+    state_path = cache_path("precache.json", context.cache_dir)
+    state = load_json(state_path, {"files": {}, "entries": {}})
+    files = build_release_manifest(dest_root, state["files"])
+    paths, skipped = select_entries(files, include, exclude, max_file_size, max_total_size)
+    manifest = precache_manifest(files, paths)
+
+    changeset = diff_manifests(
+        {path: {"hash": revision} for path, revision in state["entries"].items()},
+        {path: {"hash": revision} for path, revision in manifest["entries"].items()},
+    )
+    worker_path = os.path.join(dest_root, WORKER_NAME)
+    manifest_path = os.path.join(dest_root, MANIFEST_NAME)
+    if changeset or not os.path.exists(worker_path) or not os.path.exists(manifest_path):
+        context.output.write_text(manifest_path, json.dumps(manifest, separators=(",", ":"), sort_keys=True))
+        context.output.write_text(worker_path, SERVICE_WORKER % {"version": manifest["version"], "manifest": MANIFEST_NAME})
+    save_json(state_path, {"files": files, "entries": manifest["entries"]})
+    return changeset, skipped
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import posixpath
+import re
+from .cache import cache_path, load_json, save_json
+from .htmlnode import escape_attr
+from .linkcheck import LinkCache, resolve_target
+
+PREFETCH_COUNT = 3
+DAMPING = 0.85
+TOLERANCE = 1e-4
+MAX_ITERATIONS = 100
+
+PREFETCH_PATTERN = re.compile(r'<link rel="prefetch" href="[^"]*">')
+HEAD_END = "</head>"
+
+
+def link_graph(context, dest_root, link_cache):
+    """
+    The internal links between the pages of the build: for each page of
+    context.pages, the indexes of the distinct pages it links to, in the
+    order the links first appear.
+    """
+    root_prefix = os.path.join(os.path.normpath(dest_root), "")
+    dests = []
+    page_index = {}
+    for index, page in enumerate(context.pages):
+        dest = os.path.normpath(page.dest_path)
+        dest = dest[len(root_prefix):] if dest.startswith(root_prefix) else os.path.relpath(dest, dest_root)
+        dest = dest.replace(os.sep, "/")
+        dests.append(dest)
+        page_index[dest] = index
+
+    site_prefix = context.absolute_url("/") if context.site_url else None
+    graph = []
+    for index, page in enumerate(context.pages):
+        base_dir = posixpath.dirname(dests[index])
+        targets = []
+        seen = {index}
+        for kind, url, _ in link_cache.references(page, dests[index]):
+            if kind != "link":
+                continue
+            target = resolve_target(url, base_dir, site_prefix)
+            if target is None:
+                continue
+            other = page_index.get(target)
+            if other is None:
+                other = page_index.get(target + "/index.html")
+            if other is not None and other not in seen:
+                seen.add(other)
+                targets.append(other)
+        graph.append(targets)
+    return graph
+
+
+def graph_signature(urls, graph):
+    digest = hashlib.sha256()
+    for url, targets in zip(urls, graph):
+        digest.update(f"{url}\0{','.join(map(str, targets))}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def pagerank(graph, initial=None, damping=DAMPING, tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS):
+    """
+    PageRank of every node of graph (out-link lists) by power iteration,
+    started from initial when given so a slightly changed graph converges
+    in a few iterations. Rank of pages without out-links is spread evenly.
+    Each iteration sums the shares of a node's in-links with sum(map()),
+    which keeps the per-edge work out of the interpreter loop.
+    """
+    count = len(graph)
+    if count == 0:
+        return []
+    in_links = [[] for _ in range(count)]
+    for source, targets in enumerate(graph):
+        for target in targets:
+            in_links[target].append(source)
+    out_degree = [len(targets) for targets in graph]
+    dangling_nodes = [node for node, degree in enumerate(out_degree) if degree == 0]
+
+    rank = list(initial) if initial is not None else [1.0 / count] * count
+    total = sum(rank)
+    rank = [value / total for value in rank]
+    for _ in range(max_iterations):
+        share = [value / degree if degree else 0.0 for value, degree in zip(rank, out_degree)]
+        dangling = sum(map(rank.__getitem__, dangling_nodes))
+        base = (1.0 - damping + damping * dangling) / count
+        new_rank = [base + damping * sum(map(share.__getitem__, sources)) for sources in in_links]
+        delta = sum(abs(new - old) for new, old in zip(new_rank, rank))
+        rank = new_rank
+        if delta < tolerance:
+            break
+    return rank
+
+
+def choose_prefetches(graph, count=PREFETCH_COUNT, rank=None):
+    """
+    The count most likely next pages of each page: its out-links by
+    position, earlier links first, or with rank, by rank divided by
+    1 + position.
+    """
+    chosen = []
+    for targets in graph:
+        if rank is None:
+            chosen.append(targets[:count])
+            continue
+        scored = sorted(range(len(targets)), key=lambda position: -rank[targets[position]] / (1 + position))
+        chosen.append([targets[position] for position in scored[:count]])
+    return chosen
+
+
+def inject_prefetches(html, hrefs):
+    """
+    Replace the prefetch hints in a page's head with hrefs.
+    """
+    html = PREFETCH_PATTERN.sub("", html)
+    if not hrefs or HEAD_END not in html:
+        return html
+    tags = "".join(f'<link rel="prefetch" href="{escape_attr(href)}">' for href in hrefs)
+    return html.replace(HEAD_END, tags + HEAD_END, 1)
+
+
+def write_prefetch_hints(context, dest_root, count=PREFETCH_COUNT, use_pagerank=False):
+    """
+    Add <link rel="prefetch"> hints for each page's most likely next pages
+    to its output file. Link targets of pages a resumed build did not render
+    come from the link cache. PageRank starts from the ranks of the last
+    build and is skipped when the graph has not changed. Only files whose
+    hints change are rewritten, and rewritten files are recorded in the
+    journal again so a resumed build still sees them as complete. Returns
+    the number of pages rewritten.
+    """
+    link_cache = LinkCache(cache_path("links.json", context.cache_dir))
+    graph = link_graph(context, dest_root, link_cache)
+    urls = [page.url for page in context.pages]
+
+    rank = None
+    if use_pagerank:
+        state_path = cache_path("prefetch.json", context.cache_dir)
+        state = load_json(state_path, {"signature": None, "ranks": {}})
+        signature = graph_signature(urls, graph)
+        previous = state["ranks"]
+        if signature == state["signature"] and len(previous) == len(urls):
+            rank = [previous[url] for url in urls]
+        else:
+            default = 1.0 / len(urls) if urls else 0.0
+            rank = pagerank(graph, [previous.get(url, default) for url in urls])
+            save_json(state_path, {"signature": signature, "ranks": dict(zip(urls, rank))})
+
+    prefix = context.basepath.rstrip("/")
+    rewritten = 0
+    for page, targets in zip(context.pages, choose_prefetches(graph, count, rank)):
+        with open(page.dest_path, "r", encoding="utf-8") as f:
+            html = f.read()
+        new_html = inject_prefetches(html, [prefix + urls[target] for target in targets])
+        if new_html != html:
+            context.output.write_text(page.dest_path, new_html)
+            if context.journal is not None:
+                context.journal.refresh(page.dest_path)
+            rewritten += 1
+    link_cache.save()
+    return rewritten
@@ -0,0 +1,178 @@
+import hashlib
+import itertools
+import math
+import os
+from collections import Counter
+from operator import itemgetter
+from .build import page_url
+from .cache import load_json, save_json
+from .frontmatter import load_section
+from .textnode import analyze_markdown
+
+RELATED_COUNT = 5
+# A post is represented by its strongest terms only, and each term lists at
+# most MAX_POSTINGS posts, those it weighs most in
+TERMS_PER_POST = 24
+MAX_POSTINGS = 200
+# Posts sharing the most strong terms with a post are scored exactly
+CANDIDATES = 40
+# Terms in more than this share of the posts say nothing about a post
+MAX_DOCUMENT_FREQUENCY = 0.2
+
+_by_count = itemgetter(1)
+
+
+def encode_counts(counts):
+    return " ".join(f"{term}:{count}" for term, count in counts.items())
+
+
+def decode_counts(encoded):
+    counts = {}
+    for item in encoded.split():
+        term, _, count = item.rpartition(":")
+        counts[term] = int(count)
+    return counts
+
+
+def term_counts(body):
+    """
+    Term frequencies of the text nodes of a markdown body.
+    """
+    _, metadata = analyze_markdown(body, collect_terms=True)
+    return metadata.terms
+
+
+def weigh_vectors(counts_list):
+    """
+    Turn term frequencies into unit-length TF-IDF vectors ({term: weight})
+    keeping only each post's TERMS_PER_POST strongest terms. Terms that
+    occur in a single post cannot relate two posts and are dropped.
+    """
+    total = len(counts_list)
+    document_frequency = Counter()
+    for counts in counts_list:
+        document_frequency.update(counts.keys())
+    max_frequency = max(2, MAX_DOCUMENT_FREQUENCY * total)
+    idf = {
+        term: math.log(total / frequency)
+        for term, frequency in document_frequency.items()
+        if 2 <= frequency <= max_frequency and frequency < total
+    }
+
+    vectors = []
+    for counts in counts_list:
+        weights = sorted([(count * idf[term], term) for term, count in counts.items() if term in idf], reverse=True)
+        weights = weights[:TERMS_PER_POST]
+        norm = math.sqrt(sum(weight * weight for weight, _ in weights)) or 1.0
+        vectors.append({term: weight / norm for weight, term in weights})
+    return vectors
+
+
+def build_postings(vectors):
+    """
+    For each term, the indexes of the posts it weighs most in.
+    """
+    postings = {}
+    for index, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((weight, index))
+    for term, entries in postings.items():
+        if len(entries) > MAX_POSTINGS:
+            entries.sort(reverse=True)
+            del entries[MAX_POSTINGS:]
+        postings[term] = [index for _, index in entries]
+    return postings
+
+
+def most_similar(vectors, count=RELATED_COUNT):
+    """
+    The count most similar posts of every post as [(index, score), ...].
+
+    Comparing every pair is quadratic, so each post's candidates are the
+    posts found in the postings of its terms, counted at C speed by a
+    Counter over the concatenated postings. Only the CANDIDATES sharing the
+    most terms get an exact cosine score, from the intersection of the two
+    vectors' terms.
+    """
+    postings = build_postings(vectors)
+    results = []
+    for index, vector in enumerate(vectors):
+        shared = Counter(itertools.chain.from_iterable([postings[term] for term in vector]))
+        shared.pop(index, None)
+        candidates = sorted(shared.items(), key=_by_count, reverse=True)[:CANDIDATES]
+        terms = vector.keys()
+        scored = []
+        for other, _ in candidates:
+            other_vector = vectors[other]
+            score = sum([vector[term] * other_vector[term] for term in terms & other_vector.keys()])
+            scored.append((score, -other))
+        scored.sort(reverse=True)
+        results.append([(-other, score) for score, other in scored[:count] if score > 0])
+    return results
+
+
+class RelatedPosts:
+    """
+    Related posts for the pages of a section, by cosine similarity of
+    TF-IDF vectors. Term frequencies are cached per post in
+    .cache/related.json and reused while a post's mtime and size are
+    unchanged; the results are reused while no post of the section changed.
+    """
+    def __init__(self, cache_path=None, count=RELATED_COUNT):
+        self.cache_path = cache_path
+        self.count = count
+        self.state = load_json(cache_path, {"posts": {}, "signature": None, "related": {}})
+        self.pages = {}
+        self.dirty = False
+
+    def _counts(self, page, stat):
+        entry = self.state["posts"].get(page.path)
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return decode_counts(entry["terms"])
+        counts = term_counts(page.body)
+        self.state["posts"][page.path] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "terms": encode_counts(counts)}
+        self.dirty = True
+        return counts
+
+    def update(self, context, section="blog"):
+        """
+        Find the related posts of every page under content_root/section.
+        """
+        section_dir = os.path.join(context.content_root, section)
+        pages = load_section(section_dir, context.metadata_index) if os.path.isdir(section_dir) else []
+        stats = [os.stat(page.path) for page in pages]
+        self.pages = {page.path: {"title": page.title, "url": page_url(context.content_root, page.path)} for page in pages}
+
+        digest = hashlib.sha256(f"{self.count}:{TERMS_PER_POST}:{MAX_POSTINGS}:{CANDIDATES}".encode("utf-8"))
+        for page, stat in zip(pages, stats):
+            digest.update(f"\0{page.path}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+        signature = digest.hexdigest()
+        if signature == self.state["signature"]:
+            print(f"Related posts of {len(pages)} pages unchanged")
+            return
+
+        counts_list = [self._counts(page, stat) for page, stat in zip(pages, stats)]
+        paths = set(self.pages)
+        for path in [path for path in self.state["posts"] if path not in paths]:
+            del self.state["posts"][path]
+        results = most_similar(weigh_vectors(counts_list), self.count)
+        self.state["related"] = {
+            page.path: [pages[other].path for other, _ in related]
+            for page, related in zip(pages, results)
+        }
+        self.state["signature"] = signature
+        self.dirty = True
+        print(f"Found related posts for {len(pages)} pages")
+
+    def get(self, path):
+        """
+        The related posts of a page as [{"title": ..., "url": ...}], in
+        order of similarity.
+        """
+        return [self.pages[other] for other in self.state["related"].get(path, ()) if other in self.pages]
+
+    def save(self):
+        if not self.cache_path or not self.dirty:
+            return
+        save_json(self.cache_path, self.state)
+        self.dirty = False
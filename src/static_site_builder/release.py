@@ -0,0 +1,164 @@
+import argparse
+import io
+import json
+import mimetypes
+import os
+import shutil
+import sys
+import tarfile
+import zipfile
+from .cache import cache_path, load_json, save_json
+from .manifest import hash_file
+
+RELEASE_MANIFEST = cache_path("release.json")
+CHANGESET_NAME = "changeset.json"
+
+
+def build_release_manifest(root, previous=None):
+    """
+    Describe every file under root, keyed by its "/"-separated path relative
+    to root: {"size", "mtime", "hash", "content_type"}. Hashes are reused
+    from the previous manifest for files whose size and mtime are unchanged.
+    """
+    previous = previous or {}
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+            stat = os.stat(path)
+            entry = previous.get(rel_path)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                manifest[rel_path] = entry
+                continue
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            manifest[rel_path] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "hash": hash_file(path),
+                "content_type": content_type,
+            }
+    return manifest
+
+
+class Changeset:
+    """
+    Files added, modified and deleted between two release manifests.
+    """
+    def __init__(self, added, modified, deleted):
+        self.added = added
+        self.modified = modified
+        self.deleted = deleted
+
+    @property
+    def uploads(self):
+        return sorted(self.added + self.modified)
+
+    def to_json(self, manifest):
+        return {
+            "added": self.added,
+            "modified": self.modified,
+            "deleted": self.deleted,
+            "content_types": {path: manifest[path]["content_type"] for path in self.uploads},
+        }
+
+    def __bool__(self):
+        return bool(self.added or self.modified or self.deleted)
+
+    def __repr__(self) -> str:
+        return f"Changeset({len(self.added)} added, {len(self.modified)} modified, {len(self.deleted)} deleted)"
+
+
+def diff_manifests(previous, current):
+    added = sorted(path for path in current if path not in previous)
+    modified = sorted(
+        path for path in current
+        if path in previous and previous[path]["hash"] != current[path]["hash"]
+    )
+    deleted = sorted(path for path in previous if path not in current)
+    return Changeset(added, modified, deleted)
+
+
+def stage_changeset(changeset, manifest, root, staging_dir):
+    """
+    Copy the added and modified files into staging_dir, along with a
+    changeset.json listing every change (including the deletions).
+    """
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+    os.makedirs(staging_dir)
+    for rel_path in changeset.uploads:
+        dest_path = os.path.join(staging_dir, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copyfile(os.path.join(root, *rel_path.split("/")), dest_path)
+    with open(os.path.join(staging_dir, CHANGESET_NAME), "w", encoding="utf-8") as f:
+        json.dump(changeset.to_json(manifest), f, indent=2)
+
+
+def write_changeset_archive(changeset, manifest, root, fileobj, archive_format="tar"):
+    """
+    Stream the added and modified files plus changeset.json into fileobj as
+    a .tar.gz or .zip. fileobj only has to be writable, so this also works
+    for pipes and sys.stdout.buffer.
+    """
+    changeset_bytes = json.dumps(changeset.to_json(manifest), indent=2).encode("utf-8")
+    if archive_format == "tar":
+        with tarfile.open(fileobj=fileobj, mode="w|gz") as archive:
+            info = tarfile.TarInfo(CHANGESET_NAME)
+            info.size = len(changeset_bytes)
+            archive.addfile(info, io.BytesIO(changeset_bytes))
+            for rel_path in changeset.uploads:
+                archive.add(os.path.join(root, *rel_path.split("/")), arcname=rel_path)
+    elif archive_format == "zip":
+        with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(CHANGESET_NAME, changeset_bytes)
+            for rel_path in changeset.uploads:
+                archive.write(os.path.join(root, *rel_path.split("/")), arcname=rel_path)
+    else:
+        raise ValueError(f"Unsupported archive format: {archive_format}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Export the files that changed since the last release.")
+    parser.add_argument("root", nargs="?", default="docs", help="built site to release")
+    parser.add_argument("--manifest", default=RELEASE_MANIFEST, help="release manifest of the previous deploy, updated after a successful export of a non-empty changeset")
+    parser.add_argument("--stage", help="copy the changeset into this directory")
+    parser.add_argument("--archive", help="write the changeset to this .tar.gz or .zip file, or - for stdout")
+    parser.add_argument("--format", choices=["tar", "zip"], help="archive format (default: from the --archive file name, tar for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    previous = load_json(args.manifest, {})
+    current = build_release_manifest(args.root, previous)
+    changeset = diff_manifests(previous, current)
+    # Progress goes to stderr so an archive can be streamed to stdout
+    print(repr(changeset), file=sys.stderr)
+
+    exported = False
+    if args.stage:
+        stage_changeset(changeset, current, args.root, args.stage)
+        print(f"Staged changeset in {args.stage}", file=sys.stderr)
+        exported = True
+    if args.archive:
+        archive_format = args.format or ("zip" if args.archive.endswith(".zip") else "tar")
+        if args.archive == "-":
+            write_changeset_archive(changeset, current, args.root, sys.stdout.buffer, archive_format)
+        else:
+            with open(args.archive, "wb") as f:
+                write_changeset_archive(changeset, current, args.root, f, archive_format)
+            print(f"Wrote {args.archive}", file=sys.stderr)
+        exported = True
+
+    # The manifest is the baseline of the next release, so it only advances
+    # once a non-empty changeset has been exported; a failed export raises
+    # before this point
+    if not exported:
+        print("Nothing exported (no --stage or --archive), release manifest left unchanged", file=sys.stderr)
+    elif changeset:
+        save_json(args.manifest, current)
+
+
+if __name__ == "__main__":
+    main()
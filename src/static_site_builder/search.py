@@ -0,0 +1,190 @@
+import json
+import os
+from collections import Counter
+from .cache import load_json, save_json
+from .output import FileSystemSink
+from .textnode import tokenize
+
+PREFIX_LENGTH = 2
+SEARCH_DIR = "search"
+# Changes whenever tokenize() does, so pages indexed with the old terms
+# are reindexed when they are next rendered
+TERM_NORMALIZATION = "lower"
+
+
+def shard_name(term):
+    return term[:PREFIX_LENGTH]
+
+
+def encode_postings(postings):
+    """
+    Encode {doc_id: term_frequency} as a flat list of
+    [id_delta, tf, id_delta, tf, ...] sorted by doc id.
+    """
+    encoded = []
+    previous = 0
+    for doc_id in sorted(postings):
+        encoded.append(doc_id - previous)
+        encoded.append(postings[doc_id])
+        previous = doc_id
+    return encoded
+
+
+def decode_postings(encoded):
+    postings = {}
+    doc_id = 0
+    for i in range(0, len(encoded), 2):
+        doc_id += encoded[i]
+        postings[doc_id] = encoded[i + 1]
+    return postings
+
+
+class SearchIndex:
+    """
+    Inverted index split into one shard per term prefix. The canonical
+    shards live in the cache directory; only shards touched by changed
+    pages are rewritten there and copied to the output.
+
+    The state file keeps, per URL, the document id, content hash, title and
+    the terms the page contributed, so a changed page's old postings can be
+    removed without rebuilding the index.
+    """
+    def __init__(self, cache_dir):
+        self.shard_dir = os.path.join(cache_dir, SEARCH_DIR)
+        self.state_path = os.path.join(cache_dir, "search.json")
+        self.state = load_json(self.state_path, {"docs": {}, "free": [], "next_id": 0})
+        if self.state.get("normalization") != TERM_NORMALIZATION:
+            for doc in self.state["docs"].values():
+                doc["hash"] = None
+            self.state["normalization"] = TERM_NORMALIZATION
+        self._shards = {}
+        self.dirty_shards = set()
+        self.docs_dirty = False
+
+    def _shard(self, name):
+        if name not in self._shards:
+            encoded = load_json(os.path.join(self.shard_dir, name + ".json"), {})
+            self._shards[name] = {term: decode_postings(postings) for term, postings in encoded.items()}
+        return self._shards[name]
+
+    def _allocate_id(self):
+        if self.state["free"]:
+            return self.state["free"].pop()
+        doc_id = self.state["next_id"]
+        self.state["next_id"] += 1
+        return doc_id
+
+    def _remove_postings(self, doc):
+        for term in doc["terms"]:
+            name = shard_name(term)
+            shard = self._shard(name)
+            postings = shard.get(term)
+            if postings and postings.pop(doc["id"], None) is not None:
+                if not postings:
+                    del shard[term]
+                self.dirty_shards.add(name)
+
+    def update_page(self, url, title, content_hash, terms):
+        """
+        Index a page's term frequencies unless its content hash and title are
+        unchanged since the last build. Returns True if postings changed.
+        """
+        docs = self.state["docs"]
+        doc = docs.get(url)
+        if doc and doc["hash"] == content_hash and doc["title"] == title:
+            return False
+
+        if doc:
+            self._remove_postings(doc)
+            doc_id = doc["id"]
+        else:
+            doc_id = self._allocate_id()
+
+        terms = Counter(terms)
+        terms.update(tokenize(title or ""))
+        for term, count in terms.items():
+            name = shard_name(term)
+            self._shard(name).setdefault(term, {})[doc_id] = count
+            self.dirty_shards.add(name)
+
+        docs[url] = {"id": doc_id, "hash": content_hash, "title": title, "terms": sorted(terms)}
+        self.docs_dirty = True
+        return True
+
+    def remove_missing(self, urls):
+        """
+        Drop pages that were not produced by this build and free their ids.
+        """
+        docs = self.state["docs"]
+        for url in [url for url in docs if url not in urls]:
+            doc = docs.pop(url)
+            self._remove_postings(doc)
+            self.state["free"].append(doc["id"])
+            self.docs_dirty = True
+
+    def _write_docs(self, output, path, absolute_url):
+        table = [None] * self.state["next_id"]
+        for url, doc in self.state["docs"].items():
+            table[doc["id"]] = [absolute_url(url), doc["title"]]
+        output.write_text(path, json.dumps(table, separators=(",", ":"), ensure_ascii=False))
+
+    def save(self, dest_root, absolute_url, output=None):
+        """
+        Persist changed shards and copy them, plus docs.json, into
+        dest_root/search. Returns the number of output files written.
+        """
+        if output is None:
+            output = FileSystemSink()
+        for name in self.dirty_shards:
+            shard = self._shards[name]
+            encoded = {term: encode_postings(postings) for term, postings in sorted(shard.items())}
+            save_json(os.path.join(self.shard_dir, name + ".json"), encoded)
+
+        output_dir = os.path.join(dest_root, SEARCH_DIR)
+        if output.writes_files and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        written = 0
+        if os.path.exists(self.shard_dir):
+            for filename in sorted(os.listdir(self.shard_dir)):
+                if not filename.endswith(".json"):
+                    continue
+                dest_path = os.path.join(output_dir, filename)
+                if filename[:-5] in self.dirty_shards or not output.exists(dest_path):
+                    output.copy_file(os.path.join(self.shard_dir, filename), dest_path)
+                    written += 1
+
+        # Basepath or site URL changes alter every URL in docs.json
+        base = absolute_url("/")
+        docs_path = os.path.join(output_dir, "docs.json")
+        if self.docs_dirty or self.state.get("base") != base or not output.exists(docs_path):
+            self.state["base"] = base
+            self._write_docs(output, docs_path, absolute_url)
+            written += 1
+
+        save_json(self.state_path, self.state)
+        self.dirty_shards = set()
+        self.docs_dirty = False
+        return written
+
+
+def build_search_index(context, dest_root):
+    """
+    Update the sharded search index from the pages of this build. Pages
+    must have been rendered with term collection enabled.
+    """
+    index = SearchIndex(context.output_cache_dir)
+    urls = set()
+    updated = 0
+    for page in context.pages:
+        if page.document is None or page.document.terms is None:
+            # Pages skipped by a resumed build keep their postings
+            if page.document is None and page.url in index.state["docs"]:
+                urls.add(page.url)
+            continue
+        urls.add(page.url)
+        updated += index.update_page(page.url, page.title, page.content_hash, page.document.terms)
+    index.remove_missing(urls)
+    written = index.save(dest_root, context.absolute_url, context.output)
+    print(f"Search index: {updated} pages reindexed, {written} files written")
+    return written
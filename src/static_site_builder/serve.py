@@ -0,0 +1,363 @@
+import argparse
+import gzip
+import mimetypes
+import os
+import posixpath
+import re
+import sys
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+from .cache import cache_path, load_json, save_json
+from .manifest import hash_file
+from .release import build_release_manifest
+
+SERVE_MANIFEST = cache_path("serve.json")
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# Files larger than this share of the cache are streamed from disk instead
+MAX_CACHED_SHARE = 8
+CHUNK_SIZE = 1 << 16
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+# Compressing tiny responses costs more than it saves
+MIN_COMPRESS_SIZE = 256
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def make_etag(content_hash, encoding=None):
+    """
+    Strong ETag of a file's representation: its content hash plus the
+    content coding. Every gzip body of a file, from a .gz sibling or
+    compressed on the fly, gets the same tag.
+    """
+    if encoding:
+        return f'"{content_hash[:32]}-{encoding}"'
+    return f'"{content_hash[:32]}"'
+
+
+class FileIndex:
+    """
+    Content hashes of the files under root, in the release manifest format.
+    The manifest of the last run (manifest_path) is reused at startup, so
+    only files changed since then are hashed, and a file rebuilt while the
+    server runs is re-hashed on its next request.
+    """
+    def __init__(self, root, manifest_path=None):
+        self.root = root
+        self.manifest_path = manifest_path
+        self.entries = build_release_manifest(root, load_json(manifest_path, {}))
+        self.lock = threading.Lock()
+        self.save()
+
+    def content_hash(self, rel_path, stat):
+        with self.lock:
+            entry = self.entries.get(rel_path)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return entry["hash"]
+        content_hash = hash_file(os.path.join(self.root, *rel_path.split("/")))
+        content_type = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        with self.lock:
+            self.entries[rel_path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": content_hash, "content_type": content_type}
+        return content_hash
+
+    def save(self):
+        if self.manifest_path:
+            with self.lock:
+                save_json(self.manifest_path, self.entries)
+
+
+class ResponseCache:
+    """
+    In-memory LRU of response bodies keyed by (path, encoding, etag), held
+    under a total byte limit. A changed file gets a new ETag, so stale
+    bodies are never served and simply age out.
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes // MAX_CACHED_SHARE:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._items[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def parse_range(header, length):
+    """
+    (start, end) of a single "bytes=" range, end inclusive, clamped to a
+    body of length bytes. None if the header is not one range this server
+    understands, in which case the whole body is sent; ValueError if the
+    range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # A suffix range: the last N bytes
+        count = int(last)
+        if count == 0:
+            raise ValueError(header)
+        return max(length - count, 0), length - 1
+    start = int(first)
+    end = min(int(last), length - 1) if last else length - 1
+    if start >= length or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def etag_matches(header, etag):
+    """
+    Whether an If-None-Match header matches etag, using the weak
+    comparison RFC 9110 asks for.
+    """
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def accepts_gzip(header):
+    for coding in (header or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    """
+    Serves the built site: strong ETags with 304s for If-None-Match, a
+    precompressed .gz sibling or an on-the-fly gzip body for clients that
+    accept it, single byte ranges and an LRU of hot bodies.
+    """
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes, which Nagle's algorithm
+    # would delay by a round trip on keep-alive connections
+    disable_nagle_algorithm = True
+    server_version = "static-site-builder"
+    root = "docs"
+    basepath = "/"
+    files = None
+    cache = None
+    quiet = False
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def resolve(self):
+        """
+        (relative path, file path, redirect) for the request. Directories
+        requested without a trailing slash get a redirect location instead
+        of a file; paths are None when nothing is found.
+        """
+        path = unquote(urlsplit(self.path).path)
+        if not path.startswith(self.basepath):
+            if path + "/" == self.basepath:
+                return None, None, self.basepath
+            return None, None, None
+        rel_path = posixpath.normpath("/" + path[len(self.basepath):]).lstrip("/")
+        if rel_path == ".":
+            rel_path = ""
+        file_path = os.path.join(self.root, *rel_path.split("/")) if rel_path else self.root
+        if os.path.isdir(file_path):
+            if not path.endswith("/"):
+                return None, None, quote(path + "/")
+            rel_path = posixpath.join(rel_path, "index.html")
+            file_path = os.path.join(file_path, "index.html")
+        if not os.path.isfile(file_path):
+            return None, None, None
+        return rel_path, file_path, None
+
+    def respond(self, send_body):
+        rel_path, file_path, redirect = self.resolve()
+        if redirect is not None:
+            query = urlsplit(self.path).query
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header("Location", redirect + ("?" + query if query else ""))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if rel_path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        stat = os.stat(file_path)
+        content_hash = self.files.content_hash(rel_path, stat)
+        etag = make_etag(content_hash)
+        content_type = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") not in (None, etag):
+            range_header = None
+
+        # Ranges always apply to the identity encoding
+        encoding = None
+        worth_compressing = stat.st_size >= MIN_COMPRESS_SIZE or os.path.isfile(file_path + ".gz")
+        if compressible and worth_compressing and not range_header and accepts_gzip(self.headers.get("Accept-Encoding")):
+            encoding = "gzip"
+            etag = make_etag(content_hash, encoding)
+
+        headers = {"Content-Type": content_type, "ETag": etag, "Cache-Control": "no-cache"}
+        if compressible:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        else:
+            headers["Accept-Ranges"] = "bytes"
+        headers["Last-Modified"] = formatdate(stat.st_mtime, usegmt=True)
+
+        if etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name in ("ETag", "Cache-Control", "Vary"):
+                if name in headers:
+                    self.send_header(name, headers[name])
+            self.end_headers()
+            return
+
+        body = self.body(rel_path, file_path, stat, etag, encoding)
+        length = len(body) if body is not None else stat.st_size
+        status = HTTPStatus.OK
+        start, end = 0, length - 1
+        if range_header:
+            try:
+                requested = parse_range(range_header, length)
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{length}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if requested is not None:
+                start, end = requested
+                status = HTTPStatus.PARTIAL_CONTENT
+                headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(end - start + 1 if length else 0))
+        self.end_headers()
+        if not send_body or not length:
+            return
+        if body is not None:
+            self.wfile.write(body[start:end + 1])
+            return
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def body(self, rel_path, file_path, stat, etag, encoding):
+        """
+        The response body from the cache or disk, or None for identity
+        bodies too large to cache, which are streamed from the file.
+        """
+        key = (rel_path, encoding, etag)
+        body = self.cache.get(key)
+        if body is not None:
+            return body
+        if encoding == "gzip":
+            sibling = file_path + ".gz"
+            sibling_stat = os.stat(sibling) if os.path.isfile(sibling) else None
+            if sibling_stat is not None and sibling_stat.st_mtime_ns >= stat.st_mtime_ns:
+                with open(sibling, "rb") as f:
+                    body = f.read()
+            else:
+                with open(file_path, "rb") as f:
+                    body = gzip.compress(f.read(), compresslevel=6, mtime=0)
+        elif stat.st_size <= self.cache.max_bytes // MAX_CACHED_SHARE:
+            with open(file_path, "rb") as f:
+                body = f.read()
+        else:
+            return None
+        self.cache.put(key, body)
+        return body
+
+
+class PreviewServer(ThreadingHTTPServer):
+    # The default backlog of 5 refuses connections under load tests
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_server(root, host="127.0.0.1", port=8888, basepath="/", cache_bytes=DEFAULT_CACHE_BYTES, manifest_path=SERVE_MANIFEST, quiet=False):
+    """
+    A threaded server for root: one thread per connection, all sharing the
+    file index and the response cache.
+    """
+    handler = type("Handler", (PreviewHandler,), {
+        "root": root,
+        "basepath": basepath if basepath.endswith("/") else basepath + "/",
+        "files": FileIndex(root, manifest_path),
+        "cache": ResponseCache(cache_bytes),
+        "quiet": quiet,
+    })
+    return PreviewServer((host, port), handler)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Serve the built site for local preview.")
+    parser.add_argument("root", nargs="?", default="docs", help="built site to serve")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8888, help="port to listen on")
+    parser.add_argument("--basepath", default="/", help="URL prefix the site was built for")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_BYTES / (1024 * 1024), help="memory for hot response bodies, in megabytes")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    server = make_server(args.root, args.host, args.port, args.basepath, int(args.cache_mb * 1024 * 1024), quiet=args.quiet)
+    print(f"Serving {args.root} at http://{args.host}:{server.server_address[1]}{server.RequestHandlerClass.basepath}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.files.save()
+
+
+if __name__ == "__main__":
+    main()
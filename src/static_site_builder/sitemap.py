@@ -0,0 +1,145 @@
+import hashlib
+import os
+from xml.sax.saxutils import escape
+from .cache import cache_path, load_json, save_json
+
+SITEMAP_URL_LIMIT = 50000
+FEED_ENTRY_LIMIT = 20
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+
+def to_rfc3339(value):
+    """
+    Normalize a front-matter date or manifest lastmod to an RFC 3339 timestamp.
+    """
+    value = str(value)
+    if len(value) == 10:
+        return value + "T00:00:00Z"
+    return value
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _signature(lines):
+    digest = hashlib.sha256()
+    for line in lines:
+        digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _write_if_changed(output, path, make_lines, previous, signatures):
+    """
+    Stream the file produced by make_lines into output unless its signature
+    matches the previous build and the file is still there. Returns True if
+    written.
+    """
+    name = os.path.basename(path)
+    signature = _signature(make_lines())
+    signatures[name] = signature
+    if previous.get(name) == signature and output.exists(path):
+        return False
+    print(f"Writing {path}")
+    output.write_lines(path, make_lines())
+    return True
+
+
+def _urlset_lines(context, pages):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    for page in pages:
+        yield f"<url><loc>{escape(context.absolute_url(page.url))}</loc><lastmod>{page.lastmod}</lastmod></url>\n"
+    yield "</urlset>\n"
+
+
+def _sitemap_index_lines(context, shards):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{SITEMAP_NS}">\n'
+    for name, lastmod in shards:
+        yield f"<sitemap><loc>{escape(context.absolute_url('/' + name))}</loc><lastmod>{lastmod}</lastmod></sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def write_sitemaps(context, dest_root, shard_size=SITEMAP_URL_LIMIT):
+    """
+    Write sitemap.xml for every page in the build. Sites with more than
+    shard_size URLs get sitemap-N.xml shards listed in a sitemap.xml index.
+    Shards whose entries did not change since the last build are not
+    rewritten. Returns the number of files written.
+    """
+    cache_file = cache_path("sitemap.json", context.output_cache_dir)
+    previous = load_json(cache_file, {})
+    signatures = {}
+    written = 0
+
+    pages = sorted(context.pages, key=lambda page: page.url)
+    shards = list(_chunks(pages, shard_size))
+    if len(shards) <= 1:
+        path = os.path.join(dest_root, "sitemap.xml")
+        written += _write_if_changed(context.output, path, lambda: _urlset_lines(context, pages), previous, signatures)
+    else:
+        index_entries = []
+        for number, shard in enumerate(shards, start=1):
+            name = f"sitemap-{number}.xml"
+            path = os.path.join(dest_root, name)
+            written += _write_if_changed(context.output, path, lambda: _urlset_lines(context, shard), previous, signatures)
+            index_entries.append((name, max(page.lastmod for page in shard)))
+        path = os.path.join(dest_root, "sitemap.xml")
+        written += _write_if_changed(context.output, path, lambda: _sitemap_index_lines(context, index_entries), previous, signatures)
+
+    # Drop shards left over from a larger site
+    for name in previous:
+        stale_path = os.path.join(dest_root, name)
+        if name not in signatures and context.output.exists(stale_path):
+            print(f"Removing stale sitemap: {stale_path}")
+            context.output.remove(stale_path)
+
+    save_json(cache_file, signatures)
+    return written
+
+
+def _feed_lines(context, title, entries):
+    updated = max((to_rfc3339(page.date or page.lastmod) for page in entries), default="1970-01-01T00:00:00Z")
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<feed xmlns="{ATOM_NS}">\n'
+    yield f"<title>{escape(title)}</title>\n"
+    yield f"<id>{escape(context.absolute_url('/'))}</id>\n"
+    yield f'<link href="{escape(context.absolute_url("/"))}"/>\n'
+    yield f'<link rel="self" href="{escape(context.absolute_url("/feed.xml"))}"/>\n'
+    yield f"<updated>{updated}</updated>\n"
+    # RFC 4287 requires an author for the feed when its entries have none
+    yield f"<author><name>{escape(context.site.get('author') or title)}</name></author>\n"
+    for page in entries:
+        url = escape(context.absolute_url(page.url))
+        yield (
+            f"<entry><title>{escape(page.title)}</title>"
+            f'<link href="{url}"/><id>{url}</id>'
+            f"<updated>{to_rfc3339(page.date or page.lastmod)}</updated></entry>\n"
+        )
+    yield "</feed>\n"
+
+
+def write_atom_feed(context, dest_root, title, limit=FEED_ENTRY_LIMIT):
+    """
+    Write feed.xml with the most recent pages, ordered by their front-matter
+    date or, failing that, the manifest lastmod. The feed's author is the
+    site's "author" setting, or title when there is none. Returns True if
+    written.
+    """
+    cache_file = cache_path("feed.json", context.output_cache_dir)
+    previous = load_json(cache_file, {})
+    signatures = {}
+
+    entries = sorted(
+        context.pages,
+        key=lambda page: (to_rfc3339(page.date or page.lastmod), page.url),
+        reverse=True,
+    )[:limit]
+    path = os.path.join(dest_root, "feed.xml")
+    written = _write_if_changed(context.output, path, lambda: _feed_lines(context, title, entries), previous, signatures)
+    save_json(cache_file, signatures)
+    return written
@@ -0,0 +1,364 @@
+import hashlib
+import marshal
+import os
+import re
+import sys
+from .htmlnode import escape_attr, escape_text
+
+# Bump when the generated code changes so stale compiled templates are ignored
+COMPILER_VERSION = 2
+
+TAG_PATTERN = re.compile(r"({{.*?}}|{%.*?%}|{#.*?#})", re.DOTALL)
+NAME_PATTERN = re.compile(r"[A-Za-z_]\w*(?:\.\w+)*")
+STATEMENT_PATTERNS = {
+    "include": re.compile(r'include\s+"([^"]+)"'),
+    "extends": re.compile(r'extends\s+"([^"]+)"'),
+    "block": re.compile(r"block\s+(\w+)"),
+    "for": re.compile(r"for\s+(\w+)\s+in\s+(\S+)"),
+    "if": re.compile(r"if\s+(not\s+)?(\S+)"),
+}
+FILTERS = ("safe",)
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class Markup(str):
+    """
+    A string that is already HTML and must not be escaped again.
+    """
+
+
+def _lookup(variables, names):
+    value = variables
+    for name in names:
+        if isinstance(value, dict):
+            value = value.get(name)
+        else:
+            value = getattr(value, name, None)
+        if value is None:
+            return None
+    return value
+
+
+def _emit(value):
+    if value is None:
+        return ""
+    if isinstance(value, Markup):
+        return value
+    return escape_text(value)
+
+
+def _emit_attr(value):
+    if value is None:
+        return ""
+    if isinstance(value, Markup):
+        return value
+    return escape_attr(value)
+
+
+def _iterate(value):
+    if value is None:
+        return ()
+    return value
+
+
+RUNTIME = {"_lookup": _lookup, "_emit": _emit, "_emit_attr": _emit_attr, "_iterate": _iterate, "Markup": Markup}
+
+
+class _CodeWriter:
+    def __init__(self, in_tag=False):
+        self.lines = []
+        self.indent = 0
+        self.loops = 0
+        # Whether the text written so far leaves us inside an HTML tag
+        self.in_tag = in_tag
+
+    def line(self, code):
+        self.lines.append("    " * self.indent + code)
+
+
+def _expression(source, name, line):
+    """
+    Python code for a {{ }} expression: a dotted name and optional filters.
+    """
+    parts = [part.strip() for part in source.split("|")]
+    if not NAME_PATTERN.fullmatch(parts[0]):
+        raise TemplateError(f"{name}:{line}: invalid expression {source!r}")
+    for filter_name in parts[1:]:
+        if filter_name not in FILTERS:
+            raise TemplateError(f"{name}:{line}: unknown filter {filter_name!r}")
+    code = f"_lookup(ctx, {tuple(parts[0].split('.'))!r})"
+    if "safe" in parts[1:]:
+        code = f"Markup({code} or '')"
+    return code
+
+
+def compile_template_source(source, name="<template>"):
+    """
+    Translate a template into Python source defining _root, one function
+    per block and the EXTENDS/INCLUDES/BLOCKS module constants.
+
+    Syntax: {{ page.title }} (escaped unless the value is Markup or the
+    "safe" filter is used; inside a tag, such as in an attribute value,
+    quotes are escaped as well), {% include "partial.html" %},
+    {% extends "base.html" %}, {% block name %}...{% endblock %},
+    {% for item in page.tags %}...{% endfor %},
+    {% if [not] name %}...{% else %}...{% endif %} and {# comments #}.
+    """
+    functions = {"_root": _CodeWriter()}
+    # Stack of (statement, writer, saved ctx variable) for the open blocks, loops and ifs
+    stack = [("root", functions["_root"], None)]
+    extends = None
+    includes = []
+    line = 1
+
+    for token in TAG_PATTERN.split(source):
+        writer = stack[-1][1]
+        token_line = line
+        line += token.count("\n")
+        if not token:
+            continue
+        if token.startswith("{#"):
+            continue
+        if token.startswith("{{"):
+            emit = "_emit_attr" if writer.in_tag else "_emit"
+            writer.line(f"write({emit}({_expression(token[2:-2].strip(), name, token_line)}))")
+            continue
+        if not token.startswith("{%"):
+            writer.line(f"write({token!r})")
+            # Text that opens a tag without closing it puts expressions after it in attribute context
+            tag_start = token.rfind("<")
+            tag_end = token.rfind(">")
+            if tag_start != tag_end:
+                writer.in_tag = tag_start > tag_end
+            continue
+
+        statement = token[2:-2].strip()
+        keyword = statement.split(None, 1)[0] if statement else ""
+        pattern = STATEMENT_PATTERNS.get(keyword)
+        match = pattern.fullmatch(statement) if pattern else None
+        if pattern and not match:
+            raise TemplateError(f"{name}:{token_line}: invalid {keyword} tag {token!r}")
+
+        if keyword == "extends":
+            if extends is not None or len(stack) > 1:
+                raise TemplateError(f"{name}:{token_line}: extends must be a top-level tag and appear once")
+            extends = match.group(1)
+        elif keyword == "include":
+            includes.append(match.group(1))
+            writer.line(f"env.include({match.group(1)!r}, ctx, out)")
+        elif keyword == "block":
+            block_name = match.group(1)
+            function_name = "_block_" + block_name
+            if function_name in functions:
+                raise TemplateError(f"{name}:{token_line}: block {block_name!r} defined twice")
+            writer.line(f"blocks[{block_name!r}](ctx, out, env, blocks)")
+            functions[function_name] = _CodeWriter(writer.in_tag)
+            stack.append(("block", functions[function_name], None))
+        elif keyword == "for":
+            # Loop variables shadow the outer ctx only inside the loop
+            writer.loops += 1
+            outer = f"_outer{writer.loops}"
+            item = f"_item{writer.loops}"
+            names = tuple(match.group(2).split("."))
+            writer.line(f"{outer} = ctx")
+            writer.line(f"for {item} in _iterate(_lookup({outer}, {names!r})):")
+            writer.indent += 1
+            writer.line(f"ctx = {{**{outer}, {match.group(1)!r}: {item}}}")
+            stack.append(("for", writer, outer))
+        elif keyword == "if":
+            names = tuple(match.group(2).split("."))
+            negate = "not " if match.group(1) else ""
+            writer.line(f"if {negate}_lookup(ctx, {names!r}):")
+            writer.indent += 1
+            writer.line("pass")
+            stack.append(("if", writer, None))
+        elif keyword == "else":
+            if stack[-1][0] != "if":
+                raise TemplateError(f"{name}:{token_line}: else outside of an if")
+            writer.indent -= 1
+            writer.line("else:")
+            writer.indent += 1
+            writer.line("pass")
+        elif keyword in ("endblock", "endfor", "endif"):
+            expected = keyword[3:]
+            if stack[-1][0] != expected:
+                raise TemplateError(f"{name}:{token_line}: unexpected {keyword}")
+            _, _, outer = stack.pop()
+            if expected in ("for", "if"):
+                writer.indent -= 1
+            if expected == "for":
+                writer.line(f"ctx = {outer}")
+        else:
+            raise TemplateError(f"{name}:{token_line}: unknown tag {token!r}")
+
+    if len(stack) > 1:
+        raise TemplateError(f"{name}: unclosed {stack[-1][0]} tag")
+
+    code = []
+    for function_name, writer in functions.items():
+        code.append(f"def {function_name}(ctx, out, env, blocks):")
+        code.append("    write = out.append")
+        code.extend("    " + line for line in writer.lines)
+    block_names = [function_name[len("_block_"):] for function_name in functions if function_name != "_root"]
+    code.append(f"EXTENDS = {extends!r}")
+    code.append(f"INCLUDES = {tuple(includes)!r}")
+    code.append("BLOCKS = {" + ", ".join(f"{block!r}: _block_{block}" for block in block_names) + "}")
+    return "\n".join(code) + "\n"
+
+
+def compile_template(source, name="<template>"):
+    return compile(compile_template_source(source, name), name, "exec")
+
+
+class Template:
+    """
+    A compiled template: its root function, its blocks and the names of the
+    templates it extends and includes.
+    """
+    def __init__(self, name, code, source_hash):
+        namespace = dict(RUNTIME)
+        exec(code, namespace)
+        self.name = name
+        self.source_hash = source_hash
+        self.root = namespace["_root"]
+        self.blocks = namespace["BLOCKS"]
+        self.extends = namespace["EXTENDS"]
+        self.includes = namespace["INCLUDES"]
+
+
+class TemplateEnvironment:
+    """
+    Loads templates from root, by path, and renders them. Compiled code
+    objects are kept on disk in cache_dir/templates keyed by the hash of
+    the template source, so unchanged templates are never recompiled.
+    site holds build-wide settings every page sees under site.
+    """
+    def __init__(self, root=".", cache_dir=None):
+        self.root = root
+        self.cache_dir = os.path.join(cache_dir, "templates") if cache_dir else None
+        self.site = {}
+        self._templates = {}
+
+    def path(self, name):
+        """
+        Path of a template referenced by name from an include or extends tag.
+        """
+        return os.path.join(self.root, *name.split("/"))
+
+    def get(self, path):
+        template = self._templates.get(path)
+        if template is not None:
+            return template
+        with open(path, "rb") as f:
+            data = f.read()
+        source_hash = hashlib.sha256(data).hexdigest()
+        template = Template(path, self._compiled(data.decode("utf-8"), path, source_hash), source_hash)
+        self._templates[path] = template
+        return template
+
+    def _compiled(self, source, path, source_hash):
+        if self.cache_dir is None:
+            return compile_template(source, path)
+        key = f"{source_hash}-{sys.implementation.cache_tag}-{COMPILER_VERSION}"
+        cache_file = os.path.join(self.cache_dir, key + ".marshal")
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, "rb") as f:
+                    return marshal.load(f)
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+        code = compile_template(source, path)
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        tmp_path = cache_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(code, f)
+        os.replace(tmp_path, cache_file)
+        return code
+
+    def dependencies(self, path):
+        """
+        The template and every template it extends or includes, directly or
+        not, as a sorted list of paths.
+        """
+        seen = set()
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            template = self.get(current)
+            names = list(template.includes)
+            if template.extends:
+                names.append(template.extends)
+            pending.extend(self.path(name) for name in names)
+        return sorted(seen)
+
+    def signature(self, path):
+        """
+        Hash of the sources of a template and all of its dependencies.
+        """
+        digest = hashlib.sha256()
+        for dependency in self.dependencies(path):
+            digest.update(self.get(dependency).source_hash.encode("ascii"))
+        return digest.hexdigest()
+
+    def select(self, default_path, front_matter=None, section=None):
+        """
+        The template for a page: the "template" set in its front matter,
+        else templates/<section>.html if the page's top-level content
+        section has one, else default_path.
+        """
+        if front_matter and front_matter.get("template"):
+            return self.path(front_matter["template"])
+        if section:
+            section_path = self.path(f"templates/{section}.html")
+            if os.path.exists(section_path):
+                return section_path
+        return default_path
+
+    def render(self, path, variables):
+        template = self.get(path)
+        blocks = dict(template.blocks)
+        depth = 0
+        while template.extends:
+            depth += 1
+            if depth > 20:
+                raise TemplateError(f"{path}: extends chain is too deep")
+            template = self.get(self.path(template.extends))
+            for name, block in template.blocks.items():
+                # The most derived template's block wins
+                blocks.setdefault(name, block)
+        out = []
+        template.root(variables, out, self, blocks)
+        return "".join(out)
+
+    def include(self, name, variables, out):
+        out.append(self.render(self.path(name), variables))
+
+
+def page_variables(title, html_content, basepath="/", front_matter=None, headings=(), related=(), site=None):
+    """
+    The variables a page template sees: Title and Content as before, the
+    page's front matter (plus its title) as page, its heading outline as
+    headings, its related posts (each with a title and url) as related and
+    the basepath and other site settings as site.
+    """
+    return {
+        "Title": title,
+        "Content": Markup(html_content),
+        "page": {**(front_matter or {}), "title": title},
+        "headings": [{"level": level, "text": text, "slug": slug} for level, text, slug in headings],
+        "related": list(related),
+        "site": {**(site or {}), "basepath": basepath},
+    }
+
+
+def rewrite_basepath(html, basepath="/"):
+    html = html.replace('href="/', f'href="{basepath}')
+    return html.replace('src="/', f'src="{basepath}')
+
@@ -0,0 +1,65 @@
+import os
+import tarfile
+import unittest
+import zipfile
+from .archive import ArchiveSink
+from .build import BuildContext
+from .main import copy_files_recursive, generate_pages_recursive
+from .test_support import TempDirTestCase
+
+
+class TestArchiveSink(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("static/index.css", "body {}")
+        self.write("static/images/logo.txt", "logo")
+        self.write("content/index.md", "# Home\n\nWelcome")
+        self.write("content/blog/post.md", "# Post\n\nText")
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+
+    def build(self, archive_name):
+        docs = self.path("docs")
+        context = BuildContext(self.path("content"), docs, cache_dir=self.path("cache"))
+        context.output = ArchiveSink(self.path(archive_name), docs)
+        copy_files_recursive(self.path("static"), docs, output=context.output)
+        generate_pages_recursive(self.path("content"), self.path("template.html"), docs, "/", context)
+        context.output.close()
+        with open(self.path(archive_name), "rb") as f:
+            return f.read()
+
+    def test_tar_is_reproducible(self):
+        first = self.build("site.tar.gz")
+        os.utime(self.path("static/index.css"), (0, 0))
+        self.assertEqual(self.build("site.tar.gz"), first)
+        self.assertFalse(os.path.exists(self.path("docs")))
+
+        with tarfile.open(self.path("site.tar.gz"), "r:gz") as archive:
+            self.assertEqual(archive.getnames(), ["images/logo.txt", "index.css", "blog/post.html", "index.html"])
+            self.assertEqual(archive.extractfile("index.css").read(), b"body {}")
+            self.assertEqual({member.mtime for member in archive.getmembers()}, {archive.getmember("index.css").mtime})
+
+    def test_archive_build_keeps_docs_signatures(self):
+        self.run_main(["--site-url", "https://example.com"])
+        self.write("content/blog/post.md", "# Renamed post\n\nText")
+        self.run_main(
+            ["--site-url", "https://example.com", "--archive", "site.zip"],
+            ["--site-url", "https://example.com", "--resume"],
+        )
+        # The archive build's signatures are its own, so docs/ is brought up to date
+        self.assertIn("<title>Renamed post</title>", self.read("docs/feed.xml"))
+        with zipfile.ZipFile(self.path("site.zip")) as archive:
+            self.assertIn("Renamed post", archive.read("feed.xml").decode("utf-8"))
+
+    def test_zip(self):
+        first = self.build("site.zip")
+        self.assertEqual(self.build("site.zip"), first)
+        with zipfile.ZipFile(self.path("site.zip")) as archive:
+            self.assertIn("<title>Post</title>", archive.read("blog/post.html").decode("utf-8"))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ArchiveSink(self.path("site.rar"), self.path("docs"))
+
+
+if __name__ == "__main__":
+    unittest.main()
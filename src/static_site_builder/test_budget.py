@@ -0,0 +1,69 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from .budget import check_budgets, load_budgets, measure_pages, print_weight_report
+from .build import BuildContext
+from .main import generate_pages_recursive
+from .test_support import TempDirTestCase
+
+
+class TestBudgets(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("template.html", '<link rel="stylesheet" href="/index.css">{{ Content }}')
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/post.md", "# Post\n\n![a](/images/a.png)\n\n![again](/images/a.png)\n\n![gone](/images/b.png)")
+        self.write("docs/index.css", "body { margin: 0; }" * 50)
+        self.write("docs/images/a.png", "x" * 5000)
+        self.context = BuildContext(self.path("content"), self.path("docs"), cache_dir=self.path("cache"))
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), "/", self.context)
+
+    def test_measure(self):
+        weights = {weight.url: weight for weight in measure_pages(self.context, self.path("docs"))}
+        post = weights["/blog/post.html"]
+        self.assertEqual(post.section, "blog")
+        self.assertEqual(post.image_bytes, 5000)
+        # The page, index.css, a.png once and the missing b.png
+        self.assertEqual(post.requests, 4)
+        self.assertLess(post.resource_bytes, len("body { margin: 0; }" * 50))
+        self.assertEqual(post.total_bytes, post.html_gzip_bytes + 5000 + post.resource_bytes)
+        self.assertEqual(weights["/"].section, "default")
+        self.assertEqual(weights["/"].requests, 2)
+
+    def test_resumed_pages_keep_image_bytes(self):
+        measure_pages(self.context, self.path("docs"))
+        # The weights of a build without --check-links still record the targets
+        self.assertIn(self.path("content/blog/post.md"), json.loads(self.read("cache/links.json")))
+        # A resumed build that rendered nothing
+        context = BuildContext(self.path("content"), self.path("docs"), cache_dir=self.path("cache"))
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), "/", context)
+        for page in context.pages:
+            page.document = None
+        weights = {weight.url: weight for weight in measure_pages(context, self.path("docs"))}
+        self.assertEqual(weights["/blog/post.html"].image_bytes, 5000)
+        self.assertEqual(weights["/blog/post.html"].requests, 4)
+
+    def test_section_budgets(self):
+        budgets_path = self.write("budgets.json", json.dumps({"default": {"requests": 3}, "blog": {"image_bytes": 4000}}))
+        violations = check_budgets(measure_pages(self.context, self.path("docs")), load_budgets(budgets_path))
+        self.assertEqual(sorted((violation.page.url, violation.key) for violation in violations), [
+            ("/blog/post.html", "image_bytes"),
+            ("/blog/post.html", "requests"),
+        ])
+
+    def test_unknown_budget(self):
+        with self.assertRaises(ValueError):
+            load_budgets(self.write("budgets.json", '{"blog": {"bytes": 1}}'))
+
+    def test_report_is_sorted(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            print_weight_report(measure_pages(self.context, self.path("docs")), "images")
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].endswith("/blog/post.html"))
+        self.assertTrue(lines[2].endswith("/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from .build import BuildContext
+from .critical import CriticalCss, parse_css, used_names
+from .datauri import ImageInliner
+from .htmlnode import LeafNode, ParentNode
+from .main import generate_pages_recursive
+from .template import TemplateEnvironment
+from .test_support import TempDirTestCase
+
+LARGE_CSS = """
+body { margin: 0; }
+/* comment { } */
+pre code, .tok-keyword { color: red; }
+table td { padding: 2px; }
+.footer:hover { color: blue; }
+@media (max-width: 600px) { p { margin: 0; } table { width: 100%; } }
+@font-face { font-family: "x"; src: url(x.woff2); }
+"""
+
+
+class TestCriticalCss(TempDirTestCase):
+    def test_parse_css_selectors(self):
+        rules = parse_css(LARGE_CSS)
+        self.assertEqual(rules[1].selectors, [frozenset({"pre", "code"}), frozenset({".tok-keyword"})])
+        self.assertEqual(rules[3].selectors, [frozenset({".footer"})])
+        self.assertEqual([child.text for child in rules[4].children], ["p{margin: 0;}", "table{width: 100%;}"])
+        self.assertIsNone(rules[5].selectors)
+
+    def test_used_names(self):
+        node = ParentNode("div", [LeafNode("p", "x", props={"class": "lead wide"}), LeafNode(None, "y")])
+        self.assertEqual(used_names(node, frozenset({"body"})), {"body", "div", "p", ".lead", ".wide"})
+
+    def test_small_stylesheet_is_inlined_whole(self):
+        critical = CriticalCss(self.write("index.css", "body { margin: 0; }"), threshold=100)
+        html = critical.apply('<head><link href="/index.css" rel="stylesheet"></head>', ParentNode("div", []))
+        self.assertEqual(html, "<head><style>body { margin: 0; }</style></head>")
+
+    def test_large_stylesheet_is_subset(self):
+        critical = CriticalCss(self.write("index.css", LARGE_CSS), threshold=10)
+        template = self.write("template.html", '<head><link rel="stylesheet" href="/index.css"></head><body>{{ Content }}</body>')
+        node = ParentNode("div", [ParentNode("pre", [LeafNode("code", "x")]), LeafNode("p", "y")])
+        html = critical.apply('<head><link rel="stylesheet" href="/index.css"></head>', node, template_path=template)
+        style = html[len("<head><style>"):html.index("</style>")]
+        self.assertEqual(
+            style,
+            "body{margin: 0;}pre code, .tok-keyword{color: red;}"
+            '@media (max-width: 600px){p{margin: 0;}}@font-face{font-family: "x"; src: url(x.woff2);}',
+        )
+        self.assertIn('<link rel="preload" href="/index.css" as="style"', html)
+        self.assertIn('<noscript><link rel="stylesheet" href="/index.css"></noscript>', html)
+
+    def test_included_templates_count_as_used(self):
+        critical = CriticalCss(self.write("index.css", LARGE_CSS), threshold=10)
+        self.write("templates/partials/footer.html", '<div class="footer">{{ Title }}</div>')
+        template = self.write("templates/page.html", '<head><link rel="stylesheet" href="/index.css"></head><body>{% include "partials/footer.html" %}</body>')
+        templates = TemplateEnvironment(self.path("templates"))
+        self.assertIn(".footer", critical.template_names(template, templates))
+        self.assertNotIn(".footer", critical.template_names(template))
+        html = critical.apply('<head><link rel="stylesheet" href="/index.css"></head>', ParentNode("div", []), template_path=template, templates=templates)
+        self.assertIn(".footer:hover{color: blue;}", html)
+
+    def test_subsets_are_cached_per_name_set(self):
+        critical = CriticalCss(self.write("index.css", LARGE_CSS), threshold=10)
+        first = critical.critical_css({"body", "p"})
+        self.assertIs(critical.critical_css({"p", "body"}), first)
+        self.assertEqual(len(critical._subsets), 1)
+
+    def test_other_stylesheets_are_left_alone(self):
+        critical = CriticalCss(self.write("index.css", LARGE_CSS), threshold=10)
+        html = '<head><link rel="stylesheet" href="/print.css"></head>'
+        self.assertEqual(critical.apply(html, ParentNode("div", [])), html)
+
+    def test_first_image_is_preloaded(self):
+        critical = CriticalCss(self.write("index.css", "body { margin: 0; }"))
+        html = critical.apply("<head></head>", ParentNode("div", []), [("a", "/a.png"), ("b", "/b.png")])
+        self.assertEqual(html, '<head><link rel="preload" as="image" href="/a.png"></head>')
+
+    def test_inlined_images_are_not_preloaded(self):
+        self.write("static/images/icon.png", "icon")
+        critical = CriticalCss(self.write("index.css", "body { margin: 0; }"))
+        with ImageInliner(self.path("static")):
+            html = critical.apply("<head></head>", ParentNode("div", []), [("i", "/images/icon.png"), ("b", "/b.png")])
+        self.assertEqual(html, '<head><link rel="preload" as="image" href="/b.png"></head>')
+
+    def test_build_inlines_into_pages(self):
+        template = self.write("template.html", '<html><head><link rel="stylesheet" href="/index.css"></head><body class="site">{{ Content }}</body></html>')
+        self.write("content/index.md", "# Home\n\n![cover](/cover.png)")
+        css = self.write("index.css", LARGE_CSS + ".site { color: black; }")
+        context = BuildContext(self.path("content"), self.path("docs"), "/blog/", cache_dir=self.path("cache"))
+        context.critical_css = CriticalCss(css, threshold=10)
+        generate_pages_recursive(self.path("content"), template, self.path("docs"), "/blog/", context)
+        html = self.read("docs/index.html")
+        self.assertIn(".site{color: black;}", html)
+        self.assertNotIn("table td", html)
+        self.assertIn('<link rel="preload" as="image" href="/blog/cover.png">', html)
+        self.assertIn('<noscript><link rel="stylesheet" href="/blog/index.css"></noscript>', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
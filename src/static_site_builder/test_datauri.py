@@ -0,0 +1,100 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from .build import BuildContext
+from .datauri import ImageInliner
+from .journal import BuildJournal
+from .main import generate_pages_recursive
+from .test_support import TempDirTestCase
+from .textnode import ImageNode
+
+ICON = b"\x89PNG\r\n\x1a\nicon"
+
+
+class TestImageInliner(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("static/images/icon.png", ICON)
+        self.write("static/images/copy.png", ICON)
+        self.write("static/images/photo.jpg", b"x" * 5000)
+        self.write("secret.png", ICON)
+        self.inliner = ImageInliner(self.path("static"), threshold=2048)
+
+    def tearDown(self):
+        self.inliner.uninstall()
+
+    def test_small_images_become_data_uris(self):
+        self.assertEqual(self.inliner.data_uri("/images/icon.png"), "data:image/png;base64,iVBORw0KGgppY29u")
+        self.assertIsNone(self.inliner.data_uri("/images/photo.jpg"))
+        self.assertIsNone(self.inliner.data_uri("/images/missing.png"))
+        self.assertIsNone(self.inliner.data_uri("https://example.com/images/icon.png"))
+        self.assertIsNone(self.inliner.data_uri("images/icon.png"))
+        self.assertIsNone(self.inliner.data_uri("/../secret.png"))
+        self.assertIsNone(self.inliner.data_uri("/images/../../secret.png"))
+        self.assertIsNotNone(self.inliner.data_uri("/images/../images/icon.png"))
+
+    def test_identical_files_are_encoded_once(self):
+        self.inliner.data_uri("/images/icon.png")
+        self.inliner.data_uri("/images/copy.png")
+        self.inliner.data_uri("/images/icon.png?v=2")
+        self.assertEqual(len(self.inliner._encoded), 1)
+
+    def test_image_node_uses_installed_inliner(self):
+        node = ImageNode("icon", "/images/icon.png")
+        self.assertEqual(node.to_html(), '<img src="/images/icon.png" alt="icon">')
+        self.inliner.install()
+        self.assertEqual(node.to_html(), '<img src="data:image/png;base64,iVBORw0KGgppY29u" alt="icon">')
+        self.assertEqual(ImageNode("photo", "/images/photo.jpg").to_html(), '<img src="/images/photo.jpg" alt="photo">')
+        self.inliner.uninstall()
+        self.assertEqual(node.to_html(), '<img src="/images/icon.png" alt="icon">')
+
+    def test_installed_only_inside_with_block(self):
+        other = ImageInliner(self.path("static"), threshold=0)
+        with self.inliner:
+            self.assertIs(ImageNode.inliner, self.inliner)
+            with other:
+                self.assertIs(ImageNode.inliner, other)
+            self.assertIs(ImageNode.inliner, self.inliner)
+        self.assertIsNone(ImageNode.inliner)
+
+    def test_build_reports_requests_eliminated(self):
+        self.write("template.html", "{{ Content }}")
+        self.write("content/a.md", "# A\n\n![i](/images/icon.png) ![again](/images/icon.png) ![p](/images/photo.jpg)")
+        self.write("content/b.md", "# B\n\n![i](/images/copy.png)")
+        context = BuildContext(self.path("content"), self.path("docs"), cache_dir=self.path("cache"))
+        context.image_inliner = self.inliner
+        with redirect_stdout(io.StringIO()), self.inliner:
+            generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), "/site/", context)
+        html = self.read("docs/a.html")
+        self.assertEqual(html.count("data:image/png;base64,"), 2)
+        self.assertIn('src="/site/images/photo.jpg"', html)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.inliner.print_report()
+        self.assertEqual(output.getvalue(), "Inlined 1 images (0.0 KB) as data URIs, eliminating 2 requests across 2 rendered pages\n")
+
+    def test_report_on_resume_names_kept_pages(self):
+        self.write("template.html", "{{ Content }}")
+        self.write("content/a.md", "# A\n\n![i](/images/icon.png)")
+        self.write("content/b.md", "# B\n\n![i](/images/copy.png)")
+        for resume in (False, True):
+            if resume:
+                self.write("content/b.md", "# B\n\nNo images now")
+            inliner = ImageInliner(self.path("static"))
+            context = BuildContext(self.path("content"), self.path("docs"), cache_dir=self.path("cache"))
+            context.image_inliner = inliner
+            context.journal = BuildJournal(self.path("cache/journal.jsonl"), context.manifest).open(resume)
+            output = io.StringIO()
+            with redirect_stdout(output), inliner:
+                generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), "/", context)
+                inliner.print_report()
+            context.journal.close()
+        self.assertEqual(
+            output.getvalue().splitlines()[-1],
+            "Inlined 0 images (0.0 KB) as data URIs, eliminating 0 requests across 1 rendered pages (1 unchanged pages kept, not counted)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+from .dedupe import ContentStore, dedupe_tree
+from .manifest import hash_file
+from .output import write_page
+from .test_support import TempDirTestCase
+
+
+class TestDedupe(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = self.path("docs")
+        self.store = ContentStore(self.path("objects"))
+        self.index_path = self.path("dedupe.json")
+
+    def test_duplicates_share_inode(self):
+        a = self.write("docs/a.css", "body { color: red; }")
+        b = self.write("docs/blog/b.css", "body { color: red; }")
+        c = self.write("docs/c.css", "body { color: blue; }")
+
+        report = dedupe_tree(self.root, self.store, self.index_path)
+        self.assertEqual(report.files, 3)
+        self.assertEqual(report.linked, 1)
+        self.assertEqual(report.bytes_saved, len("body { color: red; }"))
+        self.assertTrue(os.path.samefile(a, b))
+        self.assertFalse(os.path.samefile(a, c))
+
+        # A second run finds everything already linked
+        report = dedupe_tree(self.root, self.store, self.index_path)
+        self.assertEqual(report.linked, 0)
+        self.assertEqual(report.bytes_saved, len("body { color: red; }"))
+
+    def test_rewrite_does_not_touch_other_links(self):
+        a = self.write("docs/a.html", "<p>same</p>")
+        b = self.write("docs/b.html", "<p>same</p>")
+        dedupe_tree(self.root, self.store, self.index_path)
+        object_path = self.store.object_path(hash_file(b))
+
+        # Writers replace the file, so the other link and the object keep their content
+        write_page(a, "<p>changed</p>")
+        for path in (b, object_path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "<p>same</p>")
+
+    def test_prune_removes_unused_objects(self):
+        a = self.write("docs/a.html", "<p>old</p>")
+        dedupe_tree(self.root, self.store, self.index_path)
+        old_object = self.store.object_path(hash_file(a))
+        self.assertTrue(os.path.exists(old_object))
+
+        write_page(a, "<p>new</p>")
+        dedupe_tree(self.root, self.store, self.index_path)
+        self.assertFalse(os.path.exists(old_object))
+        self.assertTrue(os.path.samefile(a, self.store.object_path(hash_file(a))))
+
+    def test_reflink_falls_back_to_hardlink(self):
+        a = self.write("docs/a.js", "let x = 1;")
+        b = self.write("docs/b.js", "let x = 1;")
+        report = dedupe_tree(self.root, self.store, mode="reflink")
+        self.assertEqual(report.linked, 1)
+        with open(b, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "let x = 1;")
+
+    def test_reflinked_copies_are_not_cloned_again(self):
+        self.write("docs/a.js", "let x = 1;")
+        b = self.write("docs/b.js", "let x = 1;")
+        # A clone has its own inode, like a copy
+        with mock.patch("static_site_builder.dedupe.clone_file", side_effect=shutil.copyfile) as clone:
+            report = dedupe_tree(self.root, self.store, self.index_path, mode="reflink")
+            self.assertEqual(report.linked, 1)
+            self.assertEqual(clone.call_count, 1)
+            inode = os.stat(b).st_ino
+
+            report = dedupe_tree(self.root, self.store, self.index_path, mode="reflink")
+            self.assertEqual(report.linked, 0)
+            self.assertEqual(clone.call_count, 1)
+            self.assertEqual(os.stat(b).st_ino, inode)
+            self.assertEqual(report.bytes_saved, len("let x = 1;"))
+
+
+if __name__ == "__main__":
+    unittest.main()
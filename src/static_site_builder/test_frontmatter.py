@@ -0,0 +1,95 @@
+import unittest
+from .build import BuildContext
+from .frontmatter import parse_value, split_front_matter, read_front_matter, MetadataIndex, load_section
+from .test_support import TempDirTestCase
+
+
+class TestFrontMatter(TempDirTestCase):
+    def test_parse_value(self):
+        self.assertEqual(parse_value(' "quoted" '), "quoted")
+        self.assertEqual(parse_value("42"), 42)
+        self.assertEqual(parse_value("1.5"), 1.5)
+        self.assertEqual(parse_value("true"), True)
+        self.assertEqual(parse_value("[a, 'b', 3]"), ["a", "b", 3])
+        self.assertEqual(parse_value("2024-01-02"), "2024-01-02")
+        self.assertEqual(parse_value("404", text=True), "404")
+        self.assertEqual(parse_value("'404'", text=True), "404")
+
+    def test_text_keys_stay_strings(self):
+        metadata, _ = split_front_matter("---\ntitle: 404\ndate: 2024\nper_page: 5\n---\n# Body")
+        self.assertEqual(metadata, {"title": "404", "date": "2024", "per_page": 5})
+
+    def test_numeric_title_builds(self):
+        from .main import generate_pages_recursive
+        from .sitemap import write_sitemaps, write_atom_feed
+        template = self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/index.md", "---\ntitle: 2024\nlisting: true\n---\nPosts")
+        self.write("content/blog/missing/index.md", "---\ntitle: 404\ndate: 2024-01-01\n---\nNot found")
+        docs = self.path("docs")
+        context = BuildContext(self.path("content"), docs, "/", "https://example.com", cache_dir=self.path("cache"))
+        generate_pages_recursive(self.path("content"), template, docs, "/", context)
+        write_sitemaps(context, docs)
+        self.assertTrue(write_atom_feed(context, docs, "Home"))
+        self.assertIn("<title>404</title>", self.read("docs/feed.xml"))
+        self.assertIn("https://example.com/blog/missing", self.read("docs/sitemap.xml"))
+        listing = self.read("docs/blog/index.html")
+        self.assertIn("<title>2024</title>", listing)
+        self.assertIn(">404</a>", listing)
+
+    def test_split_yaml_front_matter(self):
+        md = "---\ntitle: Hello\ndate: 2024-01-02\n---\n# Body"
+        metadata, body = split_front_matter(md)
+        self.assertEqual(metadata, {"title": "Hello", "date": "2024-01-02"})
+        self.assertEqual(body, "# Body")
+
+    def test_split_toml_front_matter(self):
+        md = '+++\ntitle = "Hello"\ntags = ["a", "b"]\n+++\n# Body'
+        metadata, body = split_front_matter(md)
+        self.assertEqual(metadata, {"title": "Hello", "tags": ["a", "b"]})
+        self.assertEqual(body, "# Body")
+
+    def test_split_no_front_matter(self):
+        md = "# Just markdown\n\n---\n"
+        self.assertEqual(split_front_matter(md), ({}, md))
+
+    def test_split_unterminated(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ntitle: Hello\n# Body")
+
+    def test_read_front_matter_offset(self):
+        path = self.write("post.md", "---\ntitle: Hello\n---\n# Body\n\ntext")
+        metadata, offset = read_front_matter(path)
+        self.assertEqual(metadata, {"title": "Hello"})
+        with open(path, "rb") as f:
+            f.seek(offset)
+            self.assertEqual(f.read().decode("utf-8"), "# Body\n\ntext")
+
+    def test_read_front_matter_title_fallback(self):
+        path = self.write("post.md", "Intro\n\n# Heading Title\n\nmore")
+        metadata, offset = read_front_matter(path)
+        self.assertEqual(metadata, {"title": "Heading Title"})
+        self.assertEqual(offset, 0)
+
+    def test_index_lazy_body_and_cache(self):
+        path = self.write("blog/a/index.md", "---\ntitle: A\ndate: 2024-01-01\n---\n# A\n")
+        self.write("blog/index.md", "# Blog")
+        index_path = self.path("cache/metadata.json")
+        index = MetadataIndex(index_path)
+        pages = load_section(self.path("blog"), index)
+        self.assertEqual([p.title for p in pages], ["A"])
+        self.assertIsNone(pages[0]._body)
+        self.assertEqual(pages[0].body, "# A\n")
+        index.save()
+
+        reloaded = MetadataIndex(index_path)
+        self.assertEqual(reloaded.get_page(path).date, "2024-01-01")
+        self.assertFalse(reloaded.dirty)
+
+        self.write("blog/a/index.md", "---\ntitle: Changed title\n---\n# A\n")
+        self.assertEqual(reloaded.get_page(path).title, "Changed title")
+        self.assertTrue(reloaded.dirty)
+
+
+if __name__ == "__main__":
+    unittest.main()
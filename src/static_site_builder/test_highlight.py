@@ -0,0 +1,46 @@
+import unittest
+from .highlight import highlight_code, tokenize_code
+from .textnode import analyze_markdown, markdown_to_html_node
+
+
+class TestHighlight(unittest.TestCase):
+    def test_tokens_cover_the_code(self):
+        code = 'def f(x=0x1F):\n    return "a#b" if x else None  # done\n'
+        tokens = tokenize_code("python", code)
+        self.assertEqual("".join(text for token, text in tokens), code)
+        self.assertIn(("keyword", "def"), tokens)
+        self.assertIn(("number", "0x1F"), tokens)
+        self.assertIn(("string", '"a#b"'), tokens)
+        self.assertIn(("comment", "# done"), tokens)
+
+    def test_highlight_html(self):
+        html = highlight_code("js", "const s = '<b>'; // x").to_html()
+        self.assertEqual(
+            html,
+            '<code class="language-javascript"><span class="tok-keyword">const</span> s = '
+            '<span class="tok-string">\'&lt;b&gt;\'</span>; <span class="tok-comment">// x</span></code>',
+        )
+
+    def test_repeated_snippets_share_a_frozen_node(self):
+        first = highlight_code("python", "print(1)\n")
+        self.assertIs(highlight_code("python", "print(1)\n"), first)
+        self.assertTrue(first.frozen)
+
+    def test_unknown_language(self):
+        self.assertEqual(highlight_code("cobol", "MOVE A TO B").to_html(), '<code class="language-cobol">MOVE A TO B</code>')
+
+    def test_fenced_code_block(self):
+        md = "```python\nimport os\n```\n\n```\nplain\n```"
+        html_node, metadata = analyze_markdown(md)
+        self.assertEqual(
+            html_node.to_html(),
+            '<div><pre><code class="language-python"><span class="tok-keyword">import</span> os\n</code></pre>'
+            "<pre><code>plain\n</code></pre></div>",
+        )
+        self.assertEqual(metadata.word_count, 3)
+        # A one-line block has no language line
+        self.assertEqual(markdown_to_html_node("```python x```").to_html(), "<div><pre><code>python x</code></pre></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+from .htmlnode import HTMLNode, LeafNode, ParentNode, render_html, escape_text, escape_attr
+import copy
+import sys
+import unittest
+
+# Create some tests for the HTMLNode class (at least 3). I used a new file called src/test_htmlnode.py. Create a few nodes and make sure the props_to_html method works as expected.
+
+class TestHTMLNode(unittest.TestCase):
+    def test_props_to_html(self):
+        node = HTMLNode(tag="a", props={"href": "https://www.google.com"})
+        self.assertEqual(node.props_to_html(), 'href="https://www.google.com"')
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+class TestLeafNode(unittest.TestCase):
+    def test_leaf_to_html_p(self):
+        node = LeafNode("p", "Hello, world!")
+        self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
+
+
+class TestParentNode(unittest.TestCase):
+    def test_to_html_with_children(self):
+        child_node = LeafNode("span", "child")
+        parent_node = ParentNode("div", [child_node])
+        self.assertEqual(parent_node.to_html(), "<div><span>child</span></div>")
+
+    def test_to_html_with_grandchildren(self):
+        grandchild_node = LeafNode("b", "grandchild")
+        child_node = ParentNode("span", [grandchild_node])
+        parent_node = ParentNode("div", [child_node])
+        self.assertEqual(
+            parent_node.to_html(),
+            "<div><span><b>grandchild</b></span></div>",
+        )
+
+    def test_to_html_no_tag(self):
+        child_node = LeafNode("span", "child")
+        parent_node = ParentNode(None, [child_node])
+        with self.assertRaises(ValueError):
+            parent_node.to_html()
+
+    def test_to_html_no_children(self):
+        parent_node = ParentNode("div", None)
+        with self.assertRaises(ValueError):
+            parent_node.to_html()
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_cache_reused(self):
+        child = LeafNode("b", "bold")
+        parent = ParentNode("p", [child], cache=True)
+        self.assertEqual(parent.to_html(), "<p><b>bold</b></p>")
+        self.assertEqual(parent._html, "<p><b>bold</b></p>")
+
+    def test_uncached_by_default(self):
+        parent = ParentNode("p", [LeafNode("b", "bold")])
+        parent.to_html()
+        self.assertIsNone(parent._html)
+
+    def test_tracking_only_for_cached_nodes(self):
+        child = LeafNode("b", "bold")
+        parent = ParentNode("p", [child])
+        self.assertIs(type(parent), ParentNode)
+        self.assertIs(type(child), LeafNode)
+        parent.enable_cache()
+        self.assertIsInstance(parent, ParentNode)
+        self.assertIsInstance(child, LeafNode)
+        self.assertIsNot(type(child), LeafNode)
+        self.assertEqual(type(child).__name__, "LeafNode")
+        self.assertIs(type(ParentNode("p", [LeafNode("i", "x")])), ParentNode)
+
+    def test_invalidate_on_attribute_change(self):
+        child = LeafNode("b", "bold")
+        parent = ParentNode("div", [ParentNode("p", [child])], cache=True)
+        parent.to_html()
+        child.value = "strong"
+        self.assertEqual(parent.to_html(), "<div><p><b>strong</b></p></div>")
+        parent.tag = "section"
+        self.assertEqual(parent.to_html(), "<section><p><b>strong</b></p></section>")
+
+    def test_invalidate_on_in_place_change(self):
+        inner = ParentNode("ul", [LeafNode("li", "one")])
+        parent = ParentNode("nav", [inner], props={"class": "menu"}, cache=True)
+        parent.to_html()
+        inner.children.append(LeafNode("li", "two"))
+        self.assertEqual(parent.to_html(), '<nav class="menu"><ul><li>one</li><li>two</li></ul></nav>')
+        parent.props["class"] = "top"
+        self.assertEqual(parent.to_html(), '<nav class="top"><ul><li>one</li><li>two</li></ul></nav>')
+
+    def test_added_child_is_tracked(self):
+        parent = ParentNode("div", [], cache=True)
+        child = LeafNode("span", "a")
+        parent.children.append(child)
+        self.assertEqual(parent.to_html(), "<div><span>a</span></div>")
+        child.value = "b"
+        self.assertEqual(parent.to_html(), "<div><span>b</span></div>")
+
+    def test_frozen_fragment_shared(self):
+        nav = ParentNode("nav", [LeafNode("a", "Home", props={"href": "/"})]).freeze()
+        self.assertTrue(nav.frozen)
+        first = ParentNode("div", [nav, LeafNode("p", "one")])
+        second = ParentNode("div", [nav, LeafNode("p", "two")])
+        self.assertEqual(first.to_html(), '<div><nav><a href="/">Home</a></nav><p>one</p></div>')
+        self.assertEqual(second.to_html(), '<div><nav><a href="/">Home</a></nav><p>two</p></div>')
+
+    def test_frozen_is_immutable(self):
+        link = LeafNode("a", "Home", props={"href": "/"})
+        nav = ParentNode("nav", [link]).freeze()
+        with self.assertRaises(AttributeError):
+            nav.tag = "div"
+        with self.assertRaises(AttributeError):
+            link.value = "Away"
+        with self.assertRaises(AttributeError):
+            nav.children.append(LeafNode("a", "More"))
+        with self.assertRaises(TypeError):
+            link.props["href"] = "/away"
+
+
+    def test_deepcopy_cached_tree(self):
+        nav = ParentNode("nav", [LeafNode("a", "Home", props={"href": "/"})]).freeze()
+        child = LeafNode("b", "bold")
+        parent = ParentNode("div", [ParentNode("p", [child], props={"class": "x"}), nav], cache=True)
+        parent.to_html()
+        clone = copy.deepcopy(parent)
+        self.assertIsNot(clone, parent)
+        self.assertIs(clone.children[1], nav)
+        self.assertEqual(clone.to_html(), parent.to_html())
+        clone.children[0].children[0].value = "strong"
+        clone.children[0].props["class"] = "y"
+        self.assertEqual(clone.to_html(), '<div><p class="y"><b>strong</b></p><nav><a href="/">Home</a></nav></div>')
+        self.assertEqual(parent.to_html(), '<div><p class="x"><b>bold</b></p><nav><a href="/">Home</a></nav></div>')
+        child.value = "changed"
+        self.assertEqual(parent.to_html(), '<div><p class="x"><b>changed</b></p><nav><a href="/">Home</a></nav></div>')
+
+
+class TestRenderHTML(unittest.TestCase):
+    def test_matches_to_html(self):
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode(None, "Hello "), LeafNode("b", "world"), LeafNode("a", "link", props={"href": "/x"})]),
+            ParentNode("ul", [ParentNode("li", [LeafNode(None, "one")]), ParentNode("li", [])], props={"class": "list"}),
+        ])
+        self.assertEqual(
+            render_html(node),
+            '<div><p>Hello <b>world</b><a href="/x">link</a></p><ul class="list"><li>one</li><li></li></ul></div>',
+        )
+
+    def test_deep_tree(self):
+        node = LeafNode(None, "deep")
+        depth = sys.getrecursionlimit() * 2
+        for _ in range(depth):
+            node = ParentNode("blockquote", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<blockquote>" * 3))
+        self.assertEqual(len(html), depth * len("<blockquote></blockquote>") + len("deep"))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            render_html(ParentNode("div", [ParentNode(None, [])]))
+        with self.assertRaises(ValueError):
+            render_html(ParentNode("div", [ParentNode("p", None)]))
+        with self.assertRaises(ValueError):
+            render_html(ParentNode("div", [LeafNode("p", None)]))
+
+    def test_fills_nested_caches(self):
+        inner = ParentNode("p", [LeafNode("b", "bold")], cache=True)
+        outer = ParentNode("div", [inner, LeafNode(None, "tail")])
+        self.assertEqual(outer.to_html(), "<div><p><b>bold</b></p>tail</div>")
+        self.assertEqual(inner._html, "<p><b>bold</b></p>")
+
+    def test_cached_leaf(self):
+        leaf = LeafNode("b", "bold", cache=True)
+        outer = ParentNode("div", [leaf, LeafNode(None, "tail")])
+        self.assertEqual(render_html(outer), "<div><b>bold</b>tail</div>")
+        self.assertEqual(leaf._html, "<b>bold</b>")
+        leaf.value = "strong"
+        self.assertEqual(render_html(outer), "<div><b>strong</b>tail</div>")
+
+
+class TestEscaping(unittest.TestCase):
+    def test_escape_text(self):
+        self.assertEqual(escape_text('a < b & "c" > d'), 'a &lt; b &amp; "c" &gt; d')
+        plain = "nothing to escape"
+        self.assertIs(escape_text(plain), plain)
+        self.assertEqual(escape_text(404), "404")
+
+    def test_escape_attr(self):
+        self.assertEqual(escape_attr("/a?x=1&y=\"2\"'"), "/a?x=1&amp;y=&quot;2&quot;&#x27;")
+        self.assertEqual(escape_attr(3), "3")
+
+    def test_leaf_escapes_value_and_props(self):
+        node = LeafNode("a", "< Back", props={"href": '/x?a=1&b="2"'})
+        expected = '<a href="/x?a=1&amp;b=&quot;2&quot;">&lt; Back</a>'
+        self.assertEqual(node.to_html(), expected)
+        self.assertEqual(ParentNode("p", [node]).to_html(), f"<p>{expected}</p>")
+        self.assertEqual(LeafNode(None, "1 < 2").to_html(), "1 &lt; 2")
+
+    def test_non_string_values(self):
+        self.assertEqual(LeafNode("b", 404).to_html(), "<b>404</b>")
+        self.assertEqual(render_html(ParentNode("p", [LeafNode(None, 2024), LeafNode("i", 1.5)])), "<p>2024<i>1.5</i></p>")
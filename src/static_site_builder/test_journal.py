@@ -0,0 +1,88 @@
+import json
+import os
+import unittest
+from .journal import BuildJournal
+from .main import copy_files_recursive
+from .manifest import ContentManifest
+from .test_support import TempDirTestCase
+
+
+class TestBuildJournal(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.journal_path = self.path("cache/journal.jsonl")
+        self.manifest = ContentManifest()
+
+    def test_resume_verifies_entries(self):
+        source = self.write("content/a.md", "# A")
+        dest = self.write("docs/a.html", "<h1>A</h1>")
+        other = self.write("docs/b.html", "<h1>B</h1>")
+
+        journal = BuildJournal(self.journal_path, self.manifest, batch_size=1).open()
+        source_hash = journal.source_hash(source, extra="/")
+        self.assertFalse(journal.is_complete(dest, source_hash))
+        journal.record(dest, source_hash)
+        journal.record(other, source_hash)
+        journal.close()
+
+        resumed = BuildJournal(self.journal_path, self.manifest).open(resume=True)
+        self.assertTrue(resumed.is_complete(dest, source_hash))
+        # Different inputs or a basepath change mean the output is stale
+        self.assertFalse(resumed.is_complete(dest, resumed.source_hash(source, extra="/blog/")))
+        # An output changed on disk after it was journaled is redone
+        self.write("docs/b.html", "<h1>half written")
+        self.assertFalse(resumed.is_complete(other, source_hash))
+        resumed.close()
+
+    def test_torn_last_line(self):
+        dest = self.write("docs/a.html", "<h1>A</h1>")
+        journal = BuildJournal(self.journal_path, self.manifest).open()
+        journal.record(dest, "abc")
+        journal.close()
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"dest": "docs/b.ht')
+
+        resumed = BuildJournal(self.journal_path, self.manifest).open(resume=True)
+        self.assertEqual(list(resumed.entries), [dest])
+        self.assertTrue(resumed.is_complete(dest, "abc"))
+        resumed.close()
+        with open(self.journal_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+
+    def test_resumed_copy_keeps_finished_files(self):
+        self.write("static/a.css", "a")
+        self.write("static/images/b.png", "b")
+        static = self.path("static")
+        docs = self.path("docs")
+        journal = BuildJournal(self.journal_path, self.manifest).open()
+        copy_files_recursive(static, docs, journal)
+        journal.close()
+
+        # Simulate a build killed before b.png was copied
+        os.remove(os.path.join(docs, "images", "b.png"))
+        copied_at = os.stat(os.path.join(docs, "a.css")).st_mtime_ns
+        journal = BuildJournal(self.journal_path, self.manifest).open(resume=True)
+        copy_files_recursive(static, docs, journal)
+        journal.close()
+        self.assertTrue(os.path.exists(os.path.join(docs, "images", "b.png")))
+        self.assertEqual(os.stat(os.path.join(docs, "a.css")).st_mtime_ns, copied_at)
+
+    def test_stages_needing_page_data_rerender(self):
+        self.write("static/index.css", "body {}")
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.write("content/index.md", "# Home\n\nGandalf ![icon](/icon.png) [gone](/missing.html)")
+        self.write("static/icon.png", "AAAA")
+        self.run_main([], ["--resume", "--search"])
+        self.assertEqual(json.loads(self.read("docs/search/docs.json")), [["/", "Home"]])
+        with self.assertRaises(SystemExit):
+            self.run_main(["--resume", "--check-links"])
+
+        self.run_main(["--resume", "--inline-images"])
+        self.assertIn("base64,QUFBQQ==", self.read("docs/index.html"))
+        self.write("static/icon.png", "BBBB")
+        self.run_main(["--resume", "--inline-images"])
+        self.assertIn("base64,QkJCQg==", self.read("docs/index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from .build import BuildContext
+from .linkcheck import check_links, resolve_target
+from .main import generate_pages_recursive
+from .test_support import TempDirTestCase
+from .textnode import analyze_markdown
+
+
+class TestResolveTarget(unittest.TestCase):
+    def test_resolve(self):
+        self.assertEqual(resolve_target("/", "blog/tom"), "index.html")
+        self.assertEqual(resolve_target("/blog/tom", ""), "blog/tom")
+        self.assertEqual(resolve_target("/blog/", ""), "blog/index.html")
+        self.assertEqual(resolve_target("../majesty/#intro", "blog/tom"), "blog/majesty/index.html")
+        self.assertEqual(resolve_target("img%20one.png?v=2", "blog"), "blog/img one.png")
+        self.assertIsNone(resolve_target("#top", "blog"))
+        self.assertIsNone(resolve_target("https://example.com/", "blog"))
+        self.assertIsNone(resolve_target("mailto:me@example.com", "blog"))
+        self.assertEqual(resolve_target("https://example.com/site/about.html", "", "https://example.com/site/"), "about.html")
+
+
+class TestReferenceLines(unittest.TestCase):
+    def test_lines(self):
+        markdown = "# Title\n\nSome text\nand a [link](/a) here\n\n- one\n- ![img](/b.png)"
+        html_node, metadata = analyze_markdown(markdown, first_line=4)
+        self.assertEqual(metadata.references, [("link", "/a", 7), ("image", "/b.png", 10)])
+
+
+class TestCheckLinks(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("content/index.md", "---\ntitle: Home\n---\n# Home\n\n[Post](/blog/post) and [missing](/nope)")
+        self.write("content/blog/post/index.md", "# Post\n\n![Image](/images/a.png)\n\n[Back](../../)")
+        self.write("template.html", "{{ Content }}")
+        self.docs = self.path("docs")
+
+    def build(self):
+        context = BuildContext(self.path("content"), self.docs, cache_dir=self.path("cache"))
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.docs, "/", context)
+        return context
+
+    def test_reports_dangling_targets(self):
+        broken = check_links(self.build(), self.docs)
+        self.assertEqual([str(link) for link in broken], [
+            f"{self.path('content/blog/post/index.md')}:3: broken image /images/a.png",
+            f"{self.path('content/index.md')}:6: broken link /nope",
+        ])
+
+        self.write("docs/images/a.png", "png")
+        self.write("docs/nope.html", "")
+        self.assertEqual(len(check_links(self.build(), self.docs)), 1)
+
+    def test_unrendered_pages_use_cached_targets(self):
+        check_links(self.build(), self.docs)
+        context = self.build()
+        for page in context.pages:
+            page.document = None
+        self.assertEqual(len(check_links(context, self.docs)), 2)
+
+    def test_unrendered_pages_without_cached_targets(self):
+        # A resumed build whose earlier runs never checked links
+        context = self.build()
+        for page in context.pages:
+            page.document = None
+        broken = check_links(context, self.docs)
+        self.assertEqual([str(link) for link in broken], [
+            f"{self.path('content/blog/post/index.md')}:3: broken image /images/a.png",
+            f"{self.path('content/index.md')}:6: broken link /nope",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import unittest
+from .build import page_url
+from .frontmatter import Page, MetadataIndex
+from .listing import sort_pages, paginate, listing_page_url, generate_section_listing, ListingCache
+from .test_support import TempDirTestCase
+
+
+class TestListing(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = self.path("content")
+        self.docs = self.path("docs")
+        self.template = self.write("template.html", "<title>{{ Title }}</title><body>{{ Content }}</body>")
+
+    def test_page_url(self):
+        self.assertEqual(page_url("content", "content/index.md"), "/")
+        self.assertEqual(page_url("content", "content/blog/tom/index.md"), "/blog/tom")
+        self.assertEqual(page_url("content", "content/blog/about.md"), "/blog/about.html")
+
+    def test_sort_pages(self):
+        pages = [
+            Page("a", {"title": "b post", "date": "2024-01-01"}),
+            Page("b", {"title": "A post"}),
+            Page("c", {"title": "c post", "date": "2024-03-01"}),
+        ]
+        self.assertEqual([p.path for p in sort_pages(pages, "date")], ["c", "a", "b"])
+        self.assertEqual([p.path for p in sort_pages(pages, "title")], ["b", "a", "c"])
+        with self.assertRaises(ValueError):
+            sort_pages(pages, "size")
+
+    def test_paginate(self):
+        self.assertEqual(paginate([1, 2, 3, 4, 5], 2), [[1, 2], [3, 4], [5]])
+        self.assertEqual(paginate([], 2), [[]])
+        self.assertEqual(listing_page_url("/blog", 1), "/blog/")
+        self.assertEqual(listing_page_url("/blog", 3), "/blog/page/3/")
+
+    def generate(self, index, cache):
+        return generate_section_listing(
+            os.path.join(self.content, "blog", "index.md"),
+            self.content,
+            self.template,
+            os.path.join(self.docs, "blog"),
+            "/",
+            index,
+            cache,
+        )
+
+    def test_generate_section_listing(self):
+        self.write("content/blog/index.md", "---\ntitle: Blog\nlisting: true\nper_page: 2\n---\n## Latest\n\nAll the posts.")
+        for i in range(1, 6):
+            self.write(f"content/blog/post{i}/index.md", f"---\ntitle: Post {i}\ndate: 2024-01-0{i}\n---\n# Post {i}")
+        index = MetadataIndex()
+        cache = ListingCache()
+
+        self.assertEqual(self.generate(index, cache), 3)
+        first = self.read("docs/blog/index.html")
+        self.assertIn("<title>Blog</title>", first)
+        self.assertIn('<h2 id="latest">Latest</h2><p>All the posts.</p>', first)
+        self.assertIn('<li><a href="/blog/post5">Post 5</a> (2024-01-05)</li>', first)
+        self.assertIn('<a href="/blog/page/2/">Next &gt;</a>', first)
+        last = self.read("docs/blog/page/3/index.html")
+        self.assertIn('<a href="/blog/post1">Post 1</a>', last)
+        self.assertNotIn("All the posts.", last)
+
+        # Nothing changed, nothing is rewritten
+        self.assertEqual(self.generate(index, cache), 0)
+
+        # Retitling the oldest post only touches the last listing page
+        self.write("content/blog/post1/index.md", "---\ntitle: Renamed post\ndate: 2024-01-01\n---\n# Post 1")
+        self.assertEqual(self.generate(index, cache), 1)
+        self.assertIn("Renamed post", self.read("docs/blog/page/3/index.html"))
+
+        # Shrinking the listing removes stale pages
+        os.remove(os.path.join(self.content, "blog", "post1", "index.md"))
+        self.generate(index, cache)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "page", "3", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
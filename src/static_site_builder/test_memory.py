@@ -0,0 +1,52 @@
+import unittest
+from .htmlnode import LeafNode
+from .main import generate_page
+from .memory import MemoryLimitExceeded, MemoryReport
+from .test_support import TempDirTestCase
+from .textnode import TextNode, TextType
+
+
+class TestMemoryReport(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.template = self.write("template.html", "{{ Content }}")
+
+    def generate(self, report, name, markdown):
+        source = self.write(name, markdown)
+        with report.measure(source):
+            generate_page(source, self.template, self.path(name + ".html"))
+
+    def test_records_pages_and_node_counts(self):
+        report = MemoryReport().start()
+        try:
+            self.generate(report, "small.md", "# Small")
+            self.generate(report, "large.md", "# Large\n\n" + "\n\n".join(f"Paragraph **{i}**" for i in range(2000)))
+        finally:
+            report.stop()
+
+        large, small = report.top()
+        self.assertTrue(large.path.endswith("large.md"))
+        self.assertGreater(large.peak, small.peak)
+        self.assertGreater(large.text_nodes, 2000)
+        self.assertGreater(large.html_nodes, 6000)
+        self.assertEqual(len(report.top(1)), 1)
+
+    def test_counting_is_removed_after_stop(self):
+        report = MemoryReport().start()
+        report.stop()
+        TextNode("a", TextType.TEXT)
+        LeafNode("b", "a")
+        self.assertEqual((report.counter.text_nodes, report.counter.html_nodes), (0, 0))
+
+    def test_limit(self):
+        report = MemoryReport(limit=1024).start()
+        try:
+            with self.assertRaises(MemoryLimitExceeded) as raised:
+                self.generate(report, "large.md", "# Large\n\n" + "\n\n".join(f"Paragraph {i}" for i in range(500)))
+        finally:
+            report.stop()
+        self.assertIn("large.md", str(raised.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import os
+import unittest
+from .build import BuildContext
+from .main import generate_pages_recursive
+from .precache import MANIFEST_NAME, WORKER_NAME, precache_manifest, select_entries, write_service_worker
+from .test_support import TempDirTestCase
+
+
+def entry(size, content_hash="0" * 64):
+    return {"size": size, "mtime": 0, "hash": content_hash, "content_type": "text/html"}
+
+
+class TestSelectEntries(unittest.TestCase):
+    def test_globs_and_size_limits(self):
+        manifest = {
+            "index.html": entry(100),
+            "blog/post/index.html": entry(200),
+            "index.css": entry(50),
+            "index.css.gz": entry(20),
+            "images/huge.png": entry(5000),
+            WORKER_NAME: entry(10),
+            MANIFEST_NAME: entry(10),
+        }
+        selected, skipped = select_entries(manifest, max_file_size=1000)
+        self.assertEqual(selected, ["blog/post/index.html", "index.css", "index.html"])
+        self.assertEqual(skipped, ["images/huge.png"])
+
+        selected, skipped = select_entries(manifest, include=["*.html"], exclude=["blog/*"])
+        self.assertEqual(selected, ["index.html"])
+
+    def test_total_size_keeps_the_smallest_files(self):
+        manifest = {"a.html": entry(100), "b.html": entry(300), "c.html": entry(200)}
+        selected, skipped = select_entries(manifest, max_total_size=350)
+        self.assertEqual(selected, ["a.html", "c.html"])
+        self.assertEqual(skipped, ["b.html"])
+
+    def test_manifest_version_follows_revisions(self):
+        manifest = {"a.html": entry(1, "a" * 64), "b.html": entry(1, "b" * 64)}
+        first = precache_manifest(manifest, ["a.html", "b.html"])
+        self.assertEqual(first["entries"], {"a.html": "a" * 16, "b.html": "b" * 16})
+        manifest["b.html"] = entry(1, "c" * 64)
+        self.assertNotEqual(precache_manifest(manifest, ["a.html", "b.html"])["version"], first["version"])
+
+
+class TestServiceWorker(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("template.html", "<html><body>{{ Content }}{% if site.service_worker %}<script>register(\"{{ site.service_worker }}\")</script>{% endif %}</body></html>")
+        self.write("content/index.md", "# Home")
+        self.write("content/about.md", "# About")
+        self.write("docs/index.css", "body { margin: 0; }")
+        self.context = BuildContext(self.path("content"), self.path("docs"), "/site/", cache_dir=self.path("cache"))
+        self.context.site["service_worker"] = "/site/sw.js"
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), "/site/", self.context)
+
+    def read_manifest(self):
+        with open(self.path("docs/" + MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_template_registers_the_worker(self):
+        self.assertIn('<script>register("/site/sw.js")</script>', self.read("docs/index.html"))
+
+    def test_only_changed_entries_are_invalidated(self):
+        changeset, skipped = write_service_worker(self.context, self.path("docs"))
+        self.assertEqual(changeset.added, ["about.html", "index.css", "index.html"])
+        self.assertEqual(skipped, [])
+        first = self.read_manifest()
+        self.assertIn(f'var VERSION = "{first["version"]}";', self.read("docs/" + WORKER_NAME))
+
+        changeset, _ = write_service_worker(self.context, self.path("docs"))
+        self.assertFalse(changeset)
+
+        self.write("docs/index.css", "body { margin: 1em; }")
+        os.remove(self.path("docs/about.html"))
+        changeset, _ = write_service_worker(self.context, self.path("docs"))
+        self.assertEqual((changeset.added, changeset.modified, changeset.deleted), ([], ["index.css"], ["about.html"]))
+        second = self.read_manifest()
+        self.assertEqual(second["entries"]["index.html"], first["entries"]["index.html"])
+        self.assertNotEqual(second["version"], first["version"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import unittest
+from .build import BuildContext
+from .main import generate_pages_recursive
+from .prefetch import choose_prefetches, inject_prefetches, pagerank, write_prefetch_hints
+from .test_support import TempDirTestCase
+
+
+class TestPagerank(unittest.TestCase):
+    def test_ranks_sum_to_one(self):
+        rank = pagerank([[1, 2], [2], [0], []])
+        self.assertAlmostEqual(sum(rank), 1.0)
+
+    def test_linked_pages_rank_higher(self):
+        # Every other page links to page 0, pages 2 and 3 have no in-links
+        rank = pagerank([[1], [0], [0], [0, 1]])
+        self.assertGreater(rank[0], rank[1])
+        self.assertGreater(rank[1], rank[2])
+        self.assertAlmostEqual(rank[2], rank[3])
+
+    def test_warm_start_converges_to_the_same_ranks(self):
+        graph = [[1, 2], [2], [0, 3], [0]]
+        cold = pagerank(graph)
+        warm = pagerank(graph, [0.7, 0.1, 0.1, 0.1])
+        for a, b in zip(cold, warm):
+            self.assertAlmostEqual(a, b, places=4)
+
+    def test_choose_prefetches(self):
+        graph = [[3, 1, 2], [], [0]]
+        self.assertEqual(choose_prefetches(graph, 2), [[3, 1], [], [0]])
+        rank = [0.1, 0.1, 0.7, 0.1]
+        self.assertEqual(choose_prefetches(graph, 2, rank), [[2, 3], [], [0]])
+
+    def test_inject_prefetches_replaces_old_hints(self):
+        html = '<head><link rel="prefetch" href="/old"></head>'
+        self.assertEqual(inject_prefetches(html, ["/a", "/b"]), '<head><link rel="prefetch" href="/a"><link rel="prefetch" href="/b"></head>')
+        self.assertEqual(inject_prefetches(html, []), "<head></head>")
+
+
+class TestPrefetchHints(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("template.html", "<html><head></head><body>{{ Content }}</body></html>")
+        self.write("content/index.md", "# Home\n\n[docs](/docs) [about](/about.html) [out](https://example.com) [self](/)")
+        self.write("content/about.md", "# About\n\n[home](/) [missing](/nowhere.html)")
+        self.write("content/docs/index.md", "# Docs\n\n[about](../about.html) [guide](guide.html)")
+        self.write("content/docs/guide.md", "# Guide\n\n[docs](/docs/)")
+
+    def build(self, basepath="/"):
+        context = BuildContext(self.path("content"), self.path("docs"), basepath, cache_dir=self.path("cache"))
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), basepath, context)
+        return context
+
+    def test_hints_for_internal_links(self):
+        context = self.build("/site/")
+        self.assertEqual(write_prefetch_hints(context, self.path("docs"), count=1), 4)
+        self.assertIn('<head><link rel="prefetch" href="/site/docs"></head>', self.read("docs/index.html"))
+        self.assertIn('<head><link rel="prefetch" href="/site/about.html"></head>', self.read("docs/docs/index.html"))
+        self.assertIn('<head><link rel="prefetch" href="/site/docs"></head>', self.read("docs/docs/guide.html"))
+        # Running again changes nothing
+        self.assertEqual(write_prefetch_hints(context, self.path("docs"), count=1), 0)
+
+    def test_pagerank_ranks_are_cached(self):
+        context = self.build()
+        write_prefetch_hints(context, self.path("docs"), count=2, use_pagerank=True)
+        self.assertTrue(os.path.exists(self.path("cache/prefetch.json")))
+        hints = self.read("docs/index.html")
+        self.assertEqual(hints.count('rel="prefetch"'), 2)
+        self.assertEqual(write_prefetch_hints(self.build(), self.path("docs"), count=2, use_pagerank=True), 4)
+        self.assertEqual(self.read("docs/index.html"), hints)
+
+    def test_resumed_builds_keep_hinted_pages(self):
+        self.write("static/index.css", "body { margin: 0; }")
+        self.write("template.html", "<html><head></head><body>{{ Content }}</body></html>")
+        runs = [self.run_main(["--resume", "--prefetch"]) for _ in range(3)]
+        self.assertEqual(runs[0].count("Generating page from"), 4)
+        # Hints added after a page was journaled must not make it look stale
+        for run in runs[1:]:
+            self.assertEqual(run.count("Generating page from"), 0)
+            self.assertIn("Prefetch hints changed in 0 pages", run)
+
+
+if __name__ == "__main__":
+    unittest.main()
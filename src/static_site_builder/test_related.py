@@ -0,0 +1,75 @@
+import unittest
+from .build import BuildContext
+from .main import generate_pages_recursive
+from .related import RelatedPosts, decode_counts, encode_counts, most_similar, weigh_vectors
+from .test_support import TempDirTestCase
+
+POSTS = {
+    "blog/elves.md": "# Elves\n\nGlorfindel fought the balrog at Gondolin. Elves of Gondolin and Rivendell.",
+    "blog/balrog.md": "# Balrogs\n\nThe balrog of Moria and the balrog of Gondolin, both fought by elves.",
+    "blog/shire.md": "# The Shire\n\nHobbits farm pipeweed in the Shire. Hobbits love the Shire.",
+    "blog/hobbits.md": "# Hobbits\n\nHobbits of the Shire smoke pipeweed and eat six meals.",
+}
+
+
+class TestRelatedPosts(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for name, content in POSTS.items():
+            self.write("content/" + name, content)
+        self.context = BuildContext(self.path("content"), self.path("docs"), cache_dir=self.path("cache"))
+
+    def test_encode_counts_round_trip(self):
+        counts = {"balrog": 2, "c++": 1, "a:b": 3}
+        self.assertEqual(decode_counts(encode_counts(counts)), counts)
+
+    def test_weigh_vectors(self):
+        vectors = weigh_vectors([{"a": 2, "b": 1, "only": 5}, {"a": 1, "c": 1}, {"b": 1, "c": 4}, {"d": 1}])
+        # Terms in a single post are dropped and every vector has unit length
+        self.assertEqual(set(vectors[0]), {"a", "b"})
+        self.assertEqual(vectors[3], {})
+        for vector in vectors[:3]:
+            self.assertAlmostEqual(sum(weight * weight for weight in vector.values()), 1.0)
+
+    def test_most_similar(self):
+        vectors = [{"x": 1.0}, {"y": 0.6, "x": 0.8}, {"y": 1.0}, {"z": 1.0}]
+        results = most_similar(vectors, count=2)
+        self.assertEqual([other for other, _ in results[0]], [1])
+        self.assertEqual([other for other, _ in results[1]], [0, 2])
+        self.assertAlmostEqual(results[1][0][1], 0.8)
+        self.assertEqual(results[3], [])
+
+    def test_related_posts_of_section(self):
+        related = RelatedPosts(self.path("cache/related.json"), count=1)
+        related.update(self.context, "blog")
+        self.assertEqual(related.get(self.path("content/blog/elves.md")), [{"title": "Balrogs", "url": "/blog/balrog.html"}])
+        self.assertEqual(related.get(self.path("content/blog/shire.md")), [{"title": "Hobbits", "url": "/blog/hobbits.html"}])
+        self.assertEqual(related.get(self.path("content/missing.md")), [])
+
+    def test_cached_counts_and_results_are_reused(self):
+        related = RelatedPosts(self.path("cache/related.json"))
+        related.update(self.context, "blog")
+        related.save()
+        expected = related.get(self.path("content/blog/elves.md"))
+
+        reloaded = RelatedPosts(self.path("cache/related.json"))
+        reloaded.update(self.context, "blog")
+        self.assertFalse(reloaded.dirty)
+        self.assertEqual(reloaded.get(self.path("content/blog/elves.md")), expected)
+
+        # A new post recomputes the results but only reads the new post's terms
+        self.write("content/blog/moria.md", "# Moria\n\nThe balrog woke in Moria, the dwarves fled Moria.")
+        reloaded.update(self.context, "blog")
+        self.assertTrue(reloaded.dirty)
+        self.assertEqual(reloaded.get(self.path("content/blog/moria.md"))[0]["title"], "Balrogs")
+
+    def test_template_sees_related_posts(self):
+        template = self.write("template.html", "{{ Content }}{% for post in related %}<a href=\"{{ post.url }}\">{{ post.title }}</a>{% endfor %}")
+        self.context.related = RelatedPosts(count=1)
+        self.context.related.update(self.context, "blog")
+        generate_pages_recursive(self.path("content"), template, self.path("docs"), "/site/", self.context)
+        self.assertIn('<a href="/site/blog/shire.html">The Shire</a>', self.read("docs/blog/hobbits.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
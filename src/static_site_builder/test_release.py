@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from .output import write_page
+from .release import build_release_manifest, diff_manifests, stage_changeset, write_changeset_archive, main
+
+
+class TestRelease(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "docs")
+        write_page(os.path.join(self.root, "index.html"), "<h1>Home</h1>")
+        write_page(os.path.join(self.root, "blog", "post.html"), "<h1>Post</h1>")
+        write_page(os.path.join(self.root, "old.css"), "p {}")
+        self.previous = build_release_manifest(self.root)
+
+        write_page(os.path.join(self.root, "index.html"), "<h1>Home!</h1>")
+        # Rewritten with the same bytes: not a modification
+        write_page(os.path.join(self.root, "blog", "post.html"), "<h1>Post</h1>")
+        write_page(os.path.join(self.root, "new.css"), "p { margin: 0; }")
+        os.remove(os.path.join(self.root, "old.css"))
+        self.current = build_release_manifest(self.root, self.previous)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_manifest(self):
+        entry = self.current["blog/post.html"]
+        self.assertEqual(entry["size"], len("<h1>Post</h1>"))
+        self.assertEqual(entry["content_type"], "text/html")
+        self.assertEqual(entry["hash"], self.previous["blog/post.html"]["hash"])
+
+    def test_changeset(self):
+        changeset = diff_manifests(self.previous, self.current)
+        self.assertEqual(changeset.added, ["new.css"])
+        self.assertEqual(changeset.modified, ["index.html"])
+        self.assertEqual(changeset.deleted, ["old.css"])
+        self.assertEqual(changeset.uploads, ["index.html", "new.css"])
+        self.assertFalse(diff_manifests(self.current, self.current))
+
+    def test_stage(self):
+        staging = os.path.join(self.tmp.name, "staging")
+        stage_changeset(diff_manifests(self.previous, self.current), self.current, self.root, staging)
+        self.assertEqual(sorted(os.listdir(staging)), ["changeset.json", "index.html", "new.css"])
+        with open(os.path.join(staging, "changeset.json"), "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["deleted"], ["old.css"])
+
+    def test_archives(self):
+        changeset = diff_manifests(self.previous, self.current)
+        buffer = io.BytesIO()
+        write_changeset_archive(changeset, self.current, self.root, buffer, "tar")
+        buffer.seek(0)
+        with tarfile.open(fileobj=buffer, mode="r:gz") as archive:
+            self.assertEqual(archive.getnames(), ["changeset.json", "index.html", "new.css"])
+
+        buffer = io.BytesIO()
+        write_changeset_archive(changeset, self.current, self.root, buffer, "zip")
+        with zipfile.ZipFile(buffer) as archive:
+            self.assertEqual(archive.read("index.html"), b"<h1>Home!</h1>")
+
+    def test_main_records_release(self):
+        manifest_path = os.path.join(self.tmp.name, "release.json")
+        archive_path = os.path.join(self.tmp.name, "release.zip")
+        main([self.root, "--manifest", manifest_path, "--archive", archive_path])
+        with zipfile.ZipFile(archive_path) as archive:
+            self.assertEqual(len(archive.namelist()), 4)
+
+        # Nothing changed since the recorded release
+        main([self.root, "--manifest", manifest_path, "--archive", archive_path])
+        with zipfile.ZipFile(archive_path) as archive:
+            self.assertEqual(archive.namelist(), ["changeset.json"])
+
+    def test_manifest_only_advances_after_export(self):
+        manifest_path = os.path.join(self.tmp.name, "release.json")
+        # Nothing exported
+        main([self.root, "--manifest", manifest_path])
+        self.assertFalse(os.path.exists(manifest_path))
+
+        # A failed export
+        with self.assertRaises(OSError):
+            main([self.root, "--manifest", manifest_path, "--archive", os.path.join(self.tmp.name, "missing", "release.zip")])
+        self.assertFalse(os.path.exists(manifest_path))
+
+        stage_dir = os.path.join(self.tmp.name, "stage")
+        main([self.root, "--manifest", manifest_path, "--stage", stage_dir])
+        mtime = os.stat(manifest_path).st_mtime_ns
+        # An empty changeset leaves the recorded release alone
+        main([self.root, "--manifest", manifest_path, "--stage", stage_dir])
+        self.assertEqual(os.stat(manifest_path).st_mtime_ns, mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
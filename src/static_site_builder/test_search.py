@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+from .search import encode_postings, decode_postings, shard_name, SearchIndex
+from .textnode import analyze_markdown, tokenize
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.tmp.name, "cache")
+        self.docs = os.path.join(self.tmp.name, "docs")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_output(self, name):
+        with open(os.path.join(self.docs, "search", name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Tom's *merry* Song, a 2nd time!"), ["tom", "merry", "song", "2nd", "time"])
+        # Lowercased like toLowerCase() in search.js, not casefolded
+        self.assertEqual(tokenize("Straße ΟΔΟΣ"), ["straße", "οδος"])
+
+    def test_collect_terms(self):
+        _, metadata = analyze_markdown("# Old Tom\n\nTom is **merry**.", collect_terms=True)
+        self.assertEqual(metadata.terms, Counter({"tom": 2, "old": 1, "is": 1, "merry": 1}))
+        _, metadata = analyze_markdown("# Old Tom")
+        self.assertIsNone(metadata.terms)
+
+    def test_postings_round_trip(self):
+        postings = {7: 1, 2: 3, 40: 2}
+        self.assertEqual(encode_postings(postings), [2, 3, 5, 1, 33, 2])
+        self.assertEqual(decode_postings(encode_postings(postings)), postings)
+        self.assertEqual(shard_name("bombadil"), "bo")
+
+    def test_incremental_updates(self):
+        absolute_url = lambda url: "/base" + url
+        index = SearchIndex(self.cache)
+        index.update_page("/tom", "Tom", "h1", Counter({"bombadil": 2, "merry": 1}))
+        index.update_page("/elves", "Elves", "h2", Counter({"glorfindel": 1, "merry": 1}))
+        self.assertEqual(index.save(self.docs, absolute_url), 6)
+        self.assertEqual(self.read_output("docs.json"), [["/base/tom", "Tom"], ["/base/elves", "Elves"]])
+        self.assertEqual(self.read_output("me.json"), {"merry": [0, 1, 1, 1]})
+
+        # Unchanged pages do not touch any shard
+        index = SearchIndex(self.cache)
+        self.assertFalse(index.update_page("/tom", "Tom", "h1", Counter({"bombadil": 2, "merry": 1})))
+        self.assertEqual(index.save(self.docs, absolute_url), 0)
+
+        # A changed page only rewrites the shards of its old and new terms
+        index = SearchIndex(self.cache)
+        index.update_page("/tom", "Tom", "h3", Counter({"bombadil": 1}))
+        self.assertEqual(index.dirty_shards, {"bo", "me", "to"})
+        index.remove_missing({"/tom"})
+        index.save(self.docs, absolute_url)
+        self.assertEqual(self.read_output("me.json"), {})
+        self.assertEqual(self.read_output("bo.json"), {"bombadil": [0, 1]})
+        self.assertEqual(self.read_output("docs.json"), [["/base/tom", "Tom"], None])
+
+    def test_reindex_after_normalization_change(self):
+        index = SearchIndex(self.cache)
+        index.update_page("/tom", "Tom", "h1", Counter({"strasse": 1}))
+        index.save(self.docs, lambda url: url)
+        with open(os.path.join(self.cache, "search.json"), encoding="utf-8") as f:
+            state = json.load(f)
+        state["normalization"] = "casefold"
+        with open(os.path.join(self.cache, "search.json"), "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+        index = SearchIndex(self.cache)
+        self.assertTrue(index.update_page("/tom", "Tom", "h1", Counter({"straße": 1})))
+        index.save(self.docs, lambda url: url)
+        self.assertEqual(self.read_output("st.json"), {"straße": [0, 1]})
+
+
+if __name__ == "__main__":
+    unittest.main()
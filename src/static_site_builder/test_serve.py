@@ -0,0 +1,176 @@
+import gzip
+import http.client
+import json
+import threading
+import unittest
+from .serve import ResponseCache, accepts_gzip, etag_matches, make_etag, make_server, parse_range
+from .test_support import TempDirTestCase
+
+PAGE = "<html><body>" + "hello world " * 100 + "</body></html>"
+
+
+class TestHelpers(unittest.TestCase):
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=90-500", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        self.assertIsNone(parse_range("items=0-1", 100))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=100-", 100)
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(etag_matches('W/"b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+        self.assertFalse(etag_matches("", '"b"'))
+
+    def test_make_etag(self):
+        self.assertEqual(make_etag("ab" * 32), '"' + "ab" * 16 + '"')
+        self.assertEqual(make_etag("ab" * 32, "gzip"), '"' + "ab" * 16 + '-gzip"')
+
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(accepts_gzip("br;q=1.0, gzip;q=0.8"))
+        self.assertFalse(accepts_gzip("gzip;q=0"))
+        self.assertFalse(accepts_gzip(None))
+
+    def test_response_cache_evicts_least_recently_used(self):
+        cache = ResponseCache(max_bytes=80)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        cache.get("a")
+        for key in "cdefghi":
+            cache.put(key, b"x" * 10)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertLessEqual(cache.size, 80)
+        # Bodies over an eighth of the cache are never kept
+        cache.put("big", b"x" * 11)
+        self.assertIsNone(cache.get("big"))
+
+
+class TestPreviewServer(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("docs/index.html", PAGE)
+        self.write("docs/blog/post/index.html", "<p>post</p>")
+        self.write("docs/index.css", "body { margin: 0; }" * 20)
+        self.write("docs/index.css.gz", gzip.compress(b"precompressed"))
+        self.write("docs/images/a.png", bytes(range(256)) * 4)
+        self.server = make_server(self.path("docs"), port=0, basepath="/site/", manifest_path=self.path("cache/serve.json"), quiet=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request(self, path, headers=None, method="GET"):
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    def test_etag_and_not_modified(self):
+        response, body = self.request("/site/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body.decode("utf-8"), PAGE)
+        self.assertEqual(response.getheader("Content-Type"), "text/html; charset=utf-8")
+        etag = response.getheader("ETag")
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+
+        response, body = self.request("/site/index.html", {"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+        self.write("docs/index.html", PAGE + "changed")
+        response, _ = self.request("/site/", {"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+
+    def test_gzip(self):
+        response, body = self.request("/site/", {"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body).decode("utf-8"), PAGE)
+        self.assertTrue(response.getheader("ETag").endswith('-gzip"'))
+
+        # A precompressed sibling is sent as it is
+        response, body = self.request("/site/index.css", {"Accept-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(body), b"precompressed")
+
+        # Both kinds of gzip body are tagged from the source's hash
+        for path in ("/site/", "/site/index.css"):
+            identity, _ = self.request(path)
+            response, _ = self.request(path, {"Accept-Encoding": "gzip"})
+            self.assertEqual(response.getheader("ETag"), identity.getheader("ETag")[:-1] + '-gzip"')
+
+        # Images are not compressed
+        response, body = self.request("/site/images/a.png", {"Accept-Encoding": "gzip"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(len(body), 1024)
+
+    def test_manifest_saved_to_manifest_path(self):
+        self.write("docs/new.html", "<p>new</p>")
+        self.request("/site/new.html")
+        self.server.RequestHandlerClass.files.save()
+        with open(self.path("cache/serve.json"), encoding="utf-8") as f:
+            self.assertIn("new.html", json.load(f))
+
+    def test_ranges(self):
+        response, body = self.request("/site/images/a.png", {"Range": "bytes=256-259"})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(response.getheader("Content-Range"), "bytes 256-259/1024")
+        self.assertEqual(body, bytes([0, 1, 2, 3]))
+
+        response, body = self.request("/site/images/a.png", {"Range": "bytes=2000-"})
+        self.assertEqual(response.status, 416)
+        self.assertEqual(response.getheader("Content-Range"), "bytes */1024")
+
+        # A stale If-Range gets the whole file
+        response, body = self.request("/site/images/a.png", {"Range": "bytes=0-1", "If-Range": '"stale"'})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(body), 1024)
+
+    def test_paths(self):
+        response, _ = self.request("/site/blog/post")
+        self.assertEqual(response.status, 301)
+        self.assertEqual(response.getheader("Location"), "/site/blog/post/")
+        response, body = self.request("/site/blog/post/")
+        self.assertEqual(body, b"<p>post</p>")
+        response, _ = self.request("/site/../cache/serve.json")
+        self.assertEqual(response.status, 404)
+        response, _ = self.request("/elsewhere/")
+        self.assertEqual(response.status, 404)
+        response, body = self.request("/site/", method="HEAD")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"")
+
+    def test_hot_files_are_cached(self):
+        self.request("/site/index.html")
+        self.request("/site/index.html")
+        cache = self.server.RequestHandlerClass.cache
+        self.assertEqual(cache.hits, 1)
+
+    def test_concurrent_requests(self):
+        results = []
+
+        def fetch():
+            response, body = self.request("/site/")
+            results.append((response.status, len(body)))
+
+        threads = [threading.Thread(target=fetch) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [(200, len(PAGE))] * 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
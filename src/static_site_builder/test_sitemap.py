@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from .build import BuildContext, PageRecord
+from .sitemap import to_rfc3339, write_sitemaps, write_atom_feed
+
+
+class TestSitemap(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs = os.path.join(self.tmp.name, "docs")
+        os.makedirs(self.docs)
+        self.context = BuildContext("content", self.docs, "/blog-site/", "https://example.com", os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add_pages(self, count, lastmod="2024-05-01T10:00:00Z"):
+        for i in range(count):
+            self.context.pages.append(PageRecord(f"content/p{i}.md", None, f"/p{i}", f"Page {i}", lastmod=lastmod))
+
+    def read(self, name):
+        with open(os.path.join(self.docs, name), encoding="utf-8") as f:
+            return f.read()
+
+    def test_to_rfc3339(self):
+        self.assertEqual(to_rfc3339("2024-01-02"), "2024-01-02T00:00:00Z")
+        self.assertEqual(to_rfc3339("2024-01-02T03:04:05Z"), "2024-01-02T03:04:05Z")
+
+    def test_absolute_url(self):
+        self.assertEqual(self.context.absolute_url("/blog/tom"), "https://example.com/blog-site/blog/tom")
+
+    def test_single_sitemap(self):
+        self.add_pages(2)
+        self.assertEqual(write_sitemaps(self.context, self.docs), 1)
+        sitemap = self.read("sitemap.xml")
+        self.assertIn("<urlset", sitemap)
+        self.assertIn("<url><loc>https://example.com/blog-site/p1</loc><lastmod>2024-05-01T10:00:00Z</lastmod></url>", sitemap)
+
+    def test_sharded_sitemap_skips_unchanged_shards(self):
+        self.add_pages(5)
+        self.assertEqual(write_sitemaps(self.context, self.docs, shard_size=2), 4)
+        index = self.read("sitemap.xml")
+        self.assertIn("<sitemapindex", index)
+        self.assertIn("<loc>https://example.com/blog-site/sitemap-3.xml</loc>", index)
+        self.assertEqual(write_sitemaps(self.context, self.docs, shard_size=2), 0)
+
+        # Only the shard holding the changed page and the index are rewritten
+        self.context.pages[4].lastmod = "2024-06-01T00:00:00Z"
+        self.assertEqual(write_sitemaps(self.context, self.docs, shard_size=2), 2)
+
+        # Shrinking the site removes shards that are no longer listed
+        del self.context.pages[2:]
+        write_sitemaps(self.context, self.docs, shard_size=2)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "sitemap-2.xml")))
+        self.assertIn("<urlset", self.read("sitemap.xml"))
+
+    def test_atom_feed(self):
+        self.add_pages(3)
+        self.context.pages[0].date = "2025-01-01"
+        self.context.pages[2].title = "Fish & Chips"
+        self.assertTrue(write_atom_feed(self.context, self.docs, "My Site", limit=2))
+        feed = self.read("feed.xml")
+        self.assertIn("<title>My Site</title>", feed)
+        self.assertIn("<updated>2025-01-01T00:00:00Z</updated>", feed)
+        self.assertIn("<title>Fish &amp; Chips</title>", feed)
+        self.assertNotIn("Page 1", feed)
+        self.assertIn("<author><name>My Site</name></author>", feed)
+        self.assertFalse(write_atom_feed(self.context, self.docs, "My Site", limit=2))
+
+        self.context.site["author"] = "J. R. R. Tolkien & Co"
+        self.assertTrue(write_atom_feed(self.context, self.docs, "My Site", limit=2))
+        self.assertIn("<author><name>J. R. R. Tolkien &amp; Co</name></author>", self.read("feed.xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from .pack import build_zipapp
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous so that slow CI machines pass; a regression that pulls in heavy
+# modules at startup still blows well past it
+IMPORT_BUDGET_US = 300_000
+
+# Only imported when the corresponding feature is used
+LAZY_MODULES = [
+    "static_site_builder.listing",
+    "static_site_builder.sitemap",
+    "static_site_builder.search",
+    "static_site_builder.benchmark",
+    "static_site_builder.pack",
+    "static_site_builder.dedupe",
+    "static_site_builder.release",
+    "static_site_builder.archive",
+    "static_site_builder.linkcheck",
+    "static_site_builder.memory",
+    "static_site_builder.budget",
+    "static_site_builder.critical",
+    "static_site_builder.related",
+    "static_site_builder.datauri",
+    "static_site_builder.prefetch",
+    "static_site_builder.precache",
+    "static_site_builder.serve",
+]
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter with -X importtime and return
+    {module name: cumulative microseconds}.
+    """
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        times[name] = int(cumulative_us)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_budget(self):
+        times = import_times("static_site_builder.main")
+        self.assertLess(times["static_site_builder.main"], IMPORT_BUDGET_US)
+
+    def test_optional_features_are_lazy(self):
+        times = import_times("static_site_builder.main")
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_zipapp(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = build_zipapp(os.path.join(tmp, "ssb.pyz"))
+            result = subprocess.run([sys.executable, target, "--help"], capture_output=True, text=True, check=True)
+            self.assertIn("--site-url", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from .main import main
+
+
+class TempDirTestCase(unittest.TestCase):
+    """
+    Base for tests that build files in a temporary directory, which is
+    removed after the test. path(), write() and read() take names relative
+    to it; run_main() runs the command line from inside it.
+    """
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write(self, name, content):
+        """
+        Write str content as UTF-8, or bytes as they are, creating parent
+        directories. Returns the full path.
+        """
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def read(self, name):
+        with open(self.path(name), encoding="utf-8") as f:
+            return f.read()
+
+    def run_main(self, *runs):
+        """
+        Run main() once per argv list with the temporary directory as the
+        working directory, and return everything the runs printed.
+        """
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                for argv in runs:
+                    main(argv)
+        finally:
+            os.chdir(cwd)
+        return output.getvalue()
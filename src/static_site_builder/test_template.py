@@ -0,0 +1,110 @@
+import os
+import unittest
+from .build import BuildContext
+from .journal import BuildJournal
+from .main import generate_pages_recursive
+from .template import TemplateEnvironment, TemplateError, compile_template, page_variables, rewrite_basepath
+from .test_support import TempDirTestCase
+
+
+class TestTemplateEnvironment(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("partials/header.html", "<header>{{ site.basepath }}</header>")
+        self.write("base.html", '{% include "partials/header.html" %}<title>{% block title %}{{ Title }}{% endblock %}</title><main>{% block main %}{% endblock %}</main>')
+        self.write(
+            "post.html",
+            '{% extends "base.html" %}{# a post #}{% block main %}{{ Content }}'
+            "<ul>{% for tag in page.tags %}<li>{{ tag }}</li>{% endfor %}</ul>"
+            "{% if page.draft %}draft{% else %}published{% endif %}{% endblock %}",
+        )
+        self.cache_dir = self.path("cache")
+        self.env = TemplateEnvironment(self.tmp.name, self.cache_dir)
+
+    def render(self, env=None):
+        variables = page_variables("A & B", "<p>body</p>", "/base/", {"tags": ["x", "<y>"]})
+        return (env or self.env).render(self.env.path("post.html"), variables)
+
+    def test_extends_includes_loops(self):
+        self.assertEqual(
+            self.render(),
+            "<header>/base/</header><title>A &amp; B</title><main><p>body</p>"
+            "<ul><li>x</li><li>&lt;y&gt;</li></ul>published</main>",
+        )
+
+    def test_compiled_templates_are_cached_on_disk(self):
+        self.render()
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_dir, "templates"))), 3)
+        fresh = TemplateEnvironment(self.tmp.name, self.cache_dir)
+        self.assertEqual(self.render(fresh), self.render())
+
+    def test_dependencies(self):
+        post = self.env.path("post.html")
+        self.assertEqual(
+            self.env.dependencies(post),
+            sorted([post, self.env.path("base.html"), self.env.path("partials/header.html")]),
+        )
+        signature = self.env.signature(post)
+        self.write("partials/header.html", "<header>changed</header>")
+        self.assertNotEqual(TemplateEnvironment(self.tmp.name).signature(post), signature)
+
+    def test_select(self):
+        self.write("templates/blog.html", "{{ Content }}")
+        default = self.env.path("template.html")
+        self.assertEqual(self.env.select(default, {"template": "post.html"}, "blog"), self.env.path("post.html"))
+        self.assertEqual(self.env.select(default, {}, "blog"), self.env.path("templates/blog.html"))
+        self.assertEqual(self.env.select(default, {}, "contact"), default)
+
+    def test_errors_name_the_line(self):
+        with self.assertRaisesRegex(TemplateError, "bad.html:2: unknown tag"):
+            compile_template("<p>\n{% frobnicate %}", "bad.html")
+        with self.assertRaisesRegex(TemplateError, "unclosed for"):
+            compile_template("{% for x in items %}", "bad.html")
+        with self.assertRaisesRegex(TemplateError, "invalid expression"):
+            compile_template("{{ 1 + 1 }}", "bad.html")
+
+    def test_render_page_template(self):
+        path = self.write("page.html", '<title>{{ Title }}</title>{{ Content }}<img src="/a.png">')
+        html = self.env.render(path, page_variables("<T>", "<b>x</b>", "/base/"))
+        self.assertEqual(rewrite_basepath(html, "/base/"), '<title>&lt;T&gt;</title><b>x</b><img src="/base/a.png">')
+
+    def test_attribute_values_escape_quotes(self):
+        path = self.write(
+            "link.html",
+            '<a href="{{ page.url }}" title=\'{{ Title }}\'>{{ Title }}</a>'
+            '<body class="{% block cls %}{{ page.url }}{% endblock %}">{{ page.url }}</body>',
+        )
+        html = self.env.render(path, page_variables("It's", "", "/", {"url": '/x?a=1&b="2"'}))
+        self.assertEqual(
+            html,
+            '<a href="/x?a=1&amp;b=&quot;2&quot;" title=\'It&#x27;s\'>It\'s</a>'
+            '<body class="/x?a=1&amp;b=&quot;2&quot;">/x?a=1&amp;b="2"</body>',
+        )
+
+
+class TestTemplateDependencies(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("template.html", "{{ Content }}")
+        self.write("templates/blog.html", '{% include "partials/byline.html" %}{{ Content }}')
+        self.write("partials/byline.html", "<p>by me</p>")
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/post.md", "# Post")
+
+    def build(self, resume):
+        context = BuildContext(self.path("content"), self.path("docs"), cache_dir=self.path("cache"))
+        context.journal = BuildJournal(self.path("cache/journal.jsonl"), context.manifest).open(resume)
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), "/", context)
+        context.journal.close()
+        return {os.path.relpath(page.dest_path, self.path("docs")) for page in context.pages if page.document is not None}
+
+    def test_partial_change_rebuilds_only_its_pages(self):
+        self.assertEqual(self.build(False), {"index.html", os.path.join("blog", "post.html")})
+        self.assertEqual(self.read("docs/blog/post.html"), '<p>by me</p><div><h1 id="post">Post</h1></div>')
+
+        self.write("partials/byline.html", "<p>by someone else</p>")
+        self.assertEqual(self.build(True), {os.path.join("blog", "post.html")})
+
+
+if __name__ == "__main__":
+    unittest.main()
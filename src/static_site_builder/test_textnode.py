@@ -1,5 +1,5 @@
 import unittest
-from textnode import TextNode, TextType, BlockType, text_node_to_html_node, split_nodes_delimiter, extract_markdown_images, extract_markdown_links, split_nodes_image, split_nodes_link, text_to_textnodes, markdown_to_blocks, block_to_block_type, markdown_to_html_node, extract_title
+from .textnode import TextNode, TextType, BlockType, text_node_to_html_node, split_nodes_delimiter, extract_markdown_images, extract_markdown_links, split_nodes_image, split_nodes_link, text_to_textnodes, markdown_to_blocks, block_to_block_type, markdown_to_html_node, extract_title, analyze_markdown, slugify
 
 class TestTextNode(unittest.TestCase):
     def test_eq(self):
@@ -652,6 +652,14 @@ code block
         block = "1. First item\nNot a list item"
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
 
+    def test_block_to_block_type_ordered_list_leading_zero(self):
+        self.assertEqual(block_to_block_type("01. First\n02. Second"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1. First\n2. Second\n3. Third\n4. a\n5. b\n6. c\n7. d\n8. e\n9. f\n10. g"), BlockType.ORDERED_LIST)
+
+    def test_block_to_block_type_short_code_fence(self):
+        self.assertEqual(block_to_block_type("```"), BlockType.CODE)
+        self.assertEqual(block_to_block_type("````"), BlockType.CODE)
+
     def test_block_to_block_type_paragraph_with_formatting(self):
         block = "This is a paragraph with **bold** and *italic* text."
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
@@ -704,7 +712,7 @@ the **same** even with inline stuff
         html = node.to_html()
         self.assertEqual(
             html,
-            "<div><h1>This is an h1</h1><h2>This is an h2</h2><h3>This is an h3</h3></div>",
+            '<div><h1 id="this-is-an-h1">This is an h1</h1><h2 id="this-is-an-h2">This is an h2</h2><h3 id="this-is-an-h3">This is an h3</h3></div>',
         )
 
     def test_quote(self):
@@ -797,7 +805,7 @@ This paragraph has **bold**, *italic*, `code`, ![image](https://example.com/img.
         md = "## Heading with **bold** text"
         node = markdown_to_html_node(md)
         html = node.to_html()
-        self.assertEqual(html, "<div><h2>Heading with <b>bold</b> text</h2></div>")
+        self.assertEqual(html, '<div><h2 id="heading-with-bold-text">Heading with <b>bold</b> text</h2></div>')
 
     def test_quote_with_inline(self):
         md = "> Quote with *italic* and `code` text"
@@ -861,6 +869,55 @@ Content here.
         with self.assertRaises(ValueError):
             extract_title(md)
 
+    def test_escaped_markdown(self):
+        md = '[< Back](/) a <b> & ![say "hi"](/img.png?a=1&b=2)'
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(
+            html,
+            '<div><p><a href="/">&lt; Back</a> a &lt;b&gt; &amp; <img src="/img.png?a=1&amp;b=2" alt="say &quot;hi&quot;"></p></div>',
+        )
+
+    def test_slugify(self):
+        self.assertEqual(slugify("Why Tom Bombadil Was a Mistake"), "why-tom-bombadil-was-a-mistake")
+        self.assertEqual(slugify("  A **Bold** -- claim!  "), "a-bold-claim")
+
+    def test_analyze_markdown(self):
+        md = """
+# My Title
+
+Some **bold** text and a [link](/contact).
+
+## Section
+
+![alt text](/images/tom.png)
+
+## Section
+
+```
+code here
+```
+"""
+        node, metadata = analyze_markdown(md)
+        html = node.to_html()
+        self.assertEqual(html, markdown_to_html_node(md).to_html())
+        self.assertIn('<h1 id="my-title">My Title</h1>', html)
+        self.assertIn('<h2 id="section">Section</h2>', html)
+        self.assertIn('<h2 id="section-1">Section</h2>', html)
+        self.assertEqual(metadata.title, "My Title")
+        self.assertEqual(metadata.headings, [
+            (1, "My Title", "my-title"),
+            (2, "Section", "section"),
+            (2, "Section", "section-1"),
+        ])
+        self.assertEqual(metadata.links, [("link", "/contact")])
+        self.assertEqual(metadata.images, [("alt text", "/images/tom.png")])
+        self.assertEqual(metadata.word_count, 13)
+
+    def test_analyze_markdown_no_title(self):
+        node, metadata = analyze_markdown("## Only an h2")
+        self.assertIsNone(metadata.title)
+        self.assertEqual(metadata.headings, [(2, "Only an h2", "only-an-h2")])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
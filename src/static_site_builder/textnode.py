@@ -0,0 +1,469 @@
+from collections import Counter
+from enum import Enum
+import re
+from .htmlnode import LeafNode, ParentNode, escape_attr
+from .highlight import highlight_code
+
+class TextType(Enum):
+    TEXT = "text"
+    BOLD = "bold"
+    ITALIC = "italic"
+    CODE = "code"
+    LINK = "link"
+    IMAGE = "image"
+
+
+class BlockType(Enum):
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
+
+class TextNode:
+    def __init__(self, text: str, text_type: TextType, url: str|None = None):
+        self.text: str = text
+        self.text_type: TextType = text_type
+        self.url: str | None = url
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TextNode):
+            return False
+        return self.text == other.text and self.text_type == other.text_type and self.url == other.url
+    
+    def __repr__(self) -> str:
+        return f"TextNode({self.text}, {self.text_type}, {self.url})"
+
+
+def text_node_to_html_node(text_node):
+    factory = GRAMMAR.node_factories.get(text_node.text_type)
+    if factory is None:
+        raise ValueError(f"Unsupported TextType: {text_node.text_type}")
+    return factory(text_node)
+
+
+class ImageNode:
+    # Set by ImageInliner.install() to render small images as data URIs
+    inliner = None
+
+    def __init__(self, alt_text, src):
+        self.alt_text = alt_text
+        self.src = src
+    
+    def to_html(self):
+        src = self.src
+        if self.inliner is not None:
+            src = self.inliner.data_uri(src) or src
+        return f'<img src="{escape_attr(src)}" alt="{escape_attr(self.alt_text)}">'
+
+
+class MarkdownGrammar:
+    """
+    Everything the parser needs that can be prepared once: the compiled
+    inline patterns, the TextType to HTML node dispatch table and a single
+    regex that classifies a block. A shared instance is built at import.
+    """
+    def __init__(self):
+        self.image_pattern = re.compile(r"!\[([^\[\]]*?)\]\(([^\(\)]*?)\)")
+        self.link_pattern = re.compile(r"(?<!!)\[([^\[\]]*?)\]\(([^\(\)]*?)\)")
+        self.node_factories = {
+            TextType.TEXT: lambda node: LeafNode(None, node.text),
+            TextType.BOLD: lambda node: LeafNode("b", node.text),
+            TextType.ITALIC: lambda node: LeafNode("i", node.text),
+            TextType.CODE: lambda node: LeafNode("code", node.text),
+            TextType.LINK: lambda node: LeafNode("a", node.text, props={"href": node.url}),
+            # Images render as a self-closing tag
+            TextType.IMAGE: lambda node: ImageNode(node.text, node.url),
+        }
+        quote_line = r"(?:>\ [^\n]*|[^\S\n]*>[^\S\n]*)"
+        # Alternatives are tried in the same order block types were checked in
+        self.block_pattern = re.compile(
+            rf"""
+            (?P<heading>\#{{1,6}}\ .*)
+            | (?P<code>(?=```).*(?<=```))
+            | (?P<quote>{quote_line}(?:\n{quote_line})*)
+            | (?P<unordered>-\ [^\n]*(?:\n-\ [^\n]*)*)
+            | (?P<ordered>[0-9]+\.\ [^\n]*(?:\n[0-9]+\.\ [^\n]*)*)
+            """,
+            re.VERBOSE | re.DOTALL,
+        )
+        self.list_number_pattern = re.compile(r"^([0-9]+)\. ", re.MULTILINE)
+        # The info string after an opening ``` fence, e.g. "python"
+        self.fence_language = re.compile(r"[^\S\n]*[\w+#.-]*[^\S\n]*")
+        self.block_types = {
+            "heading": BlockType.HEADING,
+            "code": BlockType.CODE,
+            "quote": BlockType.QUOTE,
+            "unordered": BlockType.UNORDERED_LIST,
+        }
+
+    def classify_block(self, block):
+        match = self.block_pattern.fullmatch(block)
+        if match is None:
+            return BlockType.PARAGRAPH
+        kind = match.lastgroup
+        if kind != "ordered":
+            return self.block_types[kind]
+        # Ordered lists must be numbered 1, 2, 3, ... without leading zeros
+        for i, number in enumerate(self.list_number_pattern.findall(block), start=1):
+            if number[0] == "0" or int(number) != i:
+                return BlockType.PARAGRAPH
+        return BlockType.ORDERED_LIST
+
+
+def split_nodes_delimiter(old_nodes, delimiter, text_type):
+    new_nodes = []
+    
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        
+        parts = node.text.split(delimiter)
+        
+        if len(parts) % 2 == 0:
+            raise ValueError(f"Invalid markdown: unmatched delimiter '{delimiter}'")
+        
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                if part:
+                    new_nodes.append(TextNode(part, TextType.TEXT))
+            else:
+                new_nodes.append(TextNode(part, text_type))
+    
+    return new_nodes
+
+
+def extract_markdown_images(text):
+    return GRAMMAR.image_pattern.findall(text)
+
+
+def extract_markdown_links(text):
+    return GRAMMAR.link_pattern.findall(text)
+
+
+def split_nodes_image(old_nodes):
+    new_nodes = []
+    
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        
+        text = node.text
+        images = extract_markdown_images(text)
+        
+        if not images:
+            new_nodes.append(node)
+            continue
+        
+        for alt_text, url in images:
+            image_markdown = f"![{alt_text}]({url})"
+            parts = text.split(image_markdown, 1)
+            
+            if parts[0]:
+                new_nodes.append(TextNode(parts[0], TextType.TEXT))
+            
+            new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
+            
+            text = parts[1]
+        
+        if text:
+            new_nodes.append(TextNode(text, TextType.TEXT))
+    
+    return new_nodes
+
+
+def split_nodes_link(old_nodes):
+    new_nodes = []
+    
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        
+        text = node.text
+        links = extract_markdown_links(text)
+        
+        if not links:
+            new_nodes.append(node)
+            continue
+        
+        for link_text, url in links:
+            link_markdown = f"[{link_text}]({url})"
+            parts = text.split(link_markdown, 1)
+            
+            if parts[0]:
+                new_nodes.append(TextNode(parts[0], TextType.TEXT))
+            
+            new_nodes.append(TextNode(link_text, TextType.LINK, url))
+            
+            text = parts[1]
+        
+        if text:
+            new_nodes.append(TextNode(text, TextType.TEXT))
+    
+    return new_nodes
+
+
+def text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+GRAMMAR = MarkdownGrammar()
+
+
+def markdown_to_blocks(markdown):
+    blocks = markdown.split("\n\n")
+    filtered_blocks = []
+    
+    for block in blocks:
+        stripped_block = block.strip()
+        if stripped_block:
+            filtered_blocks.append(stripped_block)
+    
+    return filtered_blocks
+
+
+def markdown_blocks_with_lines(markdown, first_line=1):
+    """
+    Like markdown_to_blocks, but yields (line number, block) pairs giving
+    the line each block starts on.
+    """
+    line = first_line
+    for block in markdown.split("\n\n"):
+        stripped_block = block.strip()
+        if stripped_block:
+            leading = block[:len(block) - len(block.lstrip())]
+            yield line + leading.count("\n"), stripped_block
+        line += block.count("\n") + 2
+
+
+def block_to_block_type(block):
+    return GRAMMAR.classify_block(block)
+
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    """
+    Split text into lowercased search terms of at least two characters.
+    str.lower() applies the same Unicode mapping as toLowerCase() in
+    static/search.js, so queries match the indexed terms.
+    """
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if len(term) > 1]
+
+
+def slugify(text):
+    """
+    Turn heading text into a lowercase, hyphen-separated anchor slug.
+    """
+    slug = re.sub(r"[^\w\s-]", "", text.lower())
+    return re.sub(r"[\s_-]+", "-", slug).strip("-")
+
+
+def heading_slug(text, seen):
+    """
+    The anchor slug of a heading. seen counts the slugs a document has
+    used so far, so repeated headings get numbered anchors, "intro",
+    "intro-1", ...
+    """
+    slug = slugify(text) or "section"
+    count = seen.get(slug, 0)
+    seen[slug] = count + 1
+    return f"{slug}-{count}" if count else slug
+
+
+class DocumentMetadata:
+    """
+    Metadata gathered while a markdown document is converted to HTML nodes:
+    the title, the heading outline, link and image targets and a word count.
+    References lists every link and image target as (kind, url, line) for
+    the link checker, with line numbers counted from first_line.
+    """
+    def __init__(self, collect_terms=False, first_line=1):
+        self.title: str | None = None
+        self.headings: list[tuple[int, str, str]] = []
+        self.links: list[tuple[str, str]] = []
+        self.images: list[tuple[str, str]] = []
+        self.references: list[tuple[str, str, int]] = []
+        self.word_count: int = 0
+        # Term frequencies for search and related-posts stages, only when asked for
+        self.terms: Counter | None = Counter() if collect_terms else None
+        self._slugs: dict[str, int] = {}
+        self.first_line = first_line
+        self._line = first_line
+        self._block = ""
+
+    def add_heading(self, level, text):
+        text = text.strip()
+        if level == 1 and self.title is None:
+            self.title = text
+        slug = heading_slug(text, self._slugs)
+        self.headings.append((level, text, slug))
+        return slug
+
+    def start_block(self, line, block):
+        self._line = line
+        self._block = block
+
+    def _reference_line(self, url):
+        offset = self._block.find(f"]({url})")
+        if offset < 0:
+            return self._line
+        return self._line + self._block.count("\n", 0, offset)
+
+    def add_text_node(self, text_node):
+        if text_node.text_type == TextType.LINK:
+            self.links.append((text_node.text, text_node.url))
+            self.references.append(("link", text_node.url, self._reference_line(text_node.url)))
+        elif text_node.text_type == TextType.IMAGE:
+            self.images.append((text_node.text, text_node.url))
+            self.references.append(("image", text_node.url, self._reference_line(text_node.url)))
+            return
+        self.add_words(text_node.text)
+
+    def add_words(self, text):
+        self.word_count += len(text.split())
+        if self.terms is not None:
+            self.terms.update(tokenize(text))
+
+    def __repr__(self) -> str:
+        return f"DocumentMetadata({self.title}, {len(self.headings)} headings, {len(self.links)} links, {len(self.images)} images, {self.word_count} words)"
+
+
+def text_to_children(text, metadata=None):
+    text_nodes = text_to_textnodes(text)
+    children = []
+    for text_node in text_nodes:
+        if metadata is not None:
+            metadata.add_text_node(text_node)
+        html_node = text_node_to_html_node(text_node)
+        children.append(html_node)
+    return children
+
+
+def markdown_to_html_node(markdown, metadata=None):
+    """
+    Convert a markdown document into a tree of HTML nodes. If a
+    DocumentMetadata is passed in it is filled in during the same pass.
+    """
+    first_line = metadata.first_line if metadata is not None else 1
+    block_nodes = []
+    # Heading anchors, for documents converted without metadata
+    slugs = {}
+    
+    for line, block in markdown_blocks_with_lines(markdown, first_line):
+        if metadata is not None:
+            metadata.start_block(line, block)
+        block_type = block_to_block_type(block)
+        
+        if block_type == BlockType.PARAGRAPH:
+            # Replace newlines with spaces in paragraphs
+            paragraph_text = block.replace("\n", " ")
+            children = text_to_children(paragraph_text, metadata)
+            block_nodes.append(ParentNode("p", children))
+            
+        elif block_type == BlockType.HEADING:
+            # Count the number of # characters
+            level = 0
+            for char in block:
+                if char == "#":
+                    level += 1
+                else:
+                    break
+            heading_text = block[level + 1:]  # Skip the # and space
+            if metadata is not None:
+                slug = metadata.add_heading(level, heading_text)
+            else:
+                slug = heading_slug(heading_text.strip(), slugs)
+            children = text_to_children(heading_text, metadata)
+            block_nodes.append(ParentNode(f"h{level}", children, props={"id": slug}))
+            
+        elif block_type == BlockType.CODE:
+            # Remove the ``` from start and end; the rest of the opening
+            # fence line is the language, if any
+            code_text = block[3:-3]
+            language = ""
+            fence_line, newline, rest = code_text.partition("\n")
+            if newline and GRAMMAR.fence_language.fullmatch(fence_line):
+                language = fence_line.strip()
+                code_text = rest
+            if metadata is not None:
+                metadata.add_words(code_text)
+            if language:
+                code_node = highlight_code(language, code_text)
+            else:
+                code_node = LeafNode("code", code_text)
+            block_nodes.append(ParentNode("pre", [code_node]))
+            
+        elif block_type == BlockType.QUOTE:
+            # Remove "> " from each line, handle lines that are just ">"
+            lines = block.split("\n")
+            quote_lines = []
+            for line in lines:
+                if line.startswith("> "):
+                    quote_lines.append(line[2:])
+                elif line.strip() == ">":
+                    quote_lines.append("")
+                else:
+                    quote_lines.append(line)
+            quote_text = "\n".join(quote_lines)
+            children = text_to_children(quote_text, metadata)
+            block_nodes.append(ParentNode("blockquote", children))
+            
+        elif block_type == BlockType.UNORDERED_LIST:
+            # Create list items
+            lines = block.split("\n")
+            list_items = []
+            for line in lines:
+                item_text = line[2:]  # Remove "- "
+                item_children = text_to_children(item_text, metadata)
+                list_items.append(ParentNode("li", item_children))
+            block_nodes.append(ParentNode("ul", list_items))
+            
+        elif block_type == BlockType.ORDERED_LIST:
+            # Create list items
+            lines = block.split("\n")
+            list_items = []
+            for line in lines:
+                # Find the ". " and remove everything before it
+                dot_index = line.find(". ")
+                item_text = line[dot_index + 2:]
+                item_children = text_to_children(item_text, metadata)
+                list_items.append(ParentNode("li", item_children))
+            block_nodes.append(ParentNode("ol", list_items))
+    
+    return ParentNode("div", block_nodes)
+
+
+def analyze_markdown(markdown, collect_terms=False, first_line=1):
+    """
+    Render markdown and collect its metadata in a single pass.
+    Returns a (html_node, DocumentMetadata) tuple.
+    """
+    metadata = DocumentMetadata(collect_terms, first_line)
+    html_node = markdown_to_html_node(markdown, metadata)
+    return html_node, metadata
+
+
+def extract_title(markdown):
+    lines = markdown.strip().split('\n')
+    for line in lines:
+        stripped_line = line.strip()
+        if stripped_line.startswith('# ') and not stripped_line.startswith('## '):
+            # Found h1 header, extract title
+            title = stripped_line[2:].strip()
+            return title
+    
+    raise ValueError("No h1 header found in markdown")
\ No newline at end of file
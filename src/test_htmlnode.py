@@ -1,45 +0,0 @@
-from htmlnode import HTMLNode, LeafNode, ParentNode
-import unittest
-
-# Create some tests for the HTMLNode class (at least 3). I used a new file called src/test_htmlnode.py. Create a few nodes and make sure the props_to_html method works as expected.
-
-class TestHTMLNode(unittest.TestCase):
-    def test_props_to_html(self):
-        node = HTMLNode(tag="a", props={"href": "https://www.google.com"})
-        self.assertEqual(node.props_to_html(), 'href="https://www.google.com"')
-
-
-if __name__ == "__main__":
-    unittest.main()
-
-class TestLeafNode(unittest.TestCase):
-    def test_leaf_to_html_p(self):
-        node = LeafNode("p", "Hello, world!")
-        self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
-
-
-class TestParentNode(unittest.TestCase):
-    def test_to_html_with_children(self):
-        child_node = LeafNode("span", "child")
-        parent_node = ParentNode("div", [child_node])
-        self.assertEqual(parent_node.to_html(), "<div><span>child</span></div>")
-
-    def test_to_html_with_grandchildren(self):
-        grandchild_node = LeafNode("b", "grandchild")
-        child_node = ParentNode("span", [grandchild_node])
-        parent_node = ParentNode("div", [child_node])
-        self.assertEqual(
-            parent_node.to_html(),
-            "<div><span><b>grandchild</b></span></div>",
-        )
-
-    def test_to_html_no_tag(self):
-        child_node = LeafNode("span", "child")
-        parent_node = ParentNode(None, [child_node])
-        with self.assertRaises(ValueError):
-            parent_node.to_html()
-
-    def test_to_html_no_children(self):
-        parent_node = ParentNode("div", None)
-        with self.assertRaises(ValueError):
-            parent_node.to_html()
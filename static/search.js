@@ -0,0 +1,83 @@
+// Client for the sharded search index written by static-site-builder --search.
+// Only docs.json and the shards for the query's term prefixes are fetched.
+(function () {
+  var PREFIX_LENGTH = 2;
+  var base = new URL("search/", document.currentScript.src);
+  var cache = {};
+
+  function fetchJSON(name) {
+    if (!cache[name]) {
+      cache[name] = fetch(new URL(name, base)).then(function (response) {
+        return response.ok ? response.json() : {};
+      });
+    }
+    return cache[name];
+  }
+
+  function tokenize(text) {
+    // Lowercased like tokenize() in textnode.py; lengths and prefixes count
+    // code points, as Python does
+    return (text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || []).filter(function (term) {
+      return Array.from(term).length > 1;
+    });
+  }
+
+  // Postings are [id_delta, tf, id_delta, tf, ...]
+  function decode(encoded) {
+    var postings = {};
+    var id = 0;
+    for (var i = 0; i < encoded.length; i += 2) {
+      id += encoded[i];
+      postings[id] = encoded[i + 1];
+    }
+    return postings;
+  }
+
+  function search(query) {
+    var terms = tokenize(query);
+    if (!terms.length) {
+      return Promise.resolve([]);
+    }
+    var shards = terms.map(function (term) {
+      return fetchJSON(Array.from(term).slice(0, PREFIX_LENGTH).join("") + ".json");
+    });
+    return Promise.all([fetchJSON("docs.json")].concat(shards)).then(function (loaded) {
+      var docs = loaded[0];
+      var scores = null;
+      terms.forEach(function (term, i) {
+        var postings = decode(loaded[i + 1][term] || []);
+        var next = {};
+        Object.keys(postings).forEach(function (id) {
+          if (scores === null || id in scores) {
+            next[id] = (scores ? scores[id] : 0) + postings[id];
+          }
+        });
+        scores = next;
+      });
+      return Object.keys(scores)
+        .filter(function (id) { return docs[id]; })
+        .sort(function (a, b) { return scores[b] - scores[a]; })
+        .map(function (id) { return { url: docs[id][0], title: docs[id][1] }; });
+    });
+  }
+
+  function bind(input) {
+    var results = document.querySelector(input.getAttribute("data-search"));
+    input.addEventListener("input", function () {
+      search(input.value).then(function (matches) {
+        results.innerHTML = "";
+        matches.slice(0, 20).forEach(function (match) {
+          var item = document.createElement("li");
+          var link = document.createElement("a");
+          link.href = match.url;
+          link.textContent = match.title;
+          item.appendChild(link);
+          results.appendChild(item);
+        });
+      });
+    });
+  }
+
+  window.siteSearch = { search: search };
+  document.querySelectorAll("input[data-search]").forEach(bind);
+})();